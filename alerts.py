@@ -0,0 +1,294 @@
+"""Gösterge sütunları üzerinde tanımlanan alarm kuralları ve arka plan taraması.
+
+Kural `SOL İŞLEÇ SAĞ` biçiminde yazılır, ör. `RSI yukarı_keser 30`,
+`Close aşağı_keser EMA_200`, `Volume > 1.5*HACIM_ORT`, `Close < BB_lower`.
+Kurallar bir kez Python fonksiyonlarına derlenir. Tarayıcı her turda tek sorguyla
+her sembolün son barını okur; yalnızca son barı değişen semboller artımlı
+göstergelerden (feed.SembolAkisi) geçirilip kurallarla değerlendirilir.
+"""
+import operator
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from diagnostics import say, span
+from feed import BAR_ALANLARI, CanliAkis, SembolAkisi
+from indicators import GOSTERGE_SUTUNLARI
+
+# Son 20 barın (son bar hariç) ortalama hacmi
+HACIM_ORT_PENCERESI = 20
+ALANLAR = BAR_ALANLARI + GOSTERGE_SUTUNLARI + ['HACIM_ORT']
+
+KARSILASTIRMALAR = {'>': operator.gt, '<': operator.lt, '>=': operator.ge, '<=': operator.le}
+KESISMELER = ('yukarı_keser', 'aşağı_keser')
+
+# İlk turda EMA_200'ün oturması için okunan geçmiş
+ISINMA_PERIYODU = "1y"
+
+KURAL_ORNEKLERI = [
+    "RSI yukarı_keser 30",
+    "Close aşağı_keser EMA_200",
+    "Volume > 1.5*HACIM_ORT",
+    "Close < BB_lower",
+]
+
+_ALAN_ADLARI = {alan.upper(): alan for alan in ALANLAR}
+
+
+def _terim(metin):
+    """Sayı, alan adı ya da `katsayı*ALAN` terimini sözlükten değer okuyan fonksiyona çevirir."""
+    try:
+        sabit = float(metin.replace(',', '.'))
+        return lambda d: sabit
+    except ValueError:
+        pass
+
+    katsayi, _, alan = metin.rpartition('*')
+    alan = _ALAN_ADLARI.get(alan.upper())
+    if alan is None:
+        raise ValueError(f"Bilinmeyen alan: {metin}. Kullanılabilir alanlar: {', '.join(ALANLAR)}")
+    if not katsayi:
+        return operator.itemgetter(alan)
+    try:
+        k = float(katsayi.replace(',', '.'))
+    except ValueError:
+        raise ValueError(f"Geçersiz katsayı: {katsayi}")
+    return lambda d: k * d[alan]
+
+
+def derle(ifade):
+    """Kural ifadesini `fn(onceki, son) -> bool` fonksiyonuna derler.
+
+    `onceki` ve `son` son iki barın alan sözlükleridir; kesişme işleçleri `onceki`
+    olmadan (ilk bar) tetiklenmez. NaN içeren karşılaştırmalar yanlış sayılır.
+    """
+    parcalar = ifade.split()
+    if len(parcalar) != 3:
+        raise ValueError("Kural 'SOL İŞLEÇ SAĞ' biçiminde olmalı, ör. 'RSI yukarı_keser 30'")
+    sol, islec, sag = parcalar
+    sol, sag = _terim(sol), _terim(sag)
+    islec = islec.lower()
+
+    if islec in KARSILASTIRMALAR:
+        karsilastir = KARSILASTIRMALAR[islec]
+        return lambda onceki, son: karsilastir(sol(son), sag(son))
+    if islec == 'yukarı_keser':
+        return lambda onceki, son: onceki is not None and sol(onceki) <= sag(onceki) and sol(son) > sag(son)
+    if islec == 'aşağı_keser':
+        return lambda onceki, son: onceki is not None and sol(onceki) >= sag(onceki) and sol(son) < sag(son)
+    raise ValueError(f"Bilinmeyen işleç: {islec}. Kullanılabilir işleçler: "
+                     f"{', '.join(list(KARSILASTIRMALAR) + list(KESISMELER))}")
+
+
+class AlarmDeposu:
+    """Alarm kurallarını ve tetiklenen alarmların günlüğünü SQLite'ta saklar."""
+
+    def __init__(self, db_path='alarms.db'):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Günlüğe tarayıcı iş parçacığı, kurallara arayüz yazar
+        self._kilit = threading.RLock()
+        self.create_tables()
+
+    def create_tables(self):
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_rules (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                expression TEXT NOT NULL,
+                symbols TEXT,
+                active INTEGER NOT NULL DEFAULT 1,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
+            # Aynı kural aynı barda bir kez kaydedilir (ve bildirilir)
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                rule_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                bar_ts INTEGER NOT NULL,
+                close REAL,
+                triggered_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (rule_id, symbol, bar_ts)
+            )''')
+            self.conn.commit()
+
+    def kural_ekle(self, ad, ifade, semboller=None):
+        """Kuralı derleyerek doğrular ve kaydeder; `semboller` boşsa tüm hisselere uygulanır."""
+        derle(ifade)
+        semboller = ','.join(s.strip().upper() for s in semboller or [] if s.strip()) or None
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('INSERT INTO alert_rules (name, expression, symbols) VALUES (?, ?, ?)',
+                           (ad, ifade, semboller))
+            self.conn.commit()
+            return cursor.lastrowid
+
+    def kural_sil(self, kural_id):
+        with self._kilit:
+            self.conn.execute('DELETE FROM alert_rules WHERE id=?', (kural_id,))
+            self.conn.commit()
+
+    def kural_etkinlestir(self, kural_id, etkin):
+        with self._kilit:
+            self.conn.execute('UPDATE alert_rules SET active=? WHERE id=?', (int(etkin), kural_id))
+            self.conn.commit()
+
+    def kurallar(self, yalniz_etkin=False):
+        """(id, ad, ifade, semboller listesi ya da None, etkin) satırları."""
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute(f'''
+            SELECT id, name, expression, symbols, active FROM alert_rules
+            {'WHERE active=1' if yalniz_etkin else ''}
+            ORDER BY id
+            ''')
+            rows = cursor.fetchall()
+        return [(i, ad, ifade, semboller.split(',') if semboller else None, bool(etkin))
+                for i, ad, ifade, semboller, etkin in rows]
+
+    def kaydet(self, kayitlar):
+        """(kural_id, sembol, bar_ts, kapanış) kayıtlarını günlüğe ekler; yeni olanları döndürür."""
+        yeniler = []
+        with self._kilit, span('sqlite'):
+            cursor = self.conn.cursor()
+            for kayit in kayitlar:
+                cursor.execute('''
+                INSERT OR IGNORE INTO alert_log (rule_id, symbol, bar_ts, close)
+                VALUES (?, ?, ?, ?)
+                ''', kayit)
+                if cursor.rowcount:
+                    yeniler.append(kayit)
+            self.conn.commit()
+        return yeniler
+
+    def gunluk(self, limit=200):
+        """Son alarmlar: (zaman, kural adı, sembol, bar_ts, kapanış) satırları."""
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            SELECT l.triggered_at, COALESCE(r.name, '(silinmiş kural)'), l.symbol, l.bar_ts, l.close
+            FROM alert_log l LEFT JOIN alert_rules r ON r.id = l.rule_id
+            ORDER BY l.id DESC LIMIT ?
+            ''', (limit,))
+            return cursor.fetchall()
+
+    def close(self):
+        self.conn.close()
+
+
+class _DerlenmisKural:
+    __slots__ = ('id', 'ad', 'fn', 'semboller')
+
+    def __init__(self, kural_id, ad, ifade, semboller):
+        self.id = kural_id
+        self.ad = ad
+        self.fn = derle(ifade)
+        self.semboller = frozenset(semboller) if semboller else None
+
+
+def _bar_degerleri(akis, geri):
+    """Tampondaki sondan `geri` önceki barın alan sözlüğü (HACIM_ORT dahil); bar yoksa None."""
+    tampon = akis.tampon
+    if len(tampon) <= geri:
+        return None
+    degerler = {alan: float(tampon.son(alan, geri + 1)[0]) for alan in BAR_ALANLARI + GOSTERGE_SUTUNLARI}
+    hacimler = tampon.son('Volume', HACIM_ORT_PENCERESI + geri + 1)[:-(geri + 1)]
+    degerler['HACIM_ORT'] = (float(hacimler.mean()) if len(hacimler) == HACIM_ORT_PENCERESI
+                             else float('nan'))
+    return degerler
+
+
+class AlarmTarayici(CanliAkis):
+    """İzlenen sembolleri arka planda periyodik tarar ve etkin kuralları değerlendirir.
+
+    Yeni kaydedilen alarmlar `sonuclar` kuyruğuna (kural adı, sembol, bar_ts, kapanış)
+    olarak konur. `son_tur` son turun süresini ve değerlendirilen sembol sayısını tutar.
+    """
+
+    def __init__(self, bar_store, depo, interval="1d", aralik=None):
+        # Üst sınıf iş parçacığını hemen başlattığı için alanlar önce kurulur
+        self.depo = depo
+        self._kurallar = []
+        self._son_barlar = {}
+        self._hepsini_degerlendir = False
+        self.son_tur = None
+        super().__init__(bar_store, interval, aralik,
+                         kapasite=2 * (HACIM_ORT_PENCERESI + 2))
+
+    def kurallari_ayarla(self, evren):
+        """Etkin kuralları depodan yeniden derler ve izlenen sembolleri günceller.
+
+        Sembolü belirtilmemiş kural varsa `evren`in tamamı izlenir. Mevcut semboller
+        bir sonraki turda yeni kurallarla da bir kez değerlendirilir.
+        """
+        kurallar = [_DerlenmisKural(i, ad, ifade, semboller)
+                    for i, ad, ifade, semboller, _ in self.depo.kurallar(yalniz_etkin=True)]
+        izlenecek = set()
+        for kural in kurallar:
+            izlenecek |= kural.semboller if kural.semboller is not None else {s.upper() for s in evren}
+
+        with self._kilit:
+            self._kurallar = kurallar
+            self._hepsini_degerlendir = True
+            for symbol in set(self._akislar) - izlenecek:
+                del self._akislar[symbol]
+                self._son_barlar.pop(symbol, None)
+            for symbol in izlenecek:
+                self._akislar.setdefault(symbol, SembolAkisi(self.kapasite))
+        self._uyandir.set()
+        return len(kurallar)
+
+    def simdi_tara(self):
+        self._uyandir.set()
+
+    def tur(self):
+        """Bir tarama turu; kaydedilen yeni alarm sayısını döndürür."""
+        bas = time.perf_counter()
+        with self._kilit:
+            akislar = dict(self._akislar)
+            kurallar = self._kurallar
+            hepsi, self._hepsini_degerlendir = self._hepsini_degerlendir, False
+        if not akislar or not kurallar:
+            return 0
+
+        son_barlar = self.bar_store.son_barlar(list(akislar), self.interval, ISINMA_PERIYODU)
+        degisen = [symbol for symbol, bar in son_barlar.items()
+                   if symbol in akislar and self._son_barlar.get(symbol) != bar]
+        if degisen:
+            # Kapanmamış son bar güncellenmiş olabileceği için son bar da yeniden okunur
+            sonra = {symbol: pd.Timestamp(akislar[symbol].tampon.son_ts - 1, unit='s', tz='UTC')
+                     for symbol in degisen if akislar[symbol].tampon.son_ts is not None}
+            frames = self.bar_store.yeni_barlar(degisen, self.interval, sonra, ISINMA_PERIYODU)
+            for symbol in degisen:
+                barlar = frames.get(symbol)
+                if barlar is not None:
+                    akislar[symbol].isle(barlar)
+                self._son_barlar[symbol] = son_barlar[symbol]
+
+        degerlendirilecek = [s for s, a in akislar.items() if a.son is not None] if hepsi else degisen
+        kayitlar = []
+        with span('alarm'):
+            for symbol in degerlendirilecek:
+                akis = akislar[symbol]
+                if akis.son is None:
+                    continue
+                son, onceki = _bar_degerleri(akis, 0), _bar_degerleri(akis, 1)
+                for kural in kurallar:
+                    if kural.semboller is not None and symbol not in kural.semboller:
+                        continue
+                    if kural.fn(onceki, son):
+                        kayitlar.append((kural.id, symbol, akis.tampon.son_ts, son['Close']))
+
+        yeniler = self.depo.kaydet(kayitlar) if kayitlar else []
+        adlar = {kural.id: kural.ad for kural in kurallar}
+        for kural_id, symbol, ts, close in yeniler:
+            self.sonuclar.put((adlar[kural_id], symbol, ts, close))
+        say('alarm_tetiklenen', len(yeniler))
+
+        self.son_tur = {'sure': time.perf_counter() - bas, 'izlenen': len(akislar),
+                        'degerlendirilen': len(degerlendirilecek), 'zaman': time.time()}
+        return len(yeniler)
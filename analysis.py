@@ -0,0 +1,228 @@
+from datetime import datetime
+
+from diagnostics import span
+from fundamentals import veri_yasi_metni
+from indicators import GOSTERGE_SUTUNLARI, gostergeleri_hesapla
+
+MIN_BAR = 10
+
+# Puan eşikleri ve değerlendirme metinleri (en yüksek eşikten başlayarak)
+SINYAL_SEVIYELERI = [
+    (4, "GÜÇLÜ AL", "GÜÇLÜ AL SİNYALİ (Çoğunlukla olumlu göstergeler)"),
+    (2, "Orta AL", "Orta seviye al sinyali (Bazı olumlu göstergeler)"),
+    (1, "Zayıf AL", "Zayıf al sinyali (Sınırlı olumlu gösterge)"),
+    (0, "Satış baskısı", "Satış baskısı (Olumsuz göstergeler hakim)"),
+]
+
+
+def teknik_analiz(df):
+    """OHLCV verisine RSI, Stokastik, MACD, EMA/SMA, Bollinger ve OBV sütunlarını ekler.
+
+    Hata olursa None döndürür. Modül seviyesinde tanımlı olduğu için süreç havuzlarına gönderilebilir.
+    """
+    try:
+        with span('teknik_analiz'):
+            gostergeler = gostergeleri_hesapla(df['Close'].to_numpy(), df['High'].to_numpy(),
+                                              df['Low'].to_numpy(), df['Volume'].to_numpy())
+            return df.assign(**gostergeler)
+    except Exception as e:
+        print(f"Teknik analiz hatası: {e}")
+        return None
+
+
+def sinyal_puani(df):
+    """Son bar için al sinyali puanını ve hacmin ortalamanın 1.5 katını aşıp aşmadığını döndürür."""
+    son = df.iloc[-1]
+    buy_signal = 0
+
+    # Al sinyalleri
+    if son['RSI'] < 35: buy_signal += 1
+    if son['MACD'] > son['MACD_signal']: buy_signal += 1
+    if son['Close'] > son['EMA_20']: buy_signal += 1
+    if son['Close'] > son['SMA_50']: buy_signal += 1
+    if son['Close'] > son['EMA_200']: buy_signal += 1
+    if son['Close'] < son['BB_lower']: buy_signal += 1
+
+    # Ortalamanın 1.5 katından fazla hacim
+    yuksek_hacim = bool(son['Volume'] > df['Volume'].mean() * 1.5)
+    if yuksek_hacim:
+        buy_signal += 1
+
+    return buy_signal, yuksek_hacim
+
+
+def sinyal_seviyesi(buy_signal):
+    """Puana karşılık gelen (kısa etiket, açıklama) ikilisini döndürür."""
+    for esik, etiket, aciklama in SINYAL_SEVIYELERI:
+        if buy_signal >= esik:
+            return etiket, aciklama
+    return SINYAL_SEVIYELERI[-1][1:]
+
+
+def temel_analiz(temel_veri, hisse_kodu):
+    """Önbellekteki `info` alanlarını rapordaki biçimiyle döndürür; veri yoksa None."""
+    with span('temel_analiz'):
+        return _temel_analiz(temel_veri, hisse_kodu)
+
+
+def _temel_analiz(temel_veri, hisse_kodu):
+    try:
+        info, fetched_at = temel_veri.get(hisse_kodu)
+        if info is None:
+            return None
+
+        # Market cap kontrolü
+        market_cap = info.get('marketCap')
+        market_cap_str = f"{market_cap/1000000:,.2f} M TL" if market_cap else 'N/A'
+
+        # Temettü verimi kontrolü
+        dividend_yield = info.get('dividendYield')
+        dividend_str = f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A'
+
+        # Kar marjı kontrolü
+        profit_margins = info.get('profitMargins')
+        profit_str = f"{profit_margins*100:.2f}%" if profit_margins else 'N/A'
+
+        return {
+            'Piyasa Değeri': market_cap_str,
+            'F/K': info.get('forwardPE', 'N/A'),
+            'FD/FAVÖK': info.get('enterpriseToEbitda', 'N/A'),
+            'Temettu Verimi': dividend_str,
+            'Son Çeyrek Kâr': profit_str,
+            '52 Hafta En Yüksek': info.get('fiftyTwoWeekHigh', 'N/A'),
+            '52 Hafta En Düşük': info.get('fiftyTwoWeekLow', 'N/A'),
+            'Veri Yaşı': veri_yasi_metni(fetched_at),
+        }
+    except Exception as e:
+        print(f"Temel analiz hatası: {e}")
+        return None
+
+
+def hisse_analizi(hisse_kodu, periyot, df, temel_veri=None, hesapla=None, ilerleme=None):
+    """Bir hissenin fiyat, teknik, temel ve sinyal özetini JSON'a yazılabilir sözlük olarak döndürür.
+
+    `hesapla(fn, *args)` verilirse teknik analiz onunla (ör. süreç havuzunda) çalıştırılır;
+    `ilerleme(oran, durum)` aşamaları bildirir. Veri yetersizse ValueError fırlatır.
+    """
+    hisse_kodu = hisse_kodu.upper()
+    if df is None or df.empty or len(df) < MIN_BAR:
+        raise ValueError(f"Yeterli veri bulunamadı (en az {MIN_BAR} iş günü gereklidir)\nSeçilen periyot: {periyot}")
+
+    if ilerleme is not None:
+        ilerleme(0.3, "Teknik analiz")
+    df = hesapla(teknik_analiz, df) if hesapla is not None else teknik_analiz(df)
+    if df is None:
+        raise ValueError("Teknik analiz yapılamadı")
+
+    son = df.iloc[-1]
+    son_fiyat = float(son['Close'])
+    onceki_fiyat = float(df['Close'].iloc[-2])
+    close, volume = df['Close'], df['Volume']
+
+    temel = None
+    if temel_veri is not None:
+        if ilerleme is not None:
+            ilerleme(0.6, "Temel analiz")
+        temel = temel_analiz(temel_veri, hisse_kodu)
+
+    buy_signal, yuksek_hacim = sinyal_puani(df)
+    sinyal, degerlendirme = sinyal_seviyesi(buy_signal)
+    return {
+        'symbol': hisse_kodu,
+        'periyot': periyot,
+        'zaman': datetime.now().isoformat(timespec='seconds'),
+        'fiyat': {
+            'son': son_fiyat,
+            'degisim': son_fiyat - onceki_fiyat,
+            'yuzde': (son_fiyat / onceki_fiyat - 1) * 100,
+            'ortalama': float(close.mean()),
+            'en_yuksek': float(close.max()),
+            'en_dusuk': float(close.min()),
+            'volatilite': float((close.max() - close.min()) / close.mean() * 100),
+            'son_hacim': float(son['Volume']),
+            'ortalama_hacim': float(volume.mean()),
+            'en_yuksek_hacim': float(volume.max()),
+        },
+        'teknik': {sutun: float(son[sutun]) for sutun in GOSTERGE_SUTUNLARI},
+        'temel': temel,
+        'puan': buy_signal,
+        'yuksek_hacim': yuksek_hacim,
+        'sinyal': sinyal,
+        'degerlendirme': degerlendirme,
+    }
+
+
+def rapor_metni(analiz):
+    """hisse_analizi sonucunu uygulamadaki metin raporuna çevirir."""
+    fiyat, t = analiz['fiyat'], analiz['teknik']
+    close = fiyat['son']
+    zaman = datetime.fromisoformat(analiz['zaman'])
+
+    def konum(deger):
+        return "(Üstünde ▲)" if close > deger else "(Altında ▼)"
+
+    metin = f"""
+📈 {analiz['symbol']}.IS ANALİZ RAPORU - {zaman.strftime('%d.%m.%Y %H:%M')}
+{'='*80}
+
+🔹 FİYAT VE HACİM BİLGİLERİ ({analiz['periyot']}):
+   • Son Fiyat: {close:.2f} TL
+   • Günlük Değişim: {fiyat['degisim']:+.2f} TL ({fiyat['yuzde']:+.2f}%)
+   • Ortalama Fiyat: {fiyat['ortalama']:.2f} TL
+   • Ortalama Hacim: {fiyat['ortalama_hacim']/1000000:.2f} M
+   • Son Hacim: {fiyat['son_hacim']/1000000:.2f} M
+   • En Yüksek Fiyat: {fiyat['en_yuksek']:.2f} TL
+   • En Düşük Fiyat: {fiyat['en_dusuk']:.2f} TL
+   • En Yüksek Hacim: {fiyat['en_yuksek_hacim']/1000000:.2f} M
+   • Volatilite: {fiyat['volatilite']:.2f}%
+
+📊 TEKNİK GÖSTERGELER:
+   • RSI (14): {t['RSI']:.2f} {"(Aşırı Alım ⚠)" if t['RSI'] > 70 else "(Aşırı Satım ⚠)" if t['RSI'] < 30 else ""}
+   • MACD: {t['MACD']:.2f} {"(Yukarı)" if t['MACD'] > t['MACD_signal'] else "(Aşağı)"}
+   • MACD Sinyal: {t['MACD_signal']:.2f}
+   • EMA 20: {t['EMA_20']:.2f} {konum(t['EMA_20'])}
+   • SMA 50: {t['SMA_50']:.2f} {konum(t['SMA_50'])}
+   • EMA 200: {t['EMA_200']:.2f} {konum(t['EMA_200'])}
+   • Bollinger Band: {"(Üst Band)" if close > t['BB_upper'] else "(Alt Band)" if close < t['BB_lower'] else "(Orta Band)"}
+   • OBV: {t['OBV']/1000000:+.2f} M
+   • Hacim Ortalama/Şimdi: {fiyat['ortalama_hacim']/1000000:.1f}M/{fiyat['son_hacim']/1000000:.1f}M
+"""
+    temel = analiz['temel']
+    if temel:
+        metin += f"""
+💰 TEMEL GÖSTERGELER:
+   • Piyasa Değeri: {temel.get('Piyasa Değeri', 'N/A')}
+   • F/K: {temel.get('F/K', 'N/A')}
+   • FD/FAVÖK: {temel.get('FD/FAVÖK', 'N/A')}
+   • Temettu Verimi: {temel.get('Temettu Verimi', 'N/A')}
+   • Son Çeyrek Kâr: {temel.get('Son Çeyrek Kâr', 'N/A')}
+   • 52 Hafta En Yüksek: {temel.get('52 Hafta En Yüksek', 'N/A')}
+   • 52 Hafta En Düşük: {temel.get('52 Hafta En Düşük', 'N/A')}
+   • Veri yaşı: {temel.get('Veri Yaşı', 'N/A')}
+
+"""
+    else:
+        metin += "\n⚠ Temel analiz verileri alınamadı\n"
+
+    # Sinyal analizi
+    metin += "\n💡 GENEL DEĞERLENDİRME:\n"
+    if analiz['yuksek_hacim']:
+        metin += "\n   • Yüksek Hacim: Alım satım ilgisinde artış"
+    metin += f"   • {analiz['degerlendirme']}"
+    return metin
+
+
+def rapor_satiri(analiz):
+    """CSV çıktısı için analizi tek seviyeli sözlüğe açar."""
+    satir = {
+        'symbol': analiz['symbol'],
+        'periyot': analiz['periyot'],
+        'zaman': analiz['zaman'],
+        'puan': analiz['puan'],
+        'sinyal': analiz['sinyal'],
+        'yuksek_hacim': analiz['yuksek_hacim'],
+    }
+    satir.update(analiz['fiyat'])
+    satir.update(analiz['teknik'])
+    satir.update(analiz['temel'] or {})
+    return satir
@@ -0,0 +1,234 @@
+"""analiz_et'teki al sinyali puanının geçmiş veride sınanması.
+
+Puan her sembolün her barı için dizi işlemleriyle hesaplanır; pozisyonlar, getiriler
+ve işlem istatistikleri de bar başına Python döngüsü olmadan bulunur. Eşik taramaları
+puan matrisi bir kez hesaplandıktan sonra süreç havuzunda paralel çalışır.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from indicators import gostergeleri_hesapla
+
+# BIST aracı kurum komisyonu (BSMV dahil) ve tek yön kayma varsayımları
+KOMISYON = 0.0015
+KAYMA = 0.0005
+YIL_BAR = 252
+
+
+def fiyat_matrisleri(frames):
+    """{sembol: OHLCV DataFrame} sözlüğünü tarihlere göre hizalanmış (sembol x bar) dizilere çevirir."""
+    frames = {s: df for s, df in frames.items() if df is not None and not df.empty}
+    symbols = list(frames)
+    if not symbols:
+        raise ValueError("Sınanacak veri yok")
+
+    matrisler = {}
+    for sutun in ('High', 'Low', 'Close', 'Volume'):
+        tablo = pd.concat({s: frames[s][sutun] for s in symbols}, axis=1).sort_index()
+        matrisler[sutun] = tablo.to_numpy(dtype=np.float64).T
+    return symbols, tablo.index, matrisler
+
+
+def panel_matrisleri(panel, symbols, periyot=None):
+    """fiyat_matrisleri'nin fiyat panelinden (FiyatPaneli) okuyan karşılığı.
+
+    Seçili satırlar panelden doğrudan float64 kopyalanır; bar olmayan günlerde
+    hacim de NaN yapılır.
+    """
+    symbols, tarihler, matrisler = panel.alt_matrisler(symbols, ('High', 'Low', 'Close', 'Volume'), periyot)
+    if not symbols:
+        raise ValueError("Sınanacak veri yok")
+    matrisler['Volume'][np.isnan(matrisler['Close'])] = np.nan
+    return symbols, tarihler, matrisler
+
+
+def puan_matrisi(high, low, close, volume):
+    """sinyal_puani kurallarını her bar için uygular.
+
+    Hacim koşulunda ileriye bakmamak için tüm dönemin değil, o bara kadarki
+    ortalama hacim kullanılır. Veri olmayan barlarda puan -1'dir.
+    """
+    g = gostergeleri_hesapla(close, high, low, volume)
+    close = _ileri_doldur(close)
+    with np.errstate(invalid='ignore'):
+        puan = ((g['RSI'] < 35).astype(np.int8)
+                + (g['MACD'] > g['MACD_signal'])
+                + (close > g['EMA_20'])
+                + (close > g['SMA_50'])
+                + (close > g['EMA_200'])
+                + (close < g['BB_lower']))
+
+        hacim = np.nan_to_num(volume)
+        sayac = np.cumsum(~np.isnan(volume), axis=-1)
+        ortalama = np.cumsum(hacim, axis=-1) / np.maximum(sayac, 1)
+        puan += hacim > ortalama * 1.5
+
+    puan[np.isnan(close)] = -1
+    return puan
+
+
+def bar_getirileri(close):
+    """Bir önceki bara göre basit getiri; veri olmayan barlarda 0."""
+    close = _ileri_doldur(close)
+    getiri = np.zeros_like(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        getiri[:, 1:] = close[:, 1:] / close[:, :-1] - 1
+    return np.nan_to_num(getiri, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def pozisyonlar(puan, giris_esigi=4, cikis_esigi=1):
+    """Puan giriş eşiğine ulaşınca alınır, çıkış eşiğine inince satılır.
+
+    Karar bar kapanışında verilir ve bir sonraki barın getirisine uygulanır.
+    Dönüş değeri her barın sonunda tutulan pozisyondur (0/1).
+    """
+    durum = np.full(puan.shape, np.nan)
+    durum[puan <= cikis_esigi] = 0.0
+    durum[puan >= giris_esigi] = 1.0
+    durum[:, 0] = np.where(np.isnan(durum[:, 0]), 0.0, durum[:, 0])
+    return _ileri_doldur(durum)
+
+
+def sina(puan, getiri, giris_esigi=4, cikis_esigi=1, komisyon=KOMISYON, kayma=KAYMA):
+    """Eşit ağırlıklı portföyün performans özetini döndürür.
+
+    Her sembole sermayenin 1/N'i ayrılır; pozisyonda olmayan pay nakitte bekler.
+    """
+    poz = pozisyonlar(puan, giris_esigi, cikis_esigi)
+    onceki = np.zeros_like(poz)
+    onceki[:, 1:] = poz[:, :-1]
+
+    degisim = np.abs(poz - onceki)
+    maliyet = degisim * (komisyon + kayma)
+    sembol_getiri = onceki * getiri - maliyet
+    portfoy_getiri = sembol_getiri.mean(axis=0)
+
+    equity = np.cumprod(1 + portfoy_getiri)
+    zirve = np.maximum.accumulate(equity)
+    yil = len(equity) / YIL_BAR
+
+    islem_getirileri = _islem_getirileri(poz, onceki, sembol_getiri)
+    return {
+        'giris_esigi': giris_esigi,
+        'cikis_esigi': cikis_esigi,
+        'cagr': float(equity[-1] ** (1 / yil) - 1) if yil > 0 and equity[-1] > 0 else float('nan'),
+        'toplam_getiri': float(equity[-1] - 1),
+        'max_dusus': float((equity / zirve - 1).min()),
+        'islem_sayisi': int(len(islem_getirileri)),
+        'isabet_orani': float((islem_getirileri > 0).mean()) if len(islem_getirileri) else float('nan'),
+        'ortalama_islem': float(islem_getirileri.mean()) if len(islem_getirileri) else float('nan'),
+        # Yıllık alım + satım hacminin sermayeye oranı
+        'devir': float(degisim.sum() / puan.shape[0] / yil) if yil > 0 else float('nan'),
+        'pozisyonda': float(poz.mean()),
+    }
+
+
+def _islem_getirileri(poz, onceki, sembol_getiri):
+    """Her tamamlanmış ya da açık işlemin bileşik getirisi (maliyetler dahil)."""
+    girisler = (poz == 1) & (onceki == 0)
+    if not girisler.any():
+        return np.empty(0)
+
+    # Düzleştirilmiş dizide kümülatif sayım her girişe benzersiz bir numara verir.
+    # Satır başında pozisyon ancak aynı satırdaki bir girişle açılabildiği için
+    # önceki sembolün numarası sonraki sembolün aktif barlarına taşmaz.
+    islem_no = np.cumsum(girisler.ravel()).reshape(poz.shape)
+
+    # İşlemin getirisi girişten sonraki bardan çıkış barına kadar (satış maliyeti dahil)
+    aktif = (onceki == 1) | girisler
+    log_getiri = np.log1p(np.where(aktif, sembol_getiri, 0.0))
+    toplam = np.bincount(islem_no[aktif], weights=log_getiri[aktif])
+    return np.expm1(toplam[1:])
+
+
+def _ileri_doldur(x):
+    gecerli = ~np.isnan(x)
+    idx = np.where(gecerli, np.arange(x.shape[-1]), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return np.take_along_axis(x, idx, axis=-1)
+
+
+# Süreç havuzundaki işçilerin paylaştığı diziler; her işçiye bir kez gönderilir
+_havuz_verisi = {}
+
+
+def _havuz_baslat(puan, getiri, komisyon, kayma):
+    _havuz_verisi.update(puan=puan, getiri=getiri, komisyon=komisyon, kayma=kayma)
+
+
+def _havuzda_sina(esikler):
+    d = _havuz_verisi
+    return sina(d['puan'], d['getiri'], esikler[0], esikler[1], d['komisyon'], d['kayma'])
+
+
+def esik_taramasi(puan, getiri, esikler=None, isci=None, komisyon=KOMISYON, kayma=KAYMA):
+    """(giriş, çıkış) eşik ızgarasını süreç havuzunda sınar; sonuçları CAGR'a göre sıralar."""
+    if esikler is None:
+        esikler = [(giris, cikis) for giris in range(1, 8) for cikis in range(0, giris)]
+    isci = isci or max(1, (os.cpu_count() or 2) - 1)
+
+    with ProcessPoolExecutor(max_workers=isci, initializer=_havuz_baslat,
+                             initargs=(puan, getiri, komisyon, kayma)) as havuz:
+        sonuclar = list(havuz.map(_havuzda_sina, esikler, chunksize=max(1, len(esikler) // (isci * 4))))
+    return sorted(sonuclar, key=lambda s: np.nan_to_num(s['cagr'], nan=-np.inf), reverse=True)
+
+
+def sonuc_satiri(s):
+    return (f"giriş>={s['giris_esigi']} çıkış<={s['cikis_esigi']}  "
+            f"CAGR {s['cagr']*100:+7.2f}%  MaxDD {s['max_dusus']*100:7.2f}%  "
+            f"İsabet {s['isabet_orani']*100:5.1f}%  İşlem {s['islem_sayisi']:5d}  "
+            f"Devir {s['devir']:6.2f}x")
+
+
+def main(argv=None):
+    from bar_store import PERIYOTLAR, BarStore
+    from borsa_cli import sembolleri_oku
+
+    parser = argparse.ArgumentParser(description="Al sinyali puanının geçmiş veride sınanması")
+    parser.add_argument('symbols', nargs='*', help="Hisse kodları")
+    parser.add_argument('--file', help="Her satırda bir hisse kodu olan dosya")
+    parser.add_argument('--period', default="2y", choices=list(PERIYOTLAR), help="Veri periyodu (varsayılan: 2y)")
+    parser.add_argument('--entry', type=int, default=4, help="Giriş eşiği (varsayılan: 4, GÜÇLÜ AL)")
+    parser.add_argument('--exit', type=int, default=1, help="Çıkış eşiği (varsayılan: 1)")
+    parser.add_argument('--commission', type=float, default=KOMISYON, help="Tek yön komisyon oranı")
+    parser.add_argument('--slippage', type=float, default=KAYMA, help="Tek yön kayma oranı")
+    parser.add_argument('--sweep', action='store_true', help="Tüm eşik ızgarasını tara")
+    parser.add_argument('--workers', type=int, help="Tarama için süreç sayısı")
+    parser.add_argument('--panel', action='store_true', help="Barları fiyat panelinden (price_panel) oku")
+    args = parser.parse_args(argv)
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.file:
+        symbols += sembolleri_oku(args.file)
+    if not symbols:
+        parser.error("En az bir hisse kodu ya da --file gerekli")
+
+    symbols = list(dict.fromkeys(symbols))
+    bar_store = BarStore()
+    if args.panel:
+        from price_panel import FiyatPaneli, panel_dizini
+
+        panel = FiyatPaneli(panel_dizini(bar_store))
+        panel.guncelle(bar_store, symbols, args.period)
+        symbols, tarihler, m = panel_matrisleri(panel, symbols, args.period)
+    else:
+        symbols, tarihler, m = fiyat_matrisleri(bar_store.get_many(symbols, args.period))
+    puan = puan_matrisi(m['High'], m['Low'], m['Close'], m['Volume'])
+    getiri = bar_getirileri(m['Close'])
+    print(f"{len(symbols)} sembol, {len(tarihler)} bar ({tarihler[0]:%d.%m.%Y} - {tarihler[-1]:%d.%m.%Y})")
+
+    if args.sweep:
+        for s in esik_taramasi(puan, getiri, isci=args.workers, komisyon=args.commission, kayma=args.slippage):
+            print(sonuc_satiri(s))
+    else:
+        print(sonuc_satiri(sina(puan, getiri, args.entry, args.exit, args.commission, args.slippage)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
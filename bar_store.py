@@ -0,0 +1,313 @@
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from diagnostics import say, span
+from providers import saglayici as varsayilan_saglayici
+
+# Periyot -> (birim, miktar). 'd' işlem günü, 'mo' ay, 'y' yıl olarak yorumlanır.
+PERIYOTLAR = {
+    "1d": ("d", 1),
+    "5d": ("d", 5),
+    "1mo": ("mo", 1),
+    "3mo": ("mo", 3),
+    "6mo": ("mo", 6),
+    "1y": ("y", 1),
+    "2y": ("y", 2),
+    "5y": ("y", 5),
+    "max": ("max", 0),
+}
+
+# Periyotların uzunluk sırası; saklanan geçmişin hangi periyodu karşıladığını bulmak için
+PERIYOT_SIRASI = ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "max"]
+
+# Bar aralıkları ve Yahoo'nun gün içi aralıklarda geriye dönük verdiği en uzun periyot
+ARALIKLAR = ["1d", "1h", "15m", "5m", "1m"]
+ARALIK_SINIRLARI = {"1m": "5d", "5m": "1mo", "15m": "1mo", "1h": "2y"}
+
+ZAMAN_DILIMI = "Europe/Istanbul"
+SUTUNLAR = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class BarStore:
+    """Sembol ve aralık bazında OHLCV barlarını SQLite'ta saklar.
+
+    İlk istekte seçilen periyodun tamamı indirilir, sonraki isteklerde yalnızca
+    son saklanan bardan sonrası çekilir ve periyotlar saklanan geçmişten kesilir.
+    """
+
+    def __init__(self, db_path=None, tazeleme_suresi=60, saglayici=None):
+        self.saglayici = saglayici or varsayilan_saglayici()
+        self.conn = sqlite3.connect(db_path or self.saglayici.onbellek_yolu('market_data.db'),
+                                    check_same_thread=False)
+        # Aynı sembol için son indirmeden bu kadar saniye geçmeden tekrar ağa çıkılmaz
+        self.tazeleme_suresi = tazeleme_suresi
+        # Bağlantı arka plan işleriyle paylaşıldığı için SQLite erişimleri tek tek yapılır;
+        # indirmeler kilit dışında çalışır, bir sembolün indirmesi diğerlerini bekletmez
+        self._kilit = threading.RLock()
+        self.create_tables()
+
+    def create_tables(self):
+        cursor = self.conn.cursor()
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bars (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            open REAL,
+            high REAL,
+            low REAL,
+            close REAL,
+            volume INTEGER,
+            PRIMARY KEY (symbol, interval, ts)
+        ) WITHOUT ROWID''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS indicator_state (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            ts INTEGER NOT NULL,
+            state TEXT NOT NULL,
+            PRIMARY KEY (symbol, interval)
+        )''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS bar_meta (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            period TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            PRIMARY KEY (symbol, interval)
+        )''')
+        self.conn.commit()
+
+    def get_history(self, symbol, period="3mo", interval="1d"):
+        """Periyoda ait barları DataFrame olarak döndürür, gerekirse eksik kısmı indirir."""
+        symbol = symbol.upper()
+        period = periyodu_sinirla(period, interval)
+        meta = self._get_meta(symbol, interval)
+
+        if meta is None or not self._karsilar(meta[0], period):
+            say('bar_onbellek_kacirma')
+            self._indir(symbol, interval, period=period)
+        elif time.time() - meta[1] >= self.tazeleme_suresi:
+            say('bar_onbellek_bayat')
+            self._tamamla(symbol, interval)
+        else:
+            say('bar_onbellek_isabet')
+
+        return self._kes(self._oku(symbol, interval), period)
+
+    def get_many(self, symbols, period="3mo", interval="1d"):
+        """Birden çok sembolün barlarını toplu indirme istekleriyle getirir.
+
+        Eksik semboller tek bir toplu istekle, bayatlamış olanlar ise en eski
+        son bardan itibaren yine tek çağrıyla tamamlanır. {sembol: DataFrame} döndürür.
+        """
+        symbols = [s.upper() for s in symbols]
+        period = periyodu_sinirla(period, interval)
+        self._toplu_guncelle(symbols, period, interval)
+        return {symbol: self._kes(self._oku(symbol, interval), period) for symbol in symbols}
+
+    def yeni_barlar(self, symbols, interval, sonra, period=None):
+        """Sembolleri toplu tamamlar ve yalnızca `sonra[sembol]` zamanından sonraki barları döndürür.
+
+        Canlı izlemede her turda tüm geçmişin okunmaması için kullanılır. `sonra`
+        sözlüğünde olmayan semboller için `period` kadar geçmiş döner.
+        """
+        symbols = [s.upper() for s in symbols]
+        period = periyodu_sinirla(period or ARALIK_SINIRLARI.get(interval, "3mo"), interval)
+        self._toplu_guncelle(symbols, period, interval)
+        sonuc = {}
+        for symbol in symbols:
+            ts = sonra.get(symbol)
+            if ts is None:
+                sonuc[symbol] = self._kes(self._oku(symbol, interval), period)
+            else:
+                sonuc[symbol] = self._oku(symbol, interval, _epoch(ts))
+        return sonuc
+
+    def son_barlar(self, symbols, interval="1d", period=None):
+        """Sembolleri toplu tamamlar ve her birinin son barını döndürür.
+
+        {sembol: (ts, close, volume)} döner; yeni bar gelen (ya da son barı değişen)
+        sembolleri tüm barları okumadan bulmak için kullanılır.
+        """
+        symbols = [s.upper() for s in symbols]
+        period = periyodu_sinirla(period or ARALIK_SINIRLARI.get(interval, "3mo"), interval)
+        self._toplu_guncelle(symbols, period, interval)
+        sonuc = {}
+        with self._kilit, span('sqlite'):
+            cursor = self.conn.cursor()
+            # Birincil anahtar üzerinde sondan tek satır okunur; sembolün tüm barları taranmaz
+            for symbol in symbols:
+                cursor.execute('''
+                SELECT ts, close, volume FROM bars
+                WHERE symbol=? AND interval=?
+                ORDER BY ts DESC LIMIT 1
+                ''', (symbol, interval))
+                row = cursor.fetchone()
+                if row is not None:
+                    sonuc[symbol] = row
+        return sonuc
+
+    def _toplu_guncelle(self, symbols, period, interval):
+        eksik, bayat = [], []
+        with self._kilit:
+            for symbol in symbols:
+                meta = self._get_meta(symbol, interval)
+                if meta is None or not self._karsilar(meta[0], period):
+                    eksik.append(symbol)
+                elif time.time() - meta[1] >= self.tazeleme_suresi:
+                    bayat.append(symbol)
+            son_ts = min(self._son_ts(symbol, interval) or 0 for symbol in bayat) if bayat else None
+        say('bar_onbellek_kacirma', len(eksik))
+        say('bar_onbellek_bayat', len(bayat))
+        say('bar_onbellek_isabet', len(symbols) - len(eksik) - len(bayat))
+
+        if eksik:
+            frames = self._toplu_indir(eksik, interval, period=period)
+            for symbol in eksik:
+                self._kaydet(symbol, interval, frames.get(symbol), period=period)
+
+        if bayat:
+            baslangic = datetime.utcfromtimestamp(son_ts).date()
+            bitis = datetime.utcnow().date() + timedelta(days=1)
+            frames = self._toplu_indir(bayat, interval, start=baslangic, end=bitis)
+            for symbol in bayat:
+                self._kaydet(symbol, interval, frames.get(symbol))
+
+    def _toplu_indir(self, symbols, interval, **kwargs):
+        return self.saglayici.gecmis(symbols, interval, **kwargs)
+
+    def bars_after(self, symbol, interval="1d", ts=None):
+        """Verilen zamandan sonraki saklı barları indirme yapmadan döndürür."""
+        with self._kilit:
+            return self._oku(symbol.upper(), interval, _epoch(ts) if ts is not None else None)
+
+    def durum_kaydet(self, symbol, interval, ts, durum):
+        """Artımlı göstergelerin `ts` barı itibarıyla durumunu saklar."""
+        with self._kilit:
+            self.conn.execute('''
+            INSERT OR REPLACE INTO indicator_state (symbol, interval, ts, state)
+            VALUES (?, ?, ?, ?)
+            ''', (symbol.upper(), interval, _epoch(ts), json.dumps(durum)))
+            self.conn.commit()
+
+    def durum_oku(self, symbol, interval="1d"):
+        """(ts, durum) döndürür; kayıt yoksa None."""
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT ts, state FROM indicator_state WHERE symbol=? AND interval=?',
+                           (symbol.upper(), interval))
+            row = cursor.fetchone()
+        if row is None:
+            return None
+        return pd.Timestamp(row[0], unit="s", tz="UTC").tz_convert(ZAMAN_DILIMI), json.loads(row[1])
+
+    def _get_meta(self, symbol, interval):
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT period, fetched_at FROM bar_meta WHERE symbol=? AND interval=?',
+                           (symbol, interval))
+            return cursor.fetchone()
+
+    def _karsilar(self, saklanan, istenen):
+        return PERIYOT_SIRASI.index(saklanan) >= PERIYOT_SIRASI.index(istenen)
+
+    def _son_ts(self, symbol, interval):
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT MAX(ts) FROM bars WHERE symbol=? AND interval=?', (symbol, interval))
+            return cursor.fetchone()[0]
+
+    def _indir(self, symbol, interval, period):
+        df = self.saglayici.gecmis([symbol], interval, period=period).get(symbol)
+        self._kaydet(symbol, interval, df, period=period)
+
+    def _tamamla(self, symbol, interval):
+        son_ts = self._son_ts(symbol, interval)
+        if son_ts is None:
+            return
+        # Son bar gün içinde henüz kapanmamış olabilir, o yüzden onu da yeniden çekiyoruz
+        baslangic = datetime.utcfromtimestamp(son_ts).date()
+        bitis = datetime.utcnow().date() + timedelta(days=1)
+        df = self.saglayici.gecmis([symbol], interval, start=baslangic, end=bitis).get(symbol)
+        self._kaydet(symbol, interval, df)
+
+    def _kaydet(self, symbol, interval, df, period=None):
+        with self._kilit, span('sqlite'):
+            cursor = self.conn.cursor()
+            if df is not None and not df.empty:
+                index = pd.to_datetime(df.index)
+                if index.tz is None:
+                    index = index.tz_localize(ZAMAN_DILIMI)
+                ts = (index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+                rows = zip(
+                    (symbol for _ in ts), (interval for _ in ts), ts.tolist(),
+                    df['Open'].tolist(), df['High'].tolist(), df['Low'].tolist(),
+                    df['Close'].tolist(), df['Volume'].fillna(0).astype('int64').tolist(),
+                )
+                cursor.executemany('''
+                INSERT OR REPLACE INTO bars (symbol, interval, ts, open, high, low, close, volume)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+
+            if period is not None:
+                cursor.execute('''
+                INSERT OR REPLACE INTO bar_meta (symbol, interval, period, fetched_at)
+                VALUES (?, ?, ?, ?)
+                ''', (symbol, interval, period, time.time()))
+            else:
+                cursor.execute('UPDATE bar_meta SET fetched_at=? WHERE symbol=? AND interval=?',
+                               (time.time(), symbol, interval))
+            self.conn.commit()
+
+    def _oku(self, symbol, interval, sonra=None):
+        with self._kilit, span('sqlite'):
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            SELECT ts, open, high, low, close, volume FROM bars
+            WHERE symbol=? AND interval=? AND ts > ?
+            ORDER BY ts
+            ''', (symbol, interval, sonra if sonra is not None else -2**62))
+            rows = cursor.fetchall()
+        df = pd.DataFrame(rows, columns=["ts"] + SUTUNLAR)
+        index = pd.to_datetime(df.pop("ts"), unit="s", utc=True).dt.tz_convert(ZAMAN_DILIMI)
+        df.index = pd.DatetimeIndex(index, name="Date")
+        return df
+
+    def _kes(self, df, period):
+        """Saklanan geçmişten istenen periyodu keser."""
+        if df.empty:
+            return df
+        birim, miktar = PERIYOTLAR[period]
+        if birim == "max":
+            return df
+        if birim == "d":
+            # Gün periyotları işlem günü sayısıdır; gün içi barlarda takvim günlerine göre kesilir
+            gunler = df.index.normalize().unique()
+            return df[df.index >= gunler[-min(miktar, len(gunler))]]
+        son = df.index[-1].normalize()
+        if birim == "mo":
+            baslangic = son - pd.DateOffset(months=miktar)
+        else:
+            baslangic = son - pd.DateOffset(years=miktar)
+        return df[df.index > baslangic]
+
+
+def periyodu_sinirla(period, interval):
+    """Gün içi aralıklarda periyodu Yahoo'nun verebildiği en uzun geçmişe indirir."""
+    sinir = ARALIK_SINIRLARI.get(interval)
+    if sinir is not None and PERIYOT_SIRASI.index(period) > PERIYOT_SIRASI.index(sinir):
+        return sinir
+    return period
+
+
+def _epoch(ts):
+    ts = pd.Timestamp(ts)
+    if ts.tz is None:
+        ts = ts.tz_localize(ZAMAN_DILIMI)
+    return int(ts.tz_convert("UTC").timestamp())
@@ -0,0 +1,146 @@
+"""Benchmark'ların ağsız çalışması için OHLCV ve `info` fikstürleri.
+
+Kayıtlı fikstür yoksa aynı tohumla her seferinde aynı çıkan sentetik veri üretilir.
+Gerçek veriyle kaydetmek için (ağ gerekir):
+
+    python -m benchmarks.fixtures --record
+"""
+import argparse
+import gzip
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+FIKSTUR_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+OHLCV_DOSYASI = os.path.join(FIKSTUR_DIZINI, 'ohlcv.csv.gz')
+INFO_DOSYASI = os.path.join(FIKSTUR_DIZINI, 'info.json')
+
+FIKSTUR_SEMBOLLERI = [
+    'THYAO', 'AKBNK', 'GARAN', 'ISCTR', 'KOZAA', 'SASA', 'ASELS', 'TCELL', 'PETKM', 'TUPRS',
+    'KCHOL', 'ARCLK', 'BIMAS', 'EREGL', 'FROTO', 'HALKB', 'KRDMD', 'SAHOL', 'SISE', 'TKFEN',
+    'TOASO', 'VAKBN', 'YKBNK', 'AKSA', 'ALARK', 'ASUZU', 'BERA', 'BRISA', 'DOHOL', 'ENKAI',
+    'MGROS', 'OTKAR', 'PGSUS', 'TAVHL', 'TTKOM', 'ULKER',
+]
+KAYIT_PERIYODU = "5y"
+
+
+def kaynak(dizin=FIKSTUR_DIZINI):
+    """Kullanılacak fikstürün kaynağı: 'kayıtlı' ya da 'sentetik'."""
+    return 'kayıtlı' if os.path.exists(os.path.join(dizin, 'ohlcv.csv.gz')) else 'sentetik'
+
+
+def ohlcv_yukle(dizin=FIKSTUR_DIZINI):
+    """{sembol: OHLCV DataFrame} döndürür (indeks Europe/Istanbul saat diliminde).
+
+    `dizin`de kayıt yoksa sentetik veri döner.
+    """
+    path = os.path.join(dizin, 'ohlcv.csv.gz')
+    if not os.path.exists(path):
+        return {symbol: sentetik_ohlcv(symbol) for symbol in FIKSTUR_SEMBOLLERI}
+
+    df = pd.read_csv(path, parse_dates=['Date'])
+    frames = {}
+    for symbol, grup in df.groupby('symbol', sort=False):
+        grup = grup.drop(columns='symbol').set_index('Date')
+        grup.index = pd.DatetimeIndex(grup.index).tz_convert('Europe/Istanbul')
+        frames[symbol] = grup
+    return frames
+
+
+def info_yukle(dizin=FIKSTUR_DIZINI):
+    path = os.path.join(dizin, 'info.json')
+    if not os.path.exists(path):
+        return {symbol: sentetik_info(symbol) for symbol in FIKSTUR_SEMBOLLERI}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def uzat(df, bar_sayisi):
+    """Fikstürü istenen uzunluğa getirir; kısa kalırsa getirileri tekrar ederek geriye uzatır."""
+    if len(df) >= bar_sayisi:
+        return df.iloc[-bar_sayisi:]
+    oran = (df / df.shift(1)).iloc[1:]
+    tekrar = -(-bar_sayisi // len(oran))
+    oranlar = pd.concat([oran] * tekrar).iloc[-(bar_sayisi - 1):].to_numpy()
+    ilk = df.iloc[0].to_numpy()
+    degerler = np.vstack([ilk, ilk * np.cumprod(np.nan_to_num(oranlar, nan=1.0), axis=0)])
+    index = pd.bdate_range(end=df.index[-1].tz_localize(None), periods=bar_sayisi, tz='Europe/Istanbul')
+    return pd.DataFrame(degerler, index=index, columns=df.columns)
+
+
+def sentetik_ohlcv(symbol, bar_sayisi=1250):
+    """Sembole göre tohumlanmış geometrik Brown hareketi ile günlük OHLCV."""
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+    getiri = rng.normal(0.0004, 0.022, bar_sayisi)
+    close = rng.uniform(5, 300) * np.exp(np.cumsum(getiri))
+    acilis = np.concatenate([[close[0]], close[:-1]]) * (1 + rng.normal(0, 0.004, bar_sayisi))
+    yukari = np.abs(rng.normal(0, 0.01, bar_sayisi))
+    asagi = np.abs(rng.normal(0, 0.01, bar_sayisi))
+    index = pd.bdate_range(end='2024-12-31', periods=bar_sayisi, tz='Europe/Istanbul')
+    return pd.DataFrame({
+        'Open': acilis,
+        'High': np.maximum(acilis, close) * (1 + yukari),
+        'Low': np.minimum(acilis, close) * (1 - asagi),
+        'Close': close,
+        'Volume': rng.lognormal(15, 0.6, bar_sayisi).round(),
+    }, index=index)
+
+
+def sentetik_info(symbol):
+    rng = np.random.default_rng(zlib.crc32(symbol.encode()) + 1)
+    return {
+        'marketCap': float(rng.uniform(5e9, 5e11)),
+        'forwardPE': float(rng.uniform(3, 25)),
+        'enterpriseToEbitda': float(rng.uniform(2, 15)),
+        'dividendYield': float(rng.uniform(0, 0.08)),
+        'profitMargins': float(rng.uniform(-0.05, 0.3)),
+        'fiftyTwoWeekHigh': float(rng.uniform(50, 100)),
+        'fiftyTwoWeekLow': float(rng.uniform(10, 50)),
+    }
+
+
+def kaydet(symbols=FIKSTUR_SEMBOLLERI, period=KAYIT_PERIYODU):
+    """Fikstürleri Yahoo Finance'ten indirip `fixtures/` altına yazar."""
+    import yfinance as yf
+    from fundamentals import TEMEL_ALANLAR
+
+    os.makedirs(FIKSTUR_DIZINI, exist_ok=True)
+    tickers = [f"{s}.IS" for s in symbols]
+    df = yf.download(tickers, period=period, group_by="ticker", progress=False, auto_adjust=True)
+    parcalar = []
+    for symbol, ticker in zip(symbols, tickers):
+        parca = df[ticker].dropna(how="all")[['Open', 'High', 'Low', 'Close', 'Volume']]
+        if parca.empty:
+            print(f"{symbol}: veri yok, atlandı")
+            continue
+        parca = parca.copy()
+        parca.index = pd.DatetimeIndex(parca.index, name='Date')
+        if parca.index.tz is None:
+            parca.index = parca.index.tz_localize('Europe/Istanbul')
+        parcalar.append(parca.assign(symbol=symbol))
+    with gzip.open(OHLCV_DOSYASI, 'wt', encoding='utf-8', newline='') as f:
+        pd.concat(parcalar).to_csv(f)
+
+    infolar = {}
+    for symbol in symbols:
+        try:
+            info = yf.Ticker(f"{symbol}.IS").info
+            infolar[symbol] = {alan: info[alan] for alan in TEMEL_ALANLAR if alan in info}
+        except Exception as e:
+            print(f"{symbol}: info alınamadı ({e})")
+    with open(INFO_DOSYASI, 'w', encoding='utf-8') as f:
+        json.dump(infolar, f, ensure_ascii=False, indent=1)
+    print(f"{len(parcalar)} sembol kaydedildi: {FIKSTUR_DIZINI}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fikstürleri")
+    parser.add_argument('--record', action='store_true', help="Fikstürleri Yahoo Finance'ten kaydet")
+    args = parser.parse_args()
+    if args.record:
+        kaydet()
+    else:
+        print(f"Fikstür kaynağı: {kaynak()}")
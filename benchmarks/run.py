@@ -0,0 +1,221 @@
+"""Ağ gerektirmeyen performans ölçümleri.
+
+    python -m benchmarks.run                          # tümü, sonuçlar benchmarks/results.json
+    python -m benchmarks.run --quick                  # 1M işlemlik portföy hariç
+    python -m benchmarks.run --filter teknik_analiz
+    python -m benchmarks.run --save-baseline          # sonuçları referans olarak sakla
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+
+Referansla karşılaştırıldığında medyanı toleransın üzerinde yavaşlayan ölçüm
+varsa çıkış kodu 1'dir.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import fixtures
+
+DIZIN = os.path.dirname(os.path.abspath(__file__))
+KOK_DIZIN = os.path.dirname(DIZIN)
+SONUC_DOSYASI = os.path.join(DIZIN, 'results.json')
+REFERANS_DOSYASI = os.path.join(DIZIN, 'baseline.json')
+
+GECMIS_UZUNLUKLARI = [100, 500, 2500, 10000]
+ISLEM_SAYILARI = [1000, 100000, 1000000]
+
+
+def olc(fn, tekrar=5, isinma=1):
+    """fn'i çalıştırıp milisaniye cinsinden medyan ve en iyi süreyi döndürür."""
+    for _ in range(isinma):
+        fn()
+    sureler = []
+    for _ in range(tekrar):
+        bas = time.perf_counter()
+        fn()
+        sureler.append((time.perf_counter() - bas) * 1000)
+    return {'medyan_ms': statistics.median(sureler), 'en_iyi_ms': min(sureler), 'tekrar': tekrar}
+
+
+def teknik_analiz_olcumleri(frames):
+    from analysis import teknik_analiz
+
+    df = frames[fixtures.FIKSTUR_SEMBOLLERI[0]]
+    for uzunluk in GECMIS_UZUNLUKLARI:
+        parca = fixtures.uzat(df, uzunluk)
+        yield f"teknik_analiz[{uzunluk}]", lambda parca=parca: teknik_analiz(parca), 10
+
+
+def analiz_raporu_olcumleri(frames):
+    from analysis import hisse_analizi, rapor_metni
+    from fundamentals import TemelVeriOnbellegi
+
+    # Fikstür `info` kayıtları taze olarak önbelleğe konur; ağa çıkılmaz
+    temel_veri = TemelVeriOnbellegi(db_path=':memory:')
+    for symbol, info in fixtures.info_yukle().items():
+        temel_veri._kaydet(symbol, (info, time.time()))
+
+    symbols = [s for s in fixtures.FIKSTUR_SEMBOLLERI if s in frames]
+
+    def hepsi():
+        for symbol in symbols:
+            rapor_metni(hisse_analizi(symbol, "1y", frames[symbol].iloc[-250:], temel_veri))
+
+    yield f"analiz_raporu[{len(symbols)} sembol]", hepsi, 3
+
+
+def portfoy_olcumleri(islem_sayilari, gecici_dizin):
+    from portfolio import Portfolio
+
+    rng = np.random.default_rng(0)
+    symbols = fixtures.FIKSTUR_SEMBOLLERI
+    for adet in islem_sayilari:
+        portfolio = Portfolio(db_path=os.path.join(gecici_dizin, f"portfolio_{adet}.db"))
+        tarihler = pd.Timestamp('2015-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 3650 * 86400, adet)), unit='s')
+        sembol = rng.integers(0, len(symbols), adet)
+        alis = rng.random(adet) < 0.6
+        fiyat = rng.uniform(5, 300, adet).round(2)
+        miktar = rng.integers(1, 1000, adet)
+        portfolio.import_transactions(
+            (symbols[sembol[i]], 'BUY' if alis[i] else 'SELL', float(fiyat[i]), int(miktar[i]),
+             tarihler[i].strftime('%Y-%m-%d %H:%M:%S'), f"bench:{i}")
+            for i in range(adet))
+
+        yield f"get_portfolio[{adet}]", portfolio.get_portfolio, 20
+        yield f"get_portfolio_summary[{adet}]", portfolio.get_portfolio_summary, 20
+
+
+def grafik_olcumleri(frames):
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    from analysis import teknik_analiz
+    from charts import CizgiGrafik, MumGrafik, cizgi_verisi, mum_verisi
+
+    df = frames[fixtures.FIKSTUR_SEMBOLLERI[0]]
+    for uzunluk in (500, 2500):
+        parca = fixtures.uzat(df, uzunluk)
+        gostergeli = teknik_analiz(parca)
+
+        def cizgi(gostergeli=gostergeli):
+            fig = Figure(figsize=(12, 9))
+            grafik = CizgiGrafik(fig, animasyonlu=False)
+            grafik.uygula(cizgi_verisi(gostergeli, 'BENCH', 'bench'))
+            FigureCanvasAgg(fig).draw()
+
+        def mum(parca=parca):
+            fig = Figure(figsize=(11, 8.5))
+            grafik = MumGrafik(fig)
+            FigureCanvasAgg(fig)
+            grafik.uygula(mum_verisi(parca, 'BENCH', 'bench'))
+            fig.canvas.draw()
+
+        yield f"grafik_goster[{uzunluk}]", cizgi, 5
+        yield f"mum_grafigi_goster[{uzunluk}]", mum, 5
+
+
+def acilis_olcumu():
+    """borsa modülünün yeni bir yorumlayıcıda içe aktarılma süresi (Tk penceresi açılmaz)."""
+    def ice_aktar():
+        subprocess.run([sys.executable, '-c', 'import borsa'], cwd=KOK_DIZIN, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    yield "acilis_import", ice_aktar, 5
+
+
+def olcumleri_topla(hizli, gecici_dizin, filtre=None):
+    """(ad, fn, tekrar) üretir. Filtreye uymayan grupların hazırlığı (ör. 1M işlem) hiç yapılmaz."""
+    frames = fixtures.ohlcv_yukle()
+    gruplar = [
+        (('teknik_analiz',), lambda: teknik_analiz_olcumleri(frames)),
+        (('analiz_raporu',), lambda: analiz_raporu_olcumleri(frames)),
+        (('get_portfolio', 'get_portfolio_summary'),
+         lambda: portfoy_olcumleri(ISLEM_SAYILARI[:-1] if hizli else ISLEM_SAYILARI, gecici_dizin)),
+        (('grafik_goster', 'mum_grafigi_goster'), lambda: grafik_olcumleri(frames)),
+        (('acilis_import',), acilis_olcumu),
+    ]
+    for adlar, grup in gruplar:
+        if filtre and not any(filtre in ad or ad in filtre for ad in adlar):
+            continue
+        for ad, fn, tekrar in grup():
+            if not filtre or filtre in ad:
+                yield ad, fn, tekrar
+
+
+def karsilastir(sonuclar, referans, tolerans, en_az_ms=0.5):
+    """Referansa göre medyan oranlarını ekler; toleransı aşan ölçümlerin adlarını döndürür.
+
+    Ölçüm gürültüsünü yok saymak için farkı `en_az_ms`'den küçük olanlar gerileme sayılmaz.
+    """
+    gerileyenler = []
+    for ad, sonuc in sonuclar.items():
+        eski = referans.get('sonuclar', {}).get(ad)
+        if not eski:
+            continue
+        oran = sonuc['medyan_ms'] / eski['medyan_ms']
+        sonuc['referans_ms'] = eski['medyan_ms']
+        sonuc['oran'] = oran
+        if oran > 1 + tolerans and sonuc['medyan_ms'] - eski['medyan_ms'] >= en_az_ms:
+            gerileyenler.append(ad)
+    return gerileyenler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BIST analiz performans ölçümleri")
+    parser.add_argument('--output', default=SONUC_DOSYASI, help="Sonuç dosyası (JSON)")
+    parser.add_argument('--baseline', default=REFERANS_DOSYASI, help="Karşılaştırılacak referans dosyası")
+    parser.add_argument('--save-baseline', action='store_true', help="Sonuçları referans olarak da kaydet")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="İzin verilen yavaşlama oranı (0.25 = %%25)")
+    parser.add_argument('--min-ms', type=float, default=0.5, help="Gerileme sayılacak en küçük fark (ms)")
+    parser.add_argument('--filter', help="Yalnızca adında bu metin geçen ölçümler")
+    parser.add_argument('--quick', action='store_true', help="1M işlemlik portföy ölçümünü atla")
+    args = parser.parse_args(argv)
+
+    sonuclar = {}
+    with tempfile.TemporaryDirectory() as gecici_dizin:
+        for ad, fn, tekrar in olcumleri_topla(args.quick, gecici_dizin, args.filter):
+            sonuclar[ad] = olc(fn, tekrar)
+            print(f"{ad:40s} {sonuclar[ad]['medyan_ms']:10.2f} ms", flush=True)
+
+    cikti = {
+        'meta': {
+            'tarih': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'fikstur': fixtures.kaynak(),
+        },
+        'sonuclar': sonuclar,
+    }
+
+    gerileyenler = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            gerileyenler = karsilastir(sonuclar, json.load(f), args.tolerance, args.min_ms)
+        for ad in gerileyenler:
+            print(f"GERİLEME: {ad} {sonuclar[ad]['oran']:.2f}x "
+                  f"({sonuclar[ad]['referans_ms']:.2f} -> {sonuclar[ad]['medyan_ms']:.2f} ms)")
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(cikti, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(cikti, f, ensure_ascii=False, indent=2)
+
+    return 1 if gerileyenler else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,14 @@
+import time
+
+# Açılış süresini (ilk çerçeveye kadar geçen süre) ölçmek için
+_BASLANGIC = time.perf_counter()
+
+import json
+import queue
 import tkinter as tk
-from tkinter import messagebox, ttk
-import yfinance as yf
-import pandas as pd
-import ta
+from tkinter import filedialog, messagebox, ttk
+import threading
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import mplfinance as mpf
-import numpy as np
-import requests
-from bs4 import BeautifulSoup
 
 
 # Stil sabitleri
@@ -19,6 +18,9 @@ LABEL_COLOR = "black"
 BUTTON_COLOR = "#4a6fa5"
 FONT = ("Segoe UI", 10)
 
+# Temel verilerin (piyasa değeri, F/K vb.) yeniden indirilmeden kullanılacağı süre (saniye)
+TEMEL_VERI_TTL = 6 * 60 * 60
+
 # Varsayılan hisse listesi
 DEFAULT_HISSELER = [
     'THYAO', 'AKBNK', 'GARAN', 'ISCTR', 'KOZAA', 'SASA', 'ASELS', 'TCELL', 'PETKM', 'TUPRS',
@@ -26,7 +28,30 @@ DEFAULT_HISSELER = [
     'TOASO', 'VAKBN', 'YKBNK', 'AKSA', 'ALARK', 'ANACM', 'ASUZU', 'BERA', 'BRISA', 'DOHOL'
 ]
 
+# Son başarılı hisse listesinin saklandığı dosya
+HISSE_LISTESI_DOSYASI = 'hisse_listesi.json'
+
 from portfolio import Portfolio
+from jobs import IsYurutucu
+from fundamentals import TemelVeriOnbellegi
+from diagnostics import ASAMALAR, profille, span, tanilama
+
+
+def _tarih_bicimi(tarih):
+    """Veritabanındaki işlem zamanını gün.ay.yıl olarak gösterir; biçim tanınmazsa olduğu gibi bırakır."""
+    try:
+        return datetime.strptime(tarih, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y')
+    except ValueError:
+        return tarih
+
+
+def _periyot_etiketi(periyot, aralik):
+    """Raporlarda görünen periyot; gün içi aralıklarda sınırlanmış periyot ve aralık birlikte yazılır."""
+    if aralik == "1d":
+        return periyot
+    from bar_store import periyodu_sinirla
+    return f"{periyodu_sinirla(periyot, aralik)}, {aralik}"
+
 
 class BistAnalizUygulamasi:
     def __init__(self, root):
@@ -36,40 +61,86 @@ class BistAnalizUygulamasi:
         self.root.configure(bg=BG_COLOR)
         self.root.minsize(1000, 700)
         self.portfolio = Portfolio()
-
-        self.hisse_listesi = self.get_bist_hisse_listesi()
-        if not self.hisse_listesi:
-            messagebox.showwarning("Uyarı", "BIST hisse listesi alınamadı, varsayılan liste kullanılıyor")
-            self.hisse_listesi = DEFAULT_HISSELER
+        self.temel_veri = TemelVeriOnbellegi(ttl=TEMEL_VERI_TTL)
+        self._bar_store = None
+        self._bar_store_kilidi = threading.Lock()
+        self._grafikler = None
+        self._mum_grafikleri = None
+        self._ozsermaye_grafikleri = None
+        self._portfoy_gecmisi = None
+        self._portfoy_gecmisi_kilidi = threading.Lock()
+        self._korelasyon = None
+        self._korelasyon_kilidi = threading.Lock()
+        self._korelasyon_grafikleri = None
+        self._alarm_deposu = None
+        self._alarm_deposu_kilidi = threading.Lock()
+        self._alarm_tarayici = None
+        self._alarm_penceresi_yenile = None
+        self._bildirimler = []
+        self._izleme_listeleri = None
+        self._fiyat_paneli = None
+        self._fiyat_paneli_kilidi = threading.Lock()
+        self._profil_istegi = False
+        self.acilis_suresi = None
+
+        # Pencere son kaydedilen listeyle hemen açılır, güncel liste arka planda çekilir
+        self.hisse_listesi = self._kayitli_hisse_listesi() or DEFAULT_HISSELER
 
         self.setup_ui()
         self.setup_styles()
+        self.isler = IsYurutucu(self.root, durum_callback=self._is_durumu_guncelle)
+        self.isler.gonder("hisse_listesi", lambda is_: self.get_bist_hisse_listesi(),
+                          tamamlandi=self._hisse_listesini_guncelle, aciklama="Hisse listesi")
+
+        # Portföydeki hisselerin temel verilerini arka planda önbelleğe al
+        self.temel_veri.onceden_getir([row[0] for row in self.portfolio.get_portfolio()])
+
+        self.root.after_idle(self._ilk_cerceve)
+        # Etkin alarm kuralı varsa tarama arka planda başlatılır
+        self.root.after(1000, self._alarmlari_baslat)
+
+    @property
+    def bar_store(self):
+        """Bar deposu (ve pandas/yfinance) ilk veri isteğinde yüklenir."""
+        with self._bar_store_kilidi:
+            if self._bar_store is None:
+                from bar_store import BarStore
+                self._bar_store = BarStore()
+            return self._bar_store
+
+    def _ilk_cerceve(self):
+        self.acilis_suresi = time.perf_counter() - _BASLANGIC
+        if tanilama.etkin:
+            tanilama.kaydet('ilk_cerceve', self.acilis_suresi)
+
+    def _kayitli_hisse_listesi(self):
+        try:
+            with open(HISSE_LISTESI_DOSYASI, encoding='utf-8') as f:
+                return json.load(f)['hisseler']
+        except (OSError, ValueError, KeyError):
+            return None
 
+    def _hisse_listesini_guncelle(self, hisseler):
+        if not hisseler:
+            if self.hisse_listesi is DEFAULT_HISSELER:
+                self.status_var.set("BIST hisse listesi alınamadı, varsayılan liste kullanılıyor")
+            return
 
-    def get_bist_hisse_listesi(self):
-        """Asenax API üzerinden BIST hisse listesini çeker, başarısız olursa varsayılan listeyi döndürür."""
+        self.hisse_listesi = hisseler
+        self.hisse_dropdown['values'] = hisseler
+        if self._alarm_tarayici is not None:
+            self._alarm_tarayici.kurallari_ayarla(self._alarm_evreni())
         try:
-            url = "https://api.asenax.com/bist/list/"
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-
-            # JSON verisini al
-            data = response.json()
-
-            # 'data' içindeki 'kod' alanlarını al ve listeye ekle
-            if data["code"] == "0":
-                hisseler = [item["kod"] for item in data["data"] if "kod" in item]
-                if hisseler:
-                    return hisseler
-                else:
-                    print("Asenax API boş liste döndürdü.")
-            else:
-                print(f"Asenax API başarısız yanıt döndürdü: {data['code']}")
-        except Exception as e:
-            print(f"Asenax API'den hisse listesi alınırken hata: {e}")
+            with open(HISSE_LISTESI_DOSYASI, 'w', encoding='utf-8') as f:
+                json.dump({'zaman': datetime.now().isoformat(timespec='seconds'), 'hisseler': hisseler}, f)
+        except OSError as e:
+            print(f"Hisse listesi kaydedilemedi: {e}")
+
 
-        print("Varsayılan listeye geçiliyor.")
-        return DEFAULT_HISSELER
+    def get_bist_hisse_listesi(self):
+        """Veri sağlayıcısından BIST hisse listesini çeker, başarısız olursa None döndürür."""
+        from providers import saglayici
+        return saglayici().hisse_listesi()
 
     def setup_ui(self):
         # Başlık
@@ -84,6 +155,36 @@ class BistAnalizUygulamasi:
                                          command=self.show_portfolio_window)
         self.portfolio_button.pack(side=tk.RIGHT, padx=10, pady=20)
 
+        # Piyasa taraması butonu
+        self.tarama_button = ttk.Button(self.header, text="Tarama",
+                                      command=self.show_tarama_window)
+        self.tarama_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
+        # Canlı izleme butonu
+        self.canli_button = ttk.Button(self.header, text="Canlı İzleme",
+                                     command=self.show_canli_izleme_window)
+        self.canli_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
+        # Alarmlar butonu
+        self.alarm_button = ttk.Button(self.header, text="Alarmlar",
+                                     command=self.show_alarm_window)
+        self.alarm_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
+        # Korelasyon butonu
+        self.korelasyon_button = ttk.Button(self.header, text="Korelasyon",
+                                          command=self.show_korelasyon_window)
+        self.korelasyon_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
+        # İzleme listeleri ve toplu rapor butonu
+        self.liste_button = ttk.Button(self.header, text="İzleme Listeleri",
+                                     command=self.show_izleme_listeleri_window)
+        self.liste_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
+        # Tanılama butonu
+        self.tanilama_button = ttk.Button(self.header, text="Tanılama",
+                                        command=self.show_tanilama_window)
+        self.tanilama_button.pack(side=tk.RIGHT, padx=10, pady=20)
+
         # Kontrol paneli
         self.control_frame = tk.Frame(self.root, bg=BG_COLOR, padx=15, pady=15)
         self.control_frame.pack(fill=tk.X)
@@ -105,12 +206,21 @@ class BistAnalizUygulamasi:
         self.periyot_var = tk.StringVar(value="3mo")
         self.periyot_dropdown = ttk.Combobox(self.control_frame, textvariable=self.periyot_var,
                                             values=["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y"], 
-                                            width=8, font=FONT)
+                                            width=8, font=FONT, state="readonly")
         self.periyot_dropdown.grid(row=0, column=3, padx=5)
 
+        # Bar aralığı; gün içi aralıklarda periyot Yahoo'nun verdiği geçmişle sınırlanır
+        tk.Label(self.control_frame, text="Aralık:", bg=BG_COLOR,
+                font=FONT, fg=LABEL_COLOR).grid(row=0, column=4, padx=5, sticky="e")
+
+        self.aralik_var = tk.StringVar(value="1d")
+        self.aralik_dropdown = ttk.Combobox(self.control_frame, textvariable=self.aralik_var,
+                                           values=["1d", "1h", "15m", "5m", "1m"], width=5, font=FONT, state="readonly")
+        self.aralik_dropdown.grid(row=0, column=5, padx=5)
+
         # Butonlar
         button_frame = tk.Frame(self.control_frame, bg=BG_COLOR)
-        button_frame.grid(row=0, column=4, columnspan=5, padx=10)
+        button_frame.grid(row=0, column=6, columnspan=5, padx=10)
 
         ttk.Button(button_frame, text="Analiz Et", command=self.analiz_et).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Çizgi Grafik", command=self.grafik_goster).pack(side=tk.LEFT, padx=3)
@@ -118,6 +228,16 @@ class BistAnalizUygulamasi:
         ttk.Button(button_frame, text="Temizle", command=self.temizle).pack(side=tk.LEFT, padx=3)
         ttk.Button(button_frame, text="Çıkış", command=self.root.quit).pack(side=tk.LEFT, padx=3)
 
+        # Durum çubuğu
+        self.status_frame = tk.Frame(self.root, bg=BG_COLOR, padx=15)
+        self.status_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(0, 5))
+
+        self.status_var = tk.StringVar(value="Hazır")
+        tk.Label(self.status_frame, textvariable=self.status_var, bg=BG_COLOR,
+                font=FONT, fg=LABEL_COLOR, anchor="w").pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.progress = ttk.Progressbar(self.status_frame, length=200, maximum=1.0)
+        self.progress.pack(side=tk.RIGHT)
+
         # Sonuç alanı
         self.result_frame = tk.Frame(self.root, bg=BG_COLOR, padx=15, pady=15)
         self.result_frame.pack(fill=tk.BOTH, expand=True)
@@ -133,6 +253,10 @@ class BistAnalizUygulamasi:
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.text_output.pack(fill=tk.BOTH, expand=True)
 
+        # Klavye kısayolları
+        self.hisse_dropdown.bind("<Return>", lambda event: self.analiz_et())
+        self.hisse_dropdown.focus()
+
     def show_portfolio_window(self):
         portfolio_window = tk.Toplevel(self.root)
         portfolio_window.title("Portföy Yönetimi")
@@ -165,20 +289,58 @@ class BistAnalizUygulamasi:
         quantity_entry = ttk.Entry(form_frame)
         quantity_entry.grid(row=0, column=7, padx=5, pady=5)
         
-        # Tablo
-        columns = ('Hisse', 'Toplam Adet', 'Maliyet', 'Güncel Değer', 'Kar/Zarar')
-        portfolio_tree = ttk.Treeview(table_frame, columns=columns, show='headings')
-        
-        for col in columns:
-            portfolio_tree.heading(col, text=col)
-            portfolio_tree.column(col, width=150)
-        
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=portfolio_tree.yview)
-        portfolio_tree.configure(yscrollcommand=scrollbar.set)
-        
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        portfolio_tree.pack(fill=tk.BOTH, expand=True)
-        
+        # Tablo; fiyatı henüz gelmemiş hücreler "Hesaplanıyor..." gösterir
+        from table import SanalTablo
+        columns = ('Hisse', 'Toplam Adet', 'Maliyet', 'Güncel Değer', 'Kar/Zarar', 'İşlem Tarihi')
+        portfolio_tablo = SanalTablo(table_frame, columns, genislik=150, bos_metin="Hesaplanıyor...",
+                                     siralama='İşlem Tarihi', azalan=True, bg="#ffffff", bicimler={
+                                         'Maliyet': lambda v: f"{v:,.2f} TL",
+                                         'Güncel Değer': lambda v: f"{v:,.2f} TL",
+                                         'Kar/Zarar': lambda v: f"{v[0]:+,.2f} TL (%{v[1]:+.2f})",
+                                         'İşlem Tarihi': _tarih_bicimi,
+                                     })
+        portfolio_tablo.pack(fill=tk.BOTH, expand=True)
+
+        # Fiyatlar arka planda tek bir toplu istekle çekilir, sonuçlar kuyruktan okunur
+        from quotes import FiyatGuncelleyici
+        guncelleyici = FiyatGuncelleyici()
+        pozisyonlar = {}
+        son_fiyatlar = {}
+
+        def satir_degerleri(symbol):
+            quantity, avg_cost, cost, buy_date = pozisyonlar[symbol]
+            current_price = son_fiyatlar.get(symbol)
+            if current_price is None:
+                return (symbol, quantity, avg_cost, None, None, buy_date)
+
+            current_value = current_price * quantity
+            profit_loss = current_value - cost
+            profit_percentage = (profit_loss / cost) * 100 if cost else 0
+            return (symbol, quantity, avg_cost, current_value, (profit_loss, profit_percentage), buy_date)
+
+        def update_portfolio_view():
+            pozisyonlar.clear()
+            pozisyonlar.update({symbol: (quantity, avg_cost, cost, date)
+                                for symbol, quantity, cost, date, avg_cost in self.portfolio.get_portfolio()})
+            # Tablo yalnızca eklenen, değişen ve silinen satırları Tk'ye yazar
+            portfolio_tablo.guncelle({symbol: satir_degerleri(symbol) for symbol in pozisyonlar})
+            guncelleyici.iste(pozisyonlar.keys())
+
+        zamanlayicilar = {}
+
+        def fiyatlari_uygula():
+            try:
+                while True:
+                    fiyatlar = guncelleyici.sonuclar.get_nowait()
+                    for symbol, fiyat in fiyatlar.items():
+                        # Yalnızca fiyatı değişen satırları güncelle
+                        if symbol in pozisyonlar and son_fiyatlar.get(symbol) != fiyat:
+                            son_fiyatlar[symbol] = fiyat
+                            portfolio_tablo.ayarla(symbol, satir_degerleri(symbol))
+            except queue.Empty:
+                pass
+            zamanlayicilar['fiyat'] = portfolio_window.after(200, fiyatlari_uygula)
+
         def add_transaction():
             try:
                 symbol = symbol_var.get().strip().upper()
@@ -188,6 +350,7 @@ class BistAnalizUygulamasi:
                 
                 self.portfolio.add_transaction(symbol, operation, price, quantity)
                 update_portfolio_view()
+                self._acik_getiri_grafigini_guncelle()
                 
                 # Form temizleme
                 price_entry.delete(0, tk.END)
@@ -197,339 +360,1088 @@ class BistAnalizUygulamasi:
             except ValueError as e:
                 messagebox.showerror("Hata", "Lütfen geçerli değerler girin!")
         
-        def update_portfolio_view():
-            for item in portfolio_tree.get_children():
-                portfolio_tree.delete(item)
-                
-            portfolio_data = self.portfolio.get_portfolio()
-            for symbol, quantity, cost, date, avg_cost in portfolio_data:
-                portfolio_tree.insert('', tk.END, values=(
-                    symbol,
-                    quantity,
-                    f"{cost:,.2f} TL",
-                    "Hesaplanıyor...",
-                    "Hesaplanıyor..."
-                ))
-        
+        def ice_aktar():
+            path = filedialog.askopenfilename(
+                parent=portfolio_window, title="Aracı kurum dosyası seç",
+                filetypes=[("CSV / Excel", "*.csv *.txt *.xlsx"), ("Tüm dosyalar", "*.*")])
+            if not path:
+                return
+
+            def calistir(is_, path):
+                from importer import ice_aktar
+                # SQLite bağlantısı iş parçacıkları arasında paylaşılamadığı için ayrı bağlantı açılır
+                portfolio = Portfolio()
+                try:
+                    is_.bildir(0.1, "İşlemler içe aktarılıyor")
+                    return ice_aktar(portfolio, path)
+                finally:
+                    portfolio.close()
+
+            self.isler.gonder("ice_aktar", calistir, path,
+                              tamamlandi=ice_aktarma_raporu,
+                              hata=lambda e: messagebox.showerror("Hata", f"İçe aktarma yapılamadı:\n{str(e)}",
+                                                                  parent=portfolio_window),
+                              aciklama="İçe aktarma")
+
+        def ice_aktarma_raporu(rapor):
+            if portfolio_window.winfo_exists():
+                update_portfolio_view()
+            self._acik_getiri_grafigini_guncelle()
+
+            rapor_pencere = tk.Toplevel(self.root)
+            rapor_pencere.title("İçe Aktarma Raporu")
+            rapor_pencere.geometry("700x400")
+            rapor_text = tk.Text(rapor_pencere, wrap=tk.WORD, font=("Consolas", 10), padx=10, pady=10)
+            rapor_text.pack(fill=tk.BOTH, expand=True)
+            rapor_text.insert(tk.END, rapor.ozet() + "\n")
+            if rapor.hatalar:
+                rapor_text.insert(tk.END, "\nHatalı satırlar:\n")
+                for satir_no, mesaj in rapor.hatalar:
+                    rapor_text.insert(tk.END, f"   • Satır {satir_no}: {mesaj}\n")
+            rapor_text.config(state=tk.DISABLED)
+
+        def portfoy_yenile():
+            if portfolio_window.winfo_exists():
+                update_portfolio_view()
+
         # İşlem ekle butonu
         ttk.Button(form_frame, text="İşlem Ekle", command=add_transaction).grid(row=0, column=8, padx=20, pady=5)
+        ttk.Button(form_frame, text="İçe Aktar", command=ice_aktar).grid(row=0, column=9, padx=5, pady=5)
+        ttk.Button(form_frame, text="Getiri Grafiği",
+                   command=self.getiri_grafigi_goster).grid(row=0, column=10, padx=5, pady=5)
+        ttk.Button(form_frame, text="Gerçekleşen K/Z",
+                   command=lambda: self.show_gerceklesen_window(portfoy_yenile)).grid(
+                       row=0, column=11, padx=5, pady=5)
+        ttk.Button(form_frame, text="İşlemler", command=self.show_islemler_window).grid(
+            row=0, column=12, padx=5, pady=5)
         
         # İlk görünümü güncelle
         update_portfolio_view()
-        
-        # Ana container
-        main_container = tk.Frame(portfolio_window, bg="#f8f9fa")
-        main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-        
-        ## Sol Panel - İşlem Ekleme Formu
-        #left_panel = tk.Frame(main_container, bg="#ffffff", relief="ridge", bd=1)
-        #left_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(0,10), pady=5)
-        #
-        ## Form başlığı
-        #header_frame = tk.Frame(left_panel, bg="#ffffff")
-        #header_frame.pack(fill=tk.X, padx=20, pady=15)
-        #header_label = tk.Label(header_frame, text="Yeni İşlem Ekle", 
-        #                      font=("Segoe UI", 14, "bold"), bg="#ffffff", fg="#2C3E50")
-        #header_label.pack()
-        #
-        ## Form çerçevesi
-        #form_frame = tk.Frame(left_panel, bg="#ffffff")
-        #form_frame.pack(fill=tk.BOTH, padx=20, pady=10)
-        #
-        ## Form elemanları
-        #fields = [
-        #    ("Hisse Kodu:", self.hisse_listesi),
-        #    ("İşlem Tipi:", ["AL", "SAT"]),
-        #    ("Fiyat (TL):", None),
-        #    ("Adet:", None),
-        #    ("Tarih:", datetime.now().strftime('%Y-%m-%d %H:%M'))
-        #]
-        
-        entries = {}
-        for i, (label_text, values) in enumerate(fields):
-            frame = tk.Frame(form_frame, bg="#ffffff")
-            frame.pack(fill=tk.X, pady=10)
-            
-            label = tk.Label(frame, text=label_text, font=("Segoe UI", 11),
-                           bg="#ffffff", fg="#2C3E50", width=10, anchor="w")
-            label.pack(side=tk.LEFT, padx=(0,10))
-            
-            if isinstance(values, list):
-                var = tk.StringVar(value=values[0])
-                entry = ttk.Combobox(frame, values=values, textvariable=var,
-                                   state="readonly" if label_text == "İşlem Tipi:" else "normal",
-                                   width=20, font=("Segoe UI", 11))
-                entries[label_text] = var
-            else:
-                entry = ttk.Entry(frame, font=("Segoe UI", 11), width=20)
-                if values:  # Tarih için varsayılan değer
-                    entry.insert(0, values)
-                entries[label_text] = entry
-            entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-            
-        def add_transaction():
+        fiyatlari_uygula()
+
+        # Otomatik güncelleme
+        def auto_update():
+            update_portfolio_view()
+            self._acik_getiri_grafigini_guncelle()
+            zamanlayicilar['otomatik'] = portfolio_window.after(60000, auto_update)  # Her 1 dakikada bir güncelle
+
+        zamanlayicilar['otomatik'] = portfolio_window.after(60000, auto_update)
+
+        def on_close():
+            for after_id in zamanlayicilar.values():
+                portfolio_window.after_cancel(after_id)
+            guncelleyici.durdur()
+            portfolio_window.destroy()
+
+        portfolio_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    def show_gerceklesen_window(self, portfoy_yenile):
+        from ledger import YONTEMLER
+
+        pencere = tk.Toplevel(self.root)
+        pencere.title("Gerçekleşen Kar/Zarar")
+        pencere.geometry("900x500")
+        pencere.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(pencere, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        table_frame = tk.Frame(pencere, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        tk.Label(control_frame, text="Yıl:", bg="#ffffff").pack(side=tk.LEFT, padx=5, pady=5)
+        yil_var = tk.StringVar(value="Tümü")
+        yil_combo = ttk.Combobox(control_frame, textvariable=yil_var, state="readonly", width=8)
+        yil_combo.pack(side=tk.LEFT, padx=5, pady=5)
+
+        tk.Label(control_frame, text="Maliyet Yöntemi:", bg="#ffffff").pack(side=tk.LEFT, padx=5, pady=5)
+        yontem_adlari = list(YONTEMLER.values())
+        yontem_var = tk.StringVar(value=YONTEMLER[self.portfolio.cost_method])
+        yontem_combo = ttk.Combobox(control_frame, textvariable=yontem_var, values=yontem_adlari,
+                                    state="readonly", width=25)
+        yontem_combo.pack(side=tk.LEFT, padx=5, pady=5)
+
+        toplam_var = tk.StringVar()
+        tk.Label(control_frame, textvariable=toplam_var, bg="#ffffff",
+                 font=FONT).pack(side=tk.RIGHT, padx=5, pady=5)
+
+        columns = ('Yıl', 'Hisse', 'Adet', 'Satış Tutarı', 'Maliyet', 'K/Z', 'Eşleşmeyen')
+        tree = ttk.Treeview(table_frame, columns=columns, show='headings', style="Custom.Treeview")
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=120, anchor=tk.CENTER)
+
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        tree.pack(fill=tk.BOTH, expand=True)
+
+        def tabloyu_doldur(event=None):
+            yil = yil_var.get()
+            satirlar = self.portfolio.get_realized_pnl(None if yil == "Tümü" else yil)
+            yil_combo['values'] = ["Tümü"] + sorted({satir[0] for satir in self.portfolio.get_realized_pnl()})
+
+            tree.delete(*tree.get_children())
+            yillik = {}
+            for year, symbol, adet, tutar, maliyet, kz, eslesmeyen in satirlar:
+                tree.insert('', tk.END, values=(
+                    year, symbol, adet, f"{tutar:,.2f} TL",
+                    f"{maliyet:,.2f} TL" if maliyet is not None else "-",
+                    f"{kz:+,.2f} TL" if kz is not None else "-",
+                    eslesmeyen or ""))
+                yillik[year] = yillik.get(year, 0.0) + (kz or 0.0)
+
+            for year, kz in yillik.items():
+                tree.insert('', tk.END, values=(year, "TOPLAM", "", "", "", f"{kz:+,.2f} TL", ""))
+            toplam_var.set(f"Toplam gerçekleşen K/Z: {sum(yillik.values()):+,.2f} TL")
+
+        def yontem_degisti(event=None):
+            yontem = next(kod for kod, ad in YONTEMLER.items() if ad == yontem_var.get())
+            if yontem == self.portfolio.cost_method:
+                return
             try:
-                symbol = entries["Hisse Kodu:"].get().strip().upper()
-                operation = "BUY" if entries["İşlem Tipi:"].get() == "AL" else "SELL"
-                price = float(entries["Fiyat (TL):"].get())
-                quantity = int(entries["Adet:"].get())
-                date = entries["Tarih:"].get()
-                
-                self.portfolio.add_transaction(symbol, operation, price, quantity, date)
-                update_portfolio_view()
-                
-                # Form temizleme
-                entries["Fiyat (TL):"].delete(0, tk.END)
-                entries["Adet:"].delete(0, tk.END)
-                entries["Tarih:"].delete(0, tk.END)
-                entries["Tarih:"].insert(0, datetime.now().strftime('%Y-%m-%d %H:%M'))
-                
-                messagebox.showinfo("Başarılı", "İşlem başarıyla eklendi!")
-            except ValueError as e:
-                messagebox.showerror("Hata", "Lütfen geçerli değerler girin!")
-                
-        # İşlem ekle butonu
-        button_frame = tk.Frame(left_panel, bg="#ffffff")
-        button_frame.pack(fill=tk.X, padx=20, pady=20)
-        add_button = ttk.Button(button_frame, text="İşlem Ekle", command=add_transaction,
-                              style="Accent.TButton")
-        add_button.pack(fill=tk.X)
-        
-        # Sağ Panel - Portföy Tablosu
-        #right_panel = tk.Frame(main_container, bg="#ffffff", relief="ridge", bd=1)
-        #right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, pady=5)
-        
-        # Tablo başlığı
-        # Özet bilgiler
-        #summary_frame = tk.Frame(right_panel, bg="#ffffff")
-        #summary_frame.pack(fill=tk.X, padx=20, pady=10)
-        #
-        #total_stocks, total_investment, total_shares = self.portfolio.get_portfolio_summary()
-        #
-        #summary_text = f"Toplam Hisse Sayısı: {total_stocks} • " \
-        #              f"Toplam Yatırım: {total_investment:,.2f} TL • " \
-        #              f"Toplam Lot: {total_shares:,}"
-        #
-        #summary_label = tk.Label(summary_frame, text=summary_text,
-        #                       font=("Segoe UI", 11), bg="#ffffff", fg="#2C3E50")
-        #summary_label.pack(pady=5)
-       # 
-        ## Tablo başlığı
-        #table_header = tk.Frame(right_panel, bg="#ffffff")
-        #table_header.pack(fill=tk.X, padx=20, pady=15)
-        #table_label = tk.Label(table_header, text="Portföy Durumu", 
-        #                     font=("Segoe UI", 14, "bold"), bg="#ffffff", fg="#2C3E50")
-        #table_label.pack()
-        
-        # Tablo çerçevesi
-        #table_frame = tk.Frame(right_panel, bg="#ffffff")
-        #table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=(0,20))
-        
-        # Tablo
-        #columns = ('Hisse', 'Toplam Adet', 'Maliyet', 'Güncel Değer', 'Kar/Zarar', 'İşlem Tarihi')
-        #portfolio_tree = ttk.Treeview(table_frame, columns=columns, show='headings', style="Custom.Treeview")
-        #
-        #for col in columns:
-        #    portfolio_tree.heading(col, text=col)
-        #    portfolio_tree.column(col, width=150, anchor=tk.CENTER)
-        #
-        #scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=portfolio_tree.yview)
-        #portfolio_tree.configure(yscrollcommand=scrollbar.set)
-        #
-        #scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        #portfolio_tree.pack(fill=tk.BOTH, expand=True)
-#
-        ## İşlem detayları grid layout
-        #tk.Label(form_frame, text="Hisse:", bg="#ffffff", font=("Segoe UI", 10)).grid(row=0, column=0, padx=5, pady=5)
-        #symbol_var = tk.StringVar()
-        #symbol_combo = ttk.Combobox(form_frame, textvariable=symbol_var, values=self.hisse_listesi, width=15)
-        #symbol_combo.grid(row=0, column=1, padx=5, pady=5)
-        #symbol_combo.set(self.hisse_listesi[0] if self.hisse_listesi else '')
-#
-        #tk.Label(form_frame, text="İşlem:", bg="#ffffff", font=("Segoe UI", 10)).grid(row=0, column=2, padx=5, pady=5)
-        #operation_var = tk.StringVar(value="AL")
-        #operation_combo = ttk.Combobox(form_frame, textvariable=operation_var, values=["AL", "SAT"], 
-        #                             state="readonly", width=10)
-        #operation_combo.grid(row=0, column=3, padx=5, pady=5)
-#
-        #tk.Label(form_frame, text="Fiyat (TL):", bg="#ffffff", font=("Segoe UI", 10)).grid(row=0, column=4, padx=5, pady=5)
-        #price_entry = ttk.Entry(form_frame, width=12)
-        #price_entry.grid(row=0, column=5, padx=5, pady=5)
-#
-        #tk.Label(form_frame, text="Adet:", bg="#ffffff", font=("Segoe UI", 10)).grid(row=0, column=6, padx=5, pady=5)
-        #quantity_entry = ttk.Entry(form_frame, width=12)
-        #quantity_entry.grid(row=0, column=7, padx=5, pady=5)
-#
-        #tk.Label(form_frame, text="Tarih:", bg="#ffffff", font=("Segoe UI", 10)).grid(row=0, column=8, padx=5, pady=5)
-        #date_entry = ttk.Entry(form_frame, width=16)
-        #date_entry.insert(0, datetime.now().strftime('%Y-%m-%d %H:%M'))
-        #date_entry.grid(row=0, column=9, padx=5, pady=5)
-
-        # İşlem ekleme çerçevesi
-        ttk.Label(transaction_frame, text="Hisse:").grid(row=0, column=0, padx=5, pady=5)
-        symbol_var = tk.StringVar()
-        symbol_combo = ttk.Combobox(transaction_frame, textvariable=symbol_var, 
-                                  values=self.hisse_listesi, width=15)
-        symbol_combo.grid(row=0, column=1, padx=5, pady=5)
-        symbol_combo.set(self.hisse_listesi[0] if self.hisse_listesi else '')
+                self.portfolio.set_cost_method(yontem)
+            except Exception as e:
+                messagebox.showerror("Hata", f"Maliyet yöntemi değiştirilemedi:\n{str(e)}", parent=pencere)
+                return
+            tabloyu_doldur()
+            portfoy_yenile()
+            self._acik_getiri_grafigini_guncelle()
 
-        # İşlem Tipi
-        operation_frame = tk.Frame(form_frame, bg="#F8F9FA")
-        operation_frame.pack(fill=tk.X, pady=5)
-        tk.Label(operation_frame, text="İşlem Tipi:", font=("Segoe UI", 11),
-                bg="#F8F9FA", fg="#2C3E50").pack(anchor="w")
-        operation_var = tk.StringVar(value="AL")
-        operation_combo = ttk.Combobox(operation_frame, textvariable=operation_var,
-                                     values=["AL", "SAT"], state="readonly",
-                                     width=20, font=("Segoe UI", 11))
-        operation_combo.pack(fill=tk.X, pady=(5,0))
-
-        # Fiyat
-        price_frame = tk.Frame(form_frame, bg="#F8F9FA")
-        price_frame.pack(fill=tk.X, pady=5)
-        tk.Label(price_frame, text="Fiyat (TL):", font=("Segoe UI", 11),
-                bg="#F8F9FA", fg="#2C3E50").pack(anchor="w")
-        price_entry = ttk.Entry(price_frame, font=("Segoe UI", 11))
-        price_entry.pack(fill=tk.X, pady=(5,0))
-
-        # Adet
-        quantity_frame = tk.Frame(form_frame, bg="#F8F9FA")
-        quantity_frame.pack(fill=tk.X, pady=5)
-        tk.Label(quantity_frame, text="Adet:", font=("Segoe UI", 11),
-                bg="#F8F9FA", fg="#2C3E50").pack(anchor="w")
-        quantity_entry = ttk.Entry(quantity_frame, font=("Segoe UI", 11))
-        quantity_entry.pack(fill=tk.X, pady=(5,0))
-
-        # İşlem butonu
-        button_frame = tk.Frame(form_frame, bg="#F8F9FA")
-        button_frame.pack(fill=tk.X, pady=20)
-        ttk.Button(button_frame, text="İşlemi Kaydet",
-                  style="Accent.TButton", command=add_transaction).pack(fill=tk.X)
-
-        # Hisse seçimi
-        tk.Label(form_frame, text="Hisse Kodu:", bg="#ffffff", 
-                font=("Segoe UI", 10)).grid(row=0, column=0, padx=10, pady=5, sticky="e")
-        symbol_var = tk.StringVar()
-        symbol_combo = ttk.Combobox(form_frame, textvariable=symbol_var,
-                                  values=self.hisse_listesi, width=15, font=("Segoe UI", 10))
-        symbol_combo.grid(row=0, column=1, padx=10, pady=5, sticky="w")
-        symbol_combo.set(self.hisse_listesi[0] if self.hisse_listesi else '')
-
-        # İşlem tipi
-        tk.Label(form_frame, text="İşlem Tipi:", bg="#ffffff",
-                font=("Segoe UI", 10)).grid(row=0, column=2, padx=10, pady=5, sticky="e")
-        operation_var = tk.StringVar(value="AL")
-        operation_combo = ttk.Combobox(form_frame, textvariable=operation_var,
-                                     values=["AL", "SAT"], state="readonly", 
-                                     width=10, font=("Segoe UI", 10))
-        operation_combo.grid(row=0, column=3, padx=10, pady=5, sticky="w")
-
-        # Fiyat
-        tk.Label(form_frame, text="Fiyat (TL):", bg="#ffffff",
-                font=("Segoe UI", 10)).grid(row=0, column=4, padx=10, pady=5, sticky="e")
-        price_entry = ttk.Entry(form_frame, width=12, font=("Segoe UI", 10))
-        price_entry.grid(row=0, column=5, padx=10, pady=5, sticky="w")
-
-        # Adet
-        tk.Label(form_frame, text="Adet:", bg="#ffffff",
-                font=("Segoe UI", 10)).grid(row=0, column=6, padx=10, pady=5, sticky="e")
-        quantity_entry = ttk.Entry(form_frame, width=12, font=("Segoe UI", 10))
-        quantity_entry.grid(row=0, column=7, padx=10, pady=5, sticky="w")
+        yil_combo.bind("<<ComboboxSelected>>", tabloyu_doldur)
+        yontem_combo.bind("<<ComboboxSelected>>", yontem_degisti)
+        tabloyu_doldur()
 
-        def add_transaction():
+    def show_islemler_window(self):
+        from table import SanalTablo
+
+        pencere = tk.Toplevel(self.root)
+        pencere.title("İşlem Geçmişi")
+        pencere.geometry("900x600")
+        pencere.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(pencere, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        table_frame = tk.Frame(pencere, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+        tk.Label(control_frame, text="Hisse:", bg="#ffffff").pack(side=tk.LEFT, padx=5, pady=5)
+        symbol_entry = ttk.Entry(control_frame, width=15)
+        symbol_entry.pack(side=tk.LEFT, padx=5, pady=5)
+
+        adet_var = tk.StringVar()
+        tk.Label(control_frame, textvariable=adet_var, bg="#ffffff").pack(side=tk.RIGHT, padx=5, pady=5)
+
+        # Binlerce işlemde de yalnızca görünen satırlar çizilir; yenilemede sadece farklar yazılır
+        columns = ('No', 'Tarih', 'Hisse', 'İşlem', 'Fiyat', 'Adet', 'Tutar')
+        tablo = SanalTablo(table_frame, columns, siralama='Tarih', azalan=True, bg="#ffffff",
+                           artan_sutunlar=('Hisse', 'İşlem'), bicimler={
+                               'Tarih': _tarih_bicimi,
+                               'İşlem': lambda v: "Alış" if v == 'BUY' else "Satış",
+                               'Fiyat': lambda v: f"{v:,.2f} TL",
+                               'Tutar': lambda v: f"{v:,.2f} TL",
+                           })
+        tablo.pack(fill=tk.BOTH, expand=True)
+
+        def yenile(event=None):
             try:
-                symbol = symbol_var.get().strip().upper()
-                operation = operation_var.get()
-                price = float(price_entry.get())
-                quantity = int(quantity_entry.get())
-                date = date_entry.get()
+                islemler = self.portfolio.get_transactions(symbol_entry.get().strip() or None)
+                satirlar = {id_: (id_, date, symbol, operation, price, quantity, price * quantity)
+                            for id_, symbol, operation, price, quantity, date in islemler}
+            except Exception as e:
+                messagebox.showerror("Hata", f"İşlemler okunamadı:\n{str(e)}", parent=pencere)
+                return
+            tablo.guncelle(satirlar)
+            adet_var.set(f"{len(tablo)} işlem")
+
+        symbol_entry.bind("<Return>", yenile)
+        ttk.Button(control_frame, text="Filtrele", command=yenile).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(control_frame, text="Yenile", command=yenile).pack(side=tk.LEFT, padx=5, pady=5)
+        yenile()
+
+    def getiri_grafigi_goster(self):
+        piksel = self.ozsermaye_grafikleri.piksel_genisligi('PORTFÖY')
+        self.isler.gonder("portfoy_gecmisi", self._portfoy_gecmisi_hazirla, piksel,
+                          tamamlandi=self.ozsermaye_grafikleri.goster,
+                          hata=lambda e: messagebox.showerror("Hata", f"Getiri grafiği oluşturulamadı:\n{str(e)}"),
+                          aciklama="Portföy geçmişi")
+
+    def _acik_getiri_grafigini_guncelle(self):
+        # Getiri grafiği açıksa yeni işlem ve barlarla artımlı olarak güncellenir
+        if self._ozsermaye_grafikleri is not None and len(self._ozsermaye_grafikleri):
+            self.getiri_grafigi_goster()
+
+    @property
+    def ozsermaye_grafikleri(self):
+        if self._ozsermaye_grafikleri is None:
+            from charts import GrafikYoneticisi, OzsermayePenceresi
+            self._ozsermaye_grafikleri = GrafikYoneticisi(self.root, BG_COLOR, max_pencere=1,
+                                                          pencere_sinifi=OzsermayePenceresi)
+        return self._ozsermaye_grafikleri
+
+    def _portfoy_gecmisi_hazirla(self, is_, piksel):
+        from charts import ozsermaye_verisi
+        from portfolio_history import PortfoyGecmisi
+
+        is_.bildir(0.1, "İşlemler ve fiyatlar okunuyor")
+        # SQLite bağlantısı iş parçacıkları arasında paylaşılamadığı için ayrı bağlantı açılır
+        portfolio = Portfolio()
+        try:
+            with self._portfoy_gecmisi_kilidi:
+                if self._portfoy_gecmisi is None:
+                    self._portfoy_gecmisi = PortfoyGecmisi(self.bar_store)
+                gecmis = self._portfoy_gecmisi.guncelle(portfolio).copy()
+        finally:
+            portfolio.close()
+        is_.kontrol()
+        if gecmis.empty:
+            raise ValueError("Portföyde işlem bulunamadı")
+        is_.bildir(0.8, "Grafik hazırlanıyor")
+        return ozsermaye_verisi(gecmis, piksel)
+
+    def show_tarama_window(self):
+        tarama_window = tk.Toplevel(self.root)
+        tarama_window.title("Piyasa Taraması")
+        tarama_window.geometry("900x700")
+        tarama_window.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(tarama_window, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        table_frame = tk.Frame(tarama_window, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-                if operation == "AL":
-                    self.portfolio.add_transaction(symbol, "BUY", price, quantity, date)
-                else:
-                    self.portfolio.add_transaction(symbol, "SELL", price, quantity, date)
+        durum_var = tk.StringVar(value=f"{len(self.hisse_listesi)} hisse taranacak")
+        tk.Label(control_frame, textvariable=durum_var, bg="#ffffff",
+                font=FONT).pack(side=tk.LEFT, padx=5, pady=5)
+
+        # Tablo; sıralama bellekte yapılır, NaN değerler (ör. kısa geçmişte RSI) her iki yönde de sona gelir
+        from table import SanalTablo
+        columns = ('Hisse', 'Puan', 'Sinyal', 'Son Fiyat', 'Değişim %', 'RSI')
+        tarama_tablo = SanalTablo(table_frame, columns, sirala_ile={'Sinyal': 'Puan'},
+                                  siralama='Puan', azalan=True, bg="#ffffff", bicimler={
+                                      'Son Fiyat': lambda v: f"{v:.2f}",
+                                      'Değişim %': lambda v: f"{v:+.2f}",
+                                      'RSI': lambda v: f"{v:.1f}",
+                                  })
+        tarama_tablo.pack(fill=tk.BOTH, expand=True)
+
+        gelenler = queue.Queue()
+        zamanlayici = {}
+
+        def sonuclari_uygula():
+            try:
+                while True:
+                    sonuc = gelenler.get_nowait()
+                    tarama_tablo.ayarla(sonuc['symbol'], (sonuc['symbol'], sonuc['puan'], sonuc['sinyal'],
+                                                          sonuc['fiyat'], sonuc['degisim'], sonuc['rsi']))
+            except queue.Empty:
+                pass
+            zamanlayici['id'] = tarama_window.after(250, sonuclari_uygula)
+
+        def tara(is_, symbols, periyot):
+            from scanner import Tarayici
+
+            def ilerleme(biten, toplam):
+                if not is_.iptal_edildi:
+                    is_.bildir(biten / toplam, f"{biten}/{toplam} hisse")
+
+            Tarayici(self.bar_store, panel=self.fiyat_paneli).tara(symbols, periyot, gelenler.put, ilerleme,
+                                                                   iptal=lambda: is_.iptal_edildi)
+
+        def baslat():
+            tarama_tablo.temizle()
+            periyot = self.periyot_var.get()
+            durum_var.set(f"Taranıyor ({periyot})...")
+            self.isler.gonder("tarama", tara, list(self.hisse_listesi), periyot,
+                              tamamlandi=lambda _: durum_var.set(f"Tarama tamamlandı: {len(tarama_tablo)} hisse"),
+                              hata=lambda e: messagebox.showerror("Hata", f"Tarama yapılamadı:\n{str(e)}"),
+                              aciklama="Piyasa taraması")
+
+        def durdur():
+            self.isler.iptal_et("tarama")
+            durum_var.set(f"Tarama durduruldu: {len(tarama_tablo)} hisse")
+
+        ttk.Button(control_frame, text="Taramayı Başlat", command=baslat).pack(side=tk.RIGHT, padx=5, pady=5)
+        ttk.Button(control_frame, text="Durdur", command=durdur).pack(side=tk.RIGHT, padx=5, pady=5)
+
+        sonuclari_uygula()
+
+        def on_close():
+            tarama_window.after_cancel(zamanlayici['id'])
+            self.isler.iptal_et("tarama")
+            tarama_window.destroy()
+
+        tarama_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    def show_canli_izleme_window(self):
+        canli_window = tk.Toplevel(self.root)
+        canli_window.title("Canlı İzleme")
+        canli_window.geometry("900x600")
+        canli_window.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(canli_window, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        table_frame = tk.Frame(canli_window, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
 
-                update_portfolio_view()
+        tk.Label(control_frame, text="Aralık:", bg="#ffffff", font=FONT).pack(side=tk.LEFT, padx=5, pady=5)
+        aralik_var = tk.StringVar(value="1m")
+        aralik_secimi = ttk.Combobox(control_frame, textvariable=aralik_var, values=["1m", "5m", "15m", "1h"],
+                                     width=5, font=FONT, state="readonly")
+        aralik_secimi.pack(side=tk.LEFT, padx=5, pady=5)
 
-                symbol_combo.set('')
-                price_entry.delete(0, tk.END)
-                quantity_entry.delete(0, tk.END)
-            except ValueError:
-                messagebox.showerror("Hata", "Lütfen geçerli değerler girin")
+        hisse_giris = ttk.Combobox(control_frame, values=self.hisse_listesi, width=12, font=FONT)
+        hisse_giris.pack(side=tk.LEFT, padx=(20, 5), pady=5)
 
-        # İşlem ekle butonu
-        add_button = ttk.Button(form_frame, text="İşlem Ekle", command=add_transaction,
-                              style="Accent.TButton")
-        add_button.grid(row=0, column=9, padx=10, pady=5, sticky="ew")
+        durum_var = tk.StringVar(value="Başlatılıyor...")
+        tk.Label(control_frame, textvariable=durum_var, bg="#ffffff",
+                font=FONT).pack(side=tk.RIGHT, padx=5, pady=5)
+
+        # Tablo
+        columns = ('Hisse', 'Saat', 'Son Fiyat', 'Değişim %', 'RSI', 'MACD', 'Hacim')
+        canli_tree = ttk.Treeview(table_frame, columns=columns, show='headings', style="Custom.Treeview")
+        for col in columns:
+            canli_tree.heading(col, text=col)
+            canli_tree.column(col, width=110, anchor=tk.CENTER)
 
-        # Grid yapısını düzenle
-        form_frame.grid_columnconfigure(9, weight=1)
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=canli_tree.yview)
+        canli_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        canli_tree.pack(fill=tk.BOTH, expand=True)
+
+        # Varsayılan olarak seçili hisse ve portföydekiler izlenir
+        izlenenler = list(dict.fromkeys([self.hisse_var.get().strip().upper()] +
+                                        [row[0] for row in self.portfolio.get_portfolio()]))
+        izlenenler = [s for s in izlenenler if s]
+        durum = {'akis': None}
+        zamanlayici = {}
+
+        def satir_ekle(symbol):
+            if not canli_tree.exists(symbol):
+                canli_tree.insert('', tk.END, iid=symbol, values=(symbol, '-', '-', '-', '-', '-', '-'))
+
+        def baslat(*_):
+            if durum['akis'] is not None:
+                durum['akis'].durdur()
+                durum['akis'] = None
+            for symbol in izlenenler:
+                canli_tree.item(symbol, values=(symbol, '-', '-', '-', '-', '-', '-'))
+            aralik = aralik_var.get()
+            durum_var.set(f"{len(izlenenler)} hisse, {aralik} aralık")
+
+            def olustur(is_, aralik):
+                from feed import CanliAkis
+                return CanliAkis(self.bar_store, aralik)
+
+            self.isler.gonder("canli_izleme", olustur, aralik, tamamlandi=akis_hazir,
+                              hata=lambda e: messagebox.showerror("Hata", f"Canlı izleme başlatılamadı:\n{str(e)}",
+                                                                  parent=canli_window),
+                              aciklama="Canlı izleme")
+
+        def akis_hazir(akis):
+            if not canli_window.winfo_exists():
+                akis.durdur()
+                return
+            durum['akis'] = akis
+            akis.izle(izlenenler)
 
+        def ekle():
+            symbol = hisse_giris.get().strip().upper()
+            if not symbol or symbol in izlenenler:
+                return
+            izlenenler.append(symbol)
+            satir_ekle(symbol)
+            if durum['akis'] is not None:
+                durum['akis'].izle([symbol])
+            durum_var.set(f"{len(izlenenler)} hisse, {aralik_var.get()} aralık")
+
+        def cikar():
+            for symbol in canli_tree.selection():
+                canli_tree.delete(symbol)
+                izlenenler.remove(symbol)
+                if durum['akis'] is not None:
+                    durum['akis'].birak(symbol)
+
+        def mum_grafigi():
+            secili = canli_tree.selection()
+            if secili:
+                self.hisse_var.set(secili[0])
+                self.aralik_var.set(aralik_var.get())
+                self.periyot_var.set("1d")
+                self.mum_grafigi_goster()
+
+        def sonuclari_uygula():
+            # Yalnızca yeni bar gelen satırlar güncellenir
+            akis = durum['akis']
+            if akis is not None:
+                try:
+                    while True:
+                        symbol, son = akis.sonuclar.get_nowait()
+                        if not canli_tree.exists(symbol):
+                            continue
+                        saat = datetime.fromtimestamp(son['ts']).strftime('%d.%m %H:%M')
+                        canli_tree.item(symbol, values=(
+                            symbol, saat, f"{son['Close']:.2f}", f"{son['degisim']:+.2f}",
+                            f"{son['RSI']:.1f}", f"{son['MACD']:.3f}", f"{son['Volume']:,.0f}"))
+                except queue.Empty:
+                    pass
+            zamanlayici['id'] = canli_window.after(500, sonuclari_uygula)
+
+        ttk.Button(control_frame, text="Ekle", command=ekle).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(control_frame, text="Çıkar", command=cikar).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(control_frame, text="Mum Grafiği", command=mum_grafigi).pack(side=tk.LEFT, padx=5, pady=5)
+        hisse_giris.bind("<Return>", lambda event: ekle())
+        aralik_secimi.bind("<<ComboboxSelected>>", baslat)
+
+        for symbol in izlenenler:
+            satir_ekle(symbol)
+        baslat()
+        sonuclari_uygula()
+
+        def on_close():
+            canli_window.after_cancel(zamanlayici['id'])
+            self.isler.iptal_et("canli_izleme")
+            if durum['akis'] is not None:
+                durum['akis'].durdur()
+            canli_window.destroy()
+
+        canli_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    @property
+    def alarm_deposu(self):
+        with self._alarm_deposu_kilidi:
+            if self._alarm_deposu is None:
+                from alerts import AlarmDeposu
+                self._alarm_deposu = AlarmDeposu()
+            return self._alarm_deposu
+
+    def _alarm_evreni(self):
+        return list(dict.fromkeys(list(self.hisse_listesi) + [row[0] for row in self.portfolio.get_portfolio()]))
+
+    def _alarmlari_baslat(self):
+        """Etkin kural varsa tarayıcıyı başlatır ya da kurallarını yeniler; kural kalmadıysa durdurur."""
+        if self._alarm_tarayici is not None:
+            if not self._alarm_tarayici.kurallari_ayarla(self._alarm_evreni()):
+                self._alarm_tarayici.durdur()
+                self._alarm_tarayici = None
+            return
 
-        # İşlem butonu
-        ttk.Button(left_panel, text="İşlemi Gerçekleştir", 
-                  style="Accent.TButton", command=add_transaction).pack(pady=30)
+        def olustur(is_, evren):
+            from alerts import AlarmTarayici
+            if not self.alarm_deposu.kurallar(yalniz_etkin=True):
+                return None
+            is_.kontrol()
+            tarayici = AlarmTarayici(self.bar_store, self.alarm_deposu)
+            tarayici.kurallari_ayarla(evren)
+            return tarayici
+
+        def hazir(tarayici):
+            if tarayici is None:
+                return
+            self._alarm_tarayici = tarayici
+            self._alarm_sonuclarini_uygula()
 
-        # Portföy tablosu
-        portfolio_frame = tk.Frame(portfolio_window, bg="#ffffff")
-        portfolio_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.isler.gonder("alarm_tarayici", olustur, self._alarm_evreni(), tamamlandi=hazir,
+                          hata=lambda e: print(f"Alarm taraması başlatılamadı: {e}"),
+                          aciklama="Alarm taraması")
 
-        columns = ('Hisse', 'Toplam Adet', 'Maliyet', 'Güncel Değer', 'Kar/Zarar', 'İşlem Tarihi')
-        portfolio_tree = ttk.Treeview(table_frame, columns=columns, show='headings', style="Custom.Treeview")
+    def _alarm_sonuclarini_uygula(self):
+        tarayici = self._alarm_tarayici
+        if tarayici is None:
+            return
+        yeni = False
+        try:
+            while True:
+                kural, symbol, ts, close = tarayici.sonuclar.get_nowait()
+                self._bildirim_goster(f"Alarm: {kural}",
+                                      f"{symbol}  {close:,.2f} TL  ({datetime.fromtimestamp(ts):%d.%m.%Y})")
+                yeni = True
+        except queue.Empty:
+            pass
+        if yeni and self._alarm_penceresi_yenile is not None:
+            self._alarm_penceresi_yenile()
+        self.root.after(1000, self._alarm_sonuclarini_uygula)
+
+    def _bildirim_goster(self, baslik, metin, sure=8000):
+        """Ekranın sağ altında birkaç saniye kalan, üst üste dizilen masaüstü bildirimi."""
+        bildirim = tk.Toplevel(self.root)
+        bildirim.overrideredirect(True)
+        bildirim.attributes("-topmost", True)
+        bildirim.configure(bg=BUTTON_COLOR)
+        tk.Label(bildirim, text=baslik, font=("Segoe UI", 10, "bold"), fg="white", bg=BUTTON_COLOR,
+                 anchor="w").pack(fill=tk.X, padx=12, pady=(8, 0))
+        tk.Label(bildirim, text=metin, font=FONT, fg="white", bg=BUTTON_COLOR,
+                 anchor="w").pack(fill=tk.X, padx=12, pady=(0, 8))
+
+        self._bildirimler = [b for b in self._bildirimler if b.winfo_exists()]
+        bildirim.update_idletasks()
+        genislik, yukseklik = max(bildirim.winfo_reqwidth(), 320), bildirim.winfo_reqheight()
+        x = bildirim.winfo_screenwidth() - genislik - 20
+        y = bildirim.winfo_screenheight() - (yukseklik + 10) * (len(self._bildirimler) + 1) - 60
+        bildirim.geometry(f"{genislik}x{yukseklik}+{x}+{y}")
+        bildirim.bind("<Button-1>", lambda event: bildirim.destroy())
+        self._bildirimler.append(bildirim)
+        self.root.bell()
+        bildirim.after(sure, bildirim.destroy)
+
+    def show_alarm_window(self):
+        from alerts import ALANLAR, KARSILASTIRMALAR, KESISMELER, KURAL_ORNEKLERI
+
+        depo = self.alarm_deposu
+
+        alarm_window = tk.Toplevel(self.root)
+        alarm_window.title("Alarmlar")
+        alarm_window.geometry("1000x750")
+        alarm_window.configure(bg="#f8f9fa")
+
+        form_frame = tk.Frame(alarm_window, bg="#ffffff")
+        form_frame.pack(fill=tk.X, padx=20, pady=10)
 
+        tk.Label(form_frame, text="Ad:", bg="#ffffff").grid(row=0, column=0, padx=5, pady=5)
+        ad_entry = ttk.Entry(form_frame, width=20)
+        ad_entry.grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(form_frame, text="Kural:", bg="#ffffff").grid(row=0, column=2, padx=5, pady=5)
+        ifade_var = tk.StringVar(value=KURAL_ORNEKLERI[0])
+        ttk.Combobox(form_frame, textvariable=ifade_var, values=KURAL_ORNEKLERI,
+                     width=30).grid(row=0, column=3, padx=5, pady=5)
+
+        tk.Label(form_frame, text="Hisseler:", bg="#ffffff").grid(row=0, column=4, padx=5, pady=5)
+        hisseler_entry = ttk.Entry(form_frame, width=20)
+        hisseler_entry.grid(row=0, column=5, padx=5, pady=5)
+
+        tk.Label(form_frame, bg="#ffffff", justify=tk.LEFT, anchor="w", wraplength=900,
+                 text=(f"Hisseler boşsa kural tüm hisselere uygulanır (virgülle ayırın).\n"
+                       f"Alanlar: {', '.join(ALANLAR)}\n"
+                       f"İşleçler: {', '.join(list(KARSILASTIRMALAR) + list(KESISMELER))}; "
+                       f"katsayı için ör. 1.5*HACIM_ORT")).grid(row=1, column=0, columnspan=8, sticky="w",
+                                                               padx=5, pady=5)
+
+        kural_frame = tk.Frame(alarm_window, bg="#ffffff")
+        kural_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=5)
+        columns = ('No', 'Ad', 'Kural', 'Hisseler', 'Durum')
+        kural_tree = ttk.Treeview(kural_frame, columns=columns, show='headings', style="Custom.Treeview", height=6)
+        for col in columns:
+            kural_tree.heading(col, text=col)
+            kural_tree.column(col, width=60 if col == 'No' else 180, anchor=tk.CENTER)
+        kural_tree.pack(fill=tk.BOTH, expand=True)
+
+        durum_var = tk.StringVar()
+        tk.Label(alarm_window, textvariable=durum_var, bg="#f8f9fa", font=FONT,
+                 anchor="w").pack(fill=tk.X, padx=20)
+
+        gunluk_frame = tk.Frame(alarm_window, bg="#ffffff")
+        gunluk_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        columns = ('Zaman', 'Kural', 'Hisse', 'Bar', 'Fiyat')
+        gunluk_tree = ttk.Treeview(gunluk_frame, columns=columns, show='headings', style="Custom.Treeview")
         for col in columns:
-            portfolio_tree.heading(col, text=col)
-            portfolio_tree.column(col, width=120, anchor=tk.CENTER)
+            gunluk_tree.heading(col, text=col)
+            gunluk_tree.column(col, width=150, anchor=tk.CENTER)
+        scrollbar = ttk.Scrollbar(gunluk_frame, orient=tk.VERTICAL, command=gunluk_tree.yview)
+        gunluk_tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        gunluk_tree.pack(fill=tk.BOTH, expand=True)
+
+        def kurallari_goster():
+            kural_tree.delete(*kural_tree.get_children())
+            for kural_id, ad, ifade, semboller, etkin in depo.kurallar():
+                kural_tree.insert('', tk.END, iid=str(kural_id), values=(
+                    kural_id, ad, ifade, ', '.join(semboller) if semboller else "Tümü",
+                    "Açık" if etkin else "Kapalı"))
+
+        def gunlugu_goster():
+            gunluk_tree.delete(*gunluk_tree.get_children())
+            for zaman, kural, symbol, ts, close in depo.gunluk():
+                gunluk_tree.insert('', tk.END, values=(
+                    zaman, kural, symbol, datetime.fromtimestamp(ts).strftime('%d.%m.%Y %H:%M'),
+                    f"{close:,.2f}" if close is not None else "-"))
+
+        def kurallar_degisti():
+            kurallari_goster()
+            self._alarmlari_baslat()
+
+        def kural_ekle():
+            ifade = ifade_var.get().strip()
+            ad = ad_entry.get().strip() or ifade
+            semboller = hisseler_entry.get().split(',')
+            try:
+                depo.kural_ekle(ad, ifade, semboller)
+            except ValueError as e:
+                messagebox.showerror("Hata", str(e), parent=alarm_window)
+                return
+            ad_entry.delete(0, tk.END)
+            kurallar_degisti()
+
+        def secili_kurallar():
+            return [int(iid) for iid in kural_tree.selection()]
+
+        def kural_sil():
+            for kural_id in secili_kurallar():
+                depo.kural_sil(kural_id)
+            kurallar_degisti()
+
+        def ac_kapat():
+            etkinlik = {kural_id: etkin for kural_id, _, _, _, etkin in depo.kurallar()}
+            for kural_id in secili_kurallar():
+                depo.kural_etkinlestir(kural_id, not etkinlik.get(kural_id, True))
+            kurallar_degisti()
+
+        def simdi_tara():
+            if self._alarm_tarayici is not None:
+                self._alarm_tarayici.simdi_tara()
+
+        zamanlayici = {}
+
+        def durumu_yenile():
+            tarayici = self._alarm_tarayici
+            if tarayici is None:
+                durum_var.set("Tarama kapalı (etkin kural yok)")
+            elif tarayici.son_tur is None:
+                durum_var.set("İlk tarama sürüyor...")
+            else:
+                t = tarayici.son_tur
+                durum_var.set(f"Son tarama {datetime.fromtimestamp(t['zaman']):%H:%M:%S}: "
+                              f"{t['izlenen']} hisse izleniyor, {t['degerlendirilen']} hisse değerlendirildi, "
+                              f"{t['sure'] * 1000:.0f} ms")
+            zamanlayici['id'] = alarm_window.after(1000, durumu_yenile)
+
+        ttk.Button(form_frame, text="Kural Ekle", command=kural_ekle).grid(row=0, column=6, padx=5, pady=5)
+        buton_frame = tk.Frame(kural_frame, bg="#ffffff")
+        buton_frame.pack(fill=tk.X, before=kural_tree)
+        ttk.Button(buton_frame, text="Sil", command=kural_sil).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buton_frame, text="Aç / Kapat", command=ac_kapat).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(buton_frame, text="Şimdi Tara", command=simdi_tara).pack(side=tk.LEFT, padx=5, pady=5)
+
+        kurallari_goster()
+        gunlugu_goster()
+        durumu_yenile()
+        self._alarm_penceresi_yenile = gunlugu_goster
+
+        def on_close():
+            alarm_window.after_cancel(zamanlayici['id'])
+            self._alarm_penceresi_yenile = None
+            alarm_window.destroy()
+
+        alarm_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    def show_korelasyon_window(self):
+        from correlation import YARI_OMURLER
+
+        korelasyon_window = tk.Toplevel(self.root)
+        korelasyon_window.title("Korelasyon")
+        korelasyon_window.geometry("700x650")
+        korelasyon_window.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(korelasyon_window, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        tk.Label(control_frame, text="Periyot:", bg="#ffffff").grid(row=0, column=0, padx=5, pady=5)
+        periyot_var = tk.StringVar(value="2y")
+        ttk.Combobox(control_frame, textvariable=periyot_var, values=["6mo", "1y", "2y", "5y"],
+                     state="readonly", width=6).grid(row=0, column=1, padx=5, pady=5)
+
+        tk.Label(control_frame, text="Ağırlık:", bg="#ffffff").grid(row=0, column=2, padx=5, pady=5)
+        agirlik_var = tk.StringVar(value=next(iter(YARI_OMURLER)))
+        ttk.Combobox(control_frame, textvariable=agirlik_var, values=list(YARI_OMURLER),
+                     state="readonly", width=12).grid(row=0, column=3, padx=5, pady=5)
+
+        tk.Label(control_frame, text="Isı haritası:", bg="#ffffff").grid(row=0, column=4, padx=5, pady=5)
+        kapsam_var = tk.StringVar(value="Portföy")
+        ttk.Combobox(control_frame, textvariable=kapsam_var, values=["Portföy", "Tüm hisseler"],
+                     state="readonly", width=12).grid(row=0, column=5, padx=5, pady=5)
+
+        tk.Label(control_frame, text="Hisse:", bg="#ffffff").grid(row=1, column=0, padx=5, pady=5)
+        hisse_var = tk.StringVar(value=self.hisse_var.get())
+        ttk.Combobox(control_frame, textvariable=hisse_var, values=self.hisse_listesi,
+                     width=10).grid(row=1, column=1, padx=5, pady=5)
+
+        tk.Label(control_frame, text="Sıralama:", bg="#ffffff").grid(row=1, column=2, padx=5, pady=5)
+        siralama_var = tk.StringVar(value="En benzer")
+        ttk.Combobox(control_frame, textvariable=siralama_var, values=["En benzer", "En ters"],
+                     state="readonly", width=12).grid(row=1, column=3, padx=5, pady=5)
+
+        ozet_var = tk.StringVar(value="Korelasyon henüz hesaplanmadı")
+        tk.Label(korelasyon_window, textvariable=ozet_var, bg="#f8f9fa", font=FONT,
+                 anchor="w").pack(fill=tk.X, padx=20)
+
+        table_frame = tk.Frame(korelasyon_window, bg="#ffffff")
+        table_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        columns = ('Hisse', 'Korelasyon', 'Ortak Gün')
+        benzer_tree = ttk.Treeview(table_frame, columns=columns, show='headings', style="Custom.Treeview")
+        for col in columns:
+            benzer_tree.heading(col, text=col)
+            benzer_tree.column(col, width=150, anchor=tk.CENTER)
+        benzer_tree.pack(fill=tk.BOTH, expand=True)
 
-        portfolio_scroll = ttk.Scrollbar(portfolio_frame, orient=tk.VERTICAL, 
-                                       command=portfolio_tree.yview)
-        portfolio_tree.configure(yscrollcommand=portfolio_scroll.set)
+        sonuc = {}
 
-        portfolio_scroll.pack(side=tk.RIGHT, fill=tk.Y)
-        portfolio_tree.pack(fill=tk.BOTH, expand=True)
+        def portfoy_sembolleri():
+            return [row[0] for row in self.portfolio.get_portfolio()]
 
-        def update_portfolio_view():
-            for item in portfolio_tree.get_children():
-                portfolio_tree.delete(item)
+        def benzerleri_goster(event=None):
+            motor = sonuc.get('motor')
+            if motor is None:
+                return
+            benzer_tree.delete(*benzer_tree.get_children())
+            for symbol, kor, adet in motor.en_benzer(hisse_var.get(), adet=20,
+                                                     ters=siralama_var.get() == "En ters"):
+                benzer_tree.insert('', tk.END, values=(symbol, f"{kor:+.3f}", adet))
 
-            portfolio_data = self.portfolio.get_portfolio()
-            for symbol, quantity, cost, buy_date, avg_cost in portfolio_data:
-                try:
-                    current_price = yf.Ticker(f"{symbol}.IS").history(period="1d")['Close'].iloc[-1]
-                    current_value = current_price * quantity
-                    profit_loss = current_value - cost
-                    profit_percentage = (profit_loss / cost) * 100
-                    formatted_date = datetime.strptime(buy_date, '%Y-%m-%d %H:%M:%S').strftime('%d.%m.%Y')
-                    
-                    portfolio_tree.insert('', tk.END, values=(
-                        symbol,
-                        quantity,
-                        f"{avg_cost:,.2f} TL",
-                        f"{current_value:,.2f} TL",
-                        f"{profit_loss:+,.2f} TL (%{profit_percentage:+.2f})",
-                        formatted_date
-                    ))
-                except:
-                    portfolio_tree.insert('', tk.END, values=(
-                        symbol,
-                        quantity,
-                        f"{avg_cost:,.2f} TL",
-                        "Veri Yok",
-                        "Hesaplanamadı",
-                        formatted_date
-                    ))
+        def tamamlandi(motor):
+            if not korelasyon_window.winfo_exists():
+                return
+            sonuc['motor'] = motor
+            if not motor.semboller:
+                ozet_var.set("Yeterli fiyat geçmişi bulunamadı")
+                return
+            ortalama = motor.ortalama_korelasyon(portfoy_sembolleri())
+            ozet_var.set(f"{len(motor.semboller)} hisse. Portföy içi ortalama korelasyon: "
+                         + ("-" if ortalama != ortalama else f"{ortalama:+.2f}"))
+            benzerleri_goster()
+
+        def hesapla():
+            semboller = set(self.hisse_listesi) | set(portfoy_sembolleri())
+            self.isler.gonder("korelasyon", self._korelasyon_hazirla, semboller, periyot_var.get(),
+                              YARI_OMURLER[agirlik_var.get()],
+                              tamamlandi=tamamlandi,
+                              hata=lambda e: messagebox.showerror("Hata", f"Korelasyon hesaplanamadı:\n{str(e)}",
+                                                                  parent=korelasyon_window),
+                              aciklama="Korelasyon")
+
+        def isi_haritasi():
+            from charts import korelasyon_verisi
+
+            motor = sonuc.get('motor')
+            if motor is None:
+                messagebox.showinfo("Bilgi", "Önce korelasyonu hesaplayın", parent=korelasyon_window)
+                return
+            if kapsam_var.get() == "Portföy":
+                semboller, matris = motor.alt_matris(portfoy_sembolleri())
+                baslik = "Portföy Hisseleri Korelasyonu"
+            else:
+                semboller, matris = motor.semboller, motor.korelasyon
+                baslik = "BIST Hisseleri Korelasyonu"
+            if len(semboller) < 2:
+                messagebox.showinfo("Bilgi", "Isı haritası için en az iki hisse gerekli", parent=korelasyon_window)
+                return
+            self.korelasyon_grafikleri.goster(
+                korelasyon_verisi(semboller, matris, f"{baslik} ({periyot_var.get()}, {agirlik_var.get()})"))
+
+        ttk.Button(control_frame, text="Hesapla", command=hesapla).grid(row=0, column=6, padx=5, pady=5)
+        ttk.Button(control_frame, text="Isı Haritası", command=isi_haritasi).grid(row=1, column=6, padx=5, pady=5)
+        ttk.Button(control_frame, text="Listele", command=benzerleri_goster).grid(row=1, column=5, padx=5, pady=5)
+
+        hesapla()
+
+    @property
+    def korelasyon_grafikleri(self):
+        if self._korelasyon_grafikleri is None:
+            from charts import GrafikYoneticisi, KorelasyonPenceresi
+            self._korelasyon_grafikleri = GrafikYoneticisi(self.root, BG_COLOR, max_pencere=1,
+                                                           pencere_sinifi=KorelasyonPenceresi)
+        return self._korelasyon_grafikleri
+
+    def _korelasyon_hazirla(self, is_, semboller, periyot, yari_omur):
+        import copy
+        from correlation import KorelasyonMotoru
+
+        with self._korelasyon_kilidi:
+            if self._korelasyon is None:
+                self._korelasyon = KorelasyonMotoru(self.bar_store, panel=self.fiyat_paneli)
+            self._korelasyon.ayarla(periyot, yari_omur)
+            self._korelasyon.guncelle(semboller, is_)
+            # Güncelleme matrisleri yerinde değiştirmediği için sığ kopya arayüzde güvenle okunur
+            return copy.copy(self._korelasyon)
+
+    @property
+    def fiyat_paneli(self):
+        with self._fiyat_paneli_kilidi:
+            if self._fiyat_paneli is None:
+                from price_panel import FiyatPaneli, panel_dizini
+                self._fiyat_paneli = FiyatPaneli(panel_dizini(self.bar_store))
+            return self._fiyat_paneli
+
+    @property
+    def izleme_listeleri(self):
+        if self._izleme_listeleri is None:
+            from watchlist import IzlemeListeleri
+            self._izleme_listeleri = IzlemeListeleri()
+        return self._izleme_listeleri
+
+    def show_izleme_listeleri_window(self):
+        liste_window = tk.Toplevel(self.root)
+        liste_window.title("İzleme Listeleri")
+        liste_window.geometry("700x550")
+        liste_window.configure(bg="#f8f9fa")
+
+        ana_frame = tk.Frame(liste_window, bg="#ffffff")
+        ana_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        ana_frame.columnconfigure(1, weight=1)
+        ana_frame.rowconfigure(1, weight=1)
+
+        # Sol: listeler
+        tk.Label(ana_frame, text="Listeler", bg="#ffffff", font=FONT).grid(row=0, column=0, padx=5, pady=5)
+        listeler_kutusu = tk.Listbox(ana_frame, exportselection=False, font=FONT, width=24)
+        listeler_kutusu.grid(row=1, column=0, sticky="ns", padx=5, pady=5)
+
+        liste_frame = tk.Frame(ana_frame, bg="#ffffff")
+        liste_frame.grid(row=2, column=0, padx=5, pady=5)
+        ad_giris = ttk.Entry(liste_frame, width=14)
+        ad_giris.pack(side=tk.LEFT, padx=2)
+
+        # Sağ: seçili listenin hisseleri
+        sembol_baslik = tk.StringVar(value="Hisseler")
+        tk.Label(ana_frame, textvariable=sembol_baslik, bg="#ffffff", font=FONT).grid(row=0, column=1, padx=5, pady=5)
+        semboller_kutusu = tk.Listbox(ana_frame, selectmode=tk.EXTENDED, exportselection=False, font=FONT)
+        semboller_kutusu.grid(row=1, column=1, sticky="nsew", padx=5, pady=5)
+
+        sembol_frame = tk.Frame(ana_frame, bg="#ffffff")
+        sembol_frame.grid(row=2, column=1, padx=5, pady=5)
+        hisse_giris = ttk.Combobox(sembol_frame, values=self.hisse_listesi, width=12, font=FONT)
+        hisse_giris.pack(side=tk.LEFT, padx=2)
+
+        # Alt: toplu rapor
+        rapor_frame = tk.Frame(liste_window, bg="#ffffff")
+        rapor_frame.pack(fill=tk.X, padx=20, pady=(0, 10))
+        tk.Label(rapor_frame, text="Periyot:", bg="#ffffff").pack(side=tk.LEFT, padx=5, pady=5)
+        periyot_var = tk.StringVar(value=self.periyot_var.get())
+        ttk.Combobox(rapor_frame, textvariable=periyot_var, values=["1mo", "3mo", "6mo", "1y", "2y"],
+                     state="readonly", width=6).pack(side=tk.LEFT, padx=5, pady=5)
+        durum_var = tk.StringVar()
+        tk.Label(rapor_frame, textvariable=durum_var, bg="#ffffff").pack(side=tk.RIGHT, padx=5, pady=5)
+
+        def secili_liste():
+            secim = listeler_kutusu.curselection()
+            return listeler_kutusu.get(secim[0]) if secim else None
+
+        def listeleri_goster(secilecek=None):
+            adlar = self.izleme_listeleri.listeler()
+            listeler_kutusu.delete(0, tk.END)
+            for ad in adlar:
+                listeler_kutusu.insert(tk.END, ad)
+            if adlar:
+                listeler_kutusu.selection_set(adlar.index(secilecek) if secilecek in adlar else 0)
+            sembolleri_goster()
+
+        def sembolleri_goster(event=None):
+            semboller_kutusu.delete(0, tk.END)
+            ad = secili_liste()
+            if ad is None:
+                sembol_baslik.set("Hisseler")
+                return
+            semboller = self.izleme_listeleri.semboller(ad)
+            for symbol in semboller:
+                semboller_kutusu.insert(tk.END, symbol)
+            sembol_baslik.set(f"{ad} ({len(semboller)} hisse)")
 
-        update_portfolio_view()
+        def liste_ekle():
+            ad = ad_giris.get().strip()
+            try:
+                self.izleme_listeleri.liste_ekle(ad)
+            except ValueError as e:
+                messagebox.showwarning("Uyarı", str(e), parent=liste_window)
+                return
+            ad_giris.delete(0, tk.END)
+            listeleri_goster(ad)
 
-        # Otomatik güncelleme
-        def auto_update():
-            update_portfolio_view()
-            portfolio_window.after(60000, auto_update)  # Her 1 dakikada bir güncelle
+        def liste_sil():
+            ad = secili_liste()
+            if ad is None:
+                return
+            if messagebox.askyesno("Onay", f"'{ad}' listesi silinsin mi?", parent=liste_window):
+                self.izleme_listeleri.liste_sil(ad)
+                listeleri_goster()
+
+        def sembol_ekle(semboller):
+            ad = secili_liste()
+            if ad is None:
+                messagebox.showwarning("Uyarı", "Önce bir liste seçin ya da oluşturun", parent=liste_window)
+                return
+            self.izleme_listeleri.sembol_ekle(ad, semboller)
+            sembolleri_goster()
+
+        def sembol_cikar():
+            ad = secili_liste()
+            secili = [semboller_kutusu.get(i) for i in semboller_kutusu.curselection()]
+            if ad is not None and secili:
+                self.izleme_listeleri.sembol_cikar(ad, secili)
+                sembolleri_goster()
+
+        def rapor_olustur(bicim):
+            ad = secili_liste()
+            semboller = self.izleme_listeleri.semboller(ad) if ad is not None else []
+            if not semboller:
+                messagebox.showwarning("Uyarı", "Rapor için hisse içeren bir liste seçin", parent=liste_window)
+                return
+            path = filedialog.asksaveasfilename(
+                parent=liste_window, title="Raporu kaydet", defaultextension=f".{bicim}",
+                initialfile=f"{ad}_{datetime.now().strftime('%Y%m%d')}.{bicim}",
+                filetypes=[(bicim.upper(), f"*.{bicim}")])
+            if not path:
+                return
 
-        portfolio_window.after(60000, auto_update)
-        # Klavye kısayolları
-        self.hisse_dropdown.bind("<Return>", lambda event: self.analiz_et())
-        self.hisse_dropdown.focus()
+            def calistir(is_, semboller, periyot, path):
+                from report_export import rapor_paketi
+                is_.bildir(0.05, "Barlar ve temel veriler okunuyor")
+                # Çizim süreç havuzunda yapılır; iş iptal edilirse bildir() bekleyen hisseleri iptal ettirir
+                return path, rapor_paketi(
+                    semboller, periyot, path, self.bar_store, self.temel_veri,
+                    ilerleme=lambda biten, toplam: is_.bildir(biten / toplam, f"{biten}/{toplam} hisse"))
+
+            durum_var.set(f"{ad}: {len(semboller)} hisse hazırlanıyor...")
+            self.isler.gonder("rapor_paketi", calistir, semboller, periyot_var.get(), path,
+                              tamamlandi=rapor_hazir, hata=rapor_hatasi, aciklama=f"{ad} raporu")
+
+        def rapor_hazir(sonuc):
+            import os
+            import webbrowser
+
+            path, (adet, hatalar) = sonuc
+            if liste_window.winfo_exists():
+                durum_var.set(f"{adet} hisse yazıldı")
+            mesaj = f"{adet} hissenin raporu kaydedildi:\n{path}"
+            if hatalar:
+                mesaj += "\n\nRapor oluşturulamayanlar:\n" + "\n".join(f"{s}: {h}" for s, h in hatalar[:15])
+            if messagebox.askyesno("Rapor Hazır", mesaj + "\n\nDosya açılsın mı?"):
+                webbrowser.open(f"file://{os.path.abspath(path)}")
+
+        def rapor_hatasi(e):
+            if liste_window.winfo_exists():
+                durum_var.set("")
+            messagebox.showerror("Hata", f"Rapor oluşturulamadı:\n{str(e)}")
+
+        ttk.Button(liste_frame, text="Yeni", command=liste_ekle).pack(side=tk.LEFT, padx=2)
+        ttk.Button(liste_frame, text="Sil", command=liste_sil).pack(side=tk.LEFT, padx=2)
+        ttk.Button(sembol_frame, text="Ekle",
+                   command=lambda: sembol_ekle([hisse_giris.get()])).pack(side=tk.LEFT, padx=2)
+        ttk.Button(sembol_frame, text="Çıkar", command=sembol_cikar).pack(side=tk.LEFT, padx=2)
+        ttk.Button(sembol_frame, text="Portföyü Ekle",
+                   command=lambda: sembol_ekle([row[0] for row in self.portfolio.get_portfolio()])).pack(
+                       side=tk.LEFT, padx=2)
+        ttk.Button(rapor_frame, text="HTML Rapor", command=lambda: rapor_olustur('html')).pack(
+            side=tk.LEFT, padx=5, pady=5)
+        ttk.Button(rapor_frame, text="PDF Rapor", command=lambda: rapor_olustur('pdf')).pack(
+            side=tk.LEFT, padx=5, pady=5)
+
+        listeler_kutusu.bind("<<ListboxSelect>>", sembolleri_goster)
+        ad_giris.bind("<Return>", lambda event: liste_ekle())
+        hisse_giris.bind("<Return>", lambda event: sembol_ekle([hisse_giris.get()]))
+        semboller_kutusu.bind("<Delete>", lambda event: sembol_cikar())
+        listeleri_goster()
+
+    def show_tanilama_window(self):
+        tanilama_window = tk.Toplevel(self.root)
+        tanilama_window.title("Tanılama")
+        tanilama_window.geometry("900x650")
+        tanilama_window.configure(bg="#f8f9fa")
+
+        control_frame = tk.Frame(tanilama_window, bg="#ffffff")
+        control_frame.pack(fill=tk.X, padx=20, pady=10)
+
+        etkin_var = tk.BooleanVar(value=tanilama.etkin)
+        profil_var = tk.BooleanVar(value=self._profil_istegi)
+
+        def etkinlestir():
+            tanilama.etkin = etkin_var.get()
+
+        def profil_iste():
+            self._profil_istegi = profil_var.get()
+
+        ttk.Checkbutton(control_frame, text="Ölçüm açık", variable=etkin_var,
+                        command=etkinlestir).pack(side=tk.LEFT, padx=5, pady=5)
+        ttk.Checkbutton(control_frame, text="Sonraki analizi profille", variable=profil_var,
+                        command=profil_iste).pack(side=tk.LEFT, padx=5, pady=5)
+        if self.acilis_suresi is not None:
+            tk.Label(control_frame, text=f"İlk çerçeve: {self.acilis_suresi * 1000:.0f} ms",
+                     bg="#ffffff", font=FONT).pack(side=tk.LEFT, padx=15, pady=5)
+
+        # Aşama süreleri (ms); iç içe aşamalar (ör. temel_analiz içindeki yfinance) dahildir
+        asama_frame = tk.Frame(tanilama_window, bg="#ffffff")
+        asama_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        columns = ('Aşama', 'Adet', 'p50 ms', 'p90 ms', 'p99 ms', 'En Çok ms', 'Toplam ms')
+        asama_tree = ttk.Treeview(asama_frame, columns=columns, show='headings', style="Custom.Treeview")
+        for col in columns:
+            asama_tree.heading(col, text=col)
+            asama_tree.column(col, width=110, anchor=tk.CENTER)
+        asama_tree.pack(fill=tk.BOTH, expand=True)
+
+        sayac_frame = tk.Frame(tanilama_window, bg="#ffffff")
+        sayac_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        sayac_tree = ttk.Treeview(sayac_frame, columns=('Sayaç', 'Değer'), show='headings',
+                                  style="Custom.Treeview", height=6)
+        for col in ('Sayaç', 'Değer'):
+            sayac_tree.heading(col, text=col)
+            sayac_tree.column(col, width=200, anchor=tk.CENTER)
+        sayac_tree.pack(fill=tk.BOTH, expand=True)
+
+        zamanlayici = {}
+
+        def yenile():
+            asamalar, sayaclar = tanilama.ozet()
+            sirali = [ad for ad in ASAMALAR if ad in asamalar] + sorted(set(asamalar) - set(ASAMALAR))
+            asama_tree.delete(*asama_tree.get_children())
+            for ad in sirali:
+                a = asamalar[ad]
+                asama_tree.insert('', tk.END, values=(
+                    ad, a['adet'], f"{a['p50']:.1f}", f"{a['p90']:.1f}", f"{a['p99']:.1f}",
+                    f"{a['en_cok']:.1f}", f"{a['toplam']:.0f}"))
+            sayac_tree.delete(*sayac_tree.get_children())
+            for ad in sorted(sayaclar):
+                deger = sayaclar[ad]
+                metin = f"{deger / 1024:,.1f} KB (yaklaşık)" if ad == 'ag_bayt' else f"{deger:,}"
+                sayac_tree.insert('', tk.END, values=(ad, metin))
+            profil_var.set(self._profil_istegi)
+            zamanlayici['id'] = tanilama_window.after(1000, yenile)
+
+        def sifirla():
+            tanilama.sifirla()
+
+        def disa_aktar():
+            path = filedialog.asksaveasfilename(
+                parent=tanilama_window, title="Tanılama kaydını dışa aktar", defaultextension=".jsonl",
+                filetypes=[("JSON Lines", "*.jsonl"), ("Tüm dosyalar", "*.*")])
+            if not path:
+                return
+            try:
+                satir = tanilama.jsonl_yaz(path)
+                messagebox.showinfo("Başarılı", f"{satir} satır yazıldı", parent=tanilama_window)
+            except Exception as e:
+                messagebox.showerror("Hata", f"Dışa aktarılamadı:\n{str(e)}", parent=tanilama_window)
+
+        ttk.Button(control_frame, text="Sıfırla", command=sifirla).pack(side=tk.RIGHT, padx=5, pady=5)
+        ttk.Button(control_frame, text="JSONL Dışa Aktar", command=disa_aktar).pack(side=tk.RIGHT, padx=5, pady=5)
+
+        yenile()
+
+        def on_close():
+            tanilama_window.after_cancel(zamanlayici['id'])
+            tanilama_window.destroy()
+
+        tanilama_window.protocol("WM_DELETE_WINDOW", on_close)
+
+    def _profil_goster(self, baslik, metin):
+        profil_window = tk.Toplevel(self.root)
+        profil_window.title(f"Profil - {baslik}")
+        profil_window.geometry("1000x600")
+        text = tk.Text(profil_window, wrap=tk.NONE, font=("Consolas", 9))
+        scrollbar = ttk.Scrollbar(profil_window, orient=tk.VERTICAL, command=text.yview)
+        text.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, metin)
+        text.config(state=tk.DISABLED)
+
+    def _is_durumu_guncelle(self, isler):
+        if not isler:
+            self.status_var.set("Hazır")
+            self.progress['value'] = 0
+            return
+        self.status_var.set(" | ".join(f"{is_.aciklama}: {is_.durum} (%{is_.ilerleme*100:.0f})"
+                                       for is_ in isler))
+        self.progress['value'] = isler[-1].ilerleme
 
     def setup_styles(self):
         style = ttk.Style()
@@ -567,318 +1479,143 @@ class BistAnalizUygulamasi:
         self.text_output.config(state=tk.DISABLED)
 
     def teknik_analiz(self, df):
-        try:
-            df = df.copy()
-            # Momentum göstergeleri
-            df['RSI'] = ta.momentum.RSIIndicator(df['Close'], window=14).rsi()
-            df['Stoch_%K'] = ta.momentum.StochasticOscillator(
-                df['High'], df['Low'], df['Close'], window=14).stoch()
-
-            # Trend göstergeleri
-            macd = ta.trend.MACD(df['Close'], window_slow=26, window_fast=12, window_sign=9)
-            df['MACD'] = macd.macd()
-            df['MACD_signal'] = macd.macd_signal()
-            df['EMA_20'] = ta.trend.EMAIndicator(df['Close'], window=20).ema_indicator()
-            df['SMA_50'] = ta.trend.SMAIndicator(df['Close'], window=50).sma_indicator()
-            df['EMA_200'] = ta.trend.EMAIndicator(df['Close'], window=200).ema_indicator()
-
-            # Volatilite göstergeleri
-            bollinger = ta.volatility.BollingerBands(df['Close'], window=20, window_dev=2)
-            df['BB_upper'] = bollinger.bollinger_hband()
-            df['BB_middle'] = bollinger.bollinger_mavg()
-            df['BB_lower'] = bollinger.bollinger_lband()
-
-            # Hacim analizi
-            df['OBV'] = ta.volume.OnBalanceVolumeIndicator(df['Close'], df['Volume']).on_balance_volume()
-
-            return df
-        except Exception as e:
-            print(f"Teknik analiz hatası: {e}")
-            return None
+        from analysis import teknik_analiz
+        return teknik_analiz(df)
 
     def temel_analiz(self, hisse_kodu):
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            info = hisse.info
-
-            # Market cap kontrolü
-            market_cap = info.get('marketCap')
-            market_cap_str = f"{market_cap/1000000:,.2f} M TL" if market_cap else 'N/A'
-
-            # Temettü verimi kontrolü
-            dividend_yield = info.get('dividendYield')
-            dividend_str = f"{dividend_yield*100:.2f}%" if dividend_yield else 'N/A'
-
-            # Kar marjı kontrolü
-            profit_margins = info.get('profitMargins')
-            profit_str = f"{profit_margins*100:.2f}%" if profit_margins else 'N/A'
-
-            return {
-                'Piyasa Değeri': market_cap_str,
-                'F/K': info.get('forwardPE', 'N/A'),
-                'FD/FAVÖK': info.get('enterpriseToEbitda', 'N/A'),
-                'Temettu Verimi': dividend_str,
-                'Son Çeyrek Kâr': profit_str,
-                '52 Hafta En Yüksek': info.get('fiftyTwoWeekHigh', 'N/A'),
-                '52 Hafta En Düşük': info.get('fiftyTwoWeekLow', 'N/A'),
-
-            }
-        except Exception as e:
-            print(f"Temel analiz hatası: {e}")
-            return None
+        from analysis import temel_analiz
+        return temel_analiz(self.temel_veri, hisse_kodu)
 
     def grafik_goster(self):
         hisse_kodu = self.hisse_var.get().strip().upper()
         periyot = self.periyot_var.get()
+        aralik = self.aralik_var.get()
 
         if not hisse_kodu:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        self.isler.gonder("grafik", self._grafik_hazirla, hisse_kodu, periyot, aralik,
+                          self.grafikler.piksel_genisligi(hisse_kodu),
+                          tamamlandi=self.grafikler.goster,
+                          hata=lambda e: messagebox.showerror("Hata", f"Grafik oluşturulamadı:\n{str(e)}"),
+                          aciklama=f"{hisse_kodu} çizgi grafik")
 
-            if df.empty or len(df) < 5:
-                messagebox.showerror("Hata", "Yeterli veri bulunamadı")
-                return
+    @property
+    def grafikler(self):
+        """Çizgi grafik pencereleri (ve matplotlib) ilk grafik isteğinde yüklenir."""
+        if self._grafikler is None:
+            from charts import GrafikYoneticisi
+            self._grafikler = GrafikYoneticisi(self.root, BG_COLOR)
+        return self._grafikler
 
-            df = self.teknik_analiz(df)
-            if df is None:
-                messagebox.showerror("Hata", "Teknik analiz yapılamadı")
-                return
+    def _grafik_hazirla(self, is_, hisse_kodu, periyot, aralik, piksel):
+        from analysis import teknik_analiz
+        from charts import cizgi_verisi
+
+        is_.bildir(0.1, "Veri alınıyor")
+        df = self.bar_store.get_history(hisse_kodu, periyot, aralik)
+        periyot = _periyot_etiketi(periyot, aralik)
+
+        if df.empty or len(df) < 5:
+            raise ValueError("Yeterli veri bulunamadı")
 
-            plt.style.use('ggplot')
-
-            # 4 alt grafik için height_ratios güncellendi
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10), 
-                                                        gridspec_kw={'height_ratios': [2, 1], 'width_ratios': [3, 1]})
-            fig.patch.set_facecolor(BG_COLOR)
-
-            # Fiyat grafiği (ax1)
-            ax1.plot(df.index, df['Close'], label='Kapanış', color='#2e86de', linewidth=2)
-            ax1.plot(df.index, df['EMA_20'], label='EMA 20', linestyle='--', color='#ff9f43')
-            ax1.plot(df.index, df['SMA_50'], label='SMA 50', linestyle=':', color='#5f27cd')
-            ax1.plot(df.index, df['EMA_200'], label='EMA 200', linestyle='-.', color='#ff6b6b')
-            ax1.fill_between(df.index, df['BB_upper'], df['BB_lower'], color='#c8d6e5', alpha=0.3)
-            ax1.set_title(f'{hisse_kodu} Fiyat Grafiği ({periyot})', fontsize=14, pad=15)
-            ax1.set_ylabel('Fiyat (TL)', fontsize=10)
-            ax1.legend(loc='upper left', fontsize=9)
-            ax1.grid(True, linestyle='--', alpha=0.7)
-
-            # RSI grafiği (ax2)
-            ax2.plot(df.index, df['RSI'], label='RSI 14', color='#10ac84', linewidth=2)
-            ax2.axhline(70, color='#ff6b6b', linestyle='--', linewidth=1)
-            ax2.axhline(30, color='#1dd1a1', linestyle='--', linewidth=1)
-            ax2.set_title('RSI (14)', fontsize=12, pad=15)
-            ax2.set_ylabel('RSI', fontsize=10)
-            ax2.set_ylim(0, 100)
-            ax2.legend(loc='upper left', fontsize=9)
-            ax2.grid(True, linestyle='--', alpha=0.7)
-
-            # MACD grafiği (ax3)
-            ax3.plot(df.index, df['MACD'], label='MACD', color='#9c88ff', linewidth=1.5)
-            ax3.plot(df.index, df['MACD_signal'], label='Sinyal', color='#f368e0', linewidth=1.5)
-            ax3.bar(df.index, df['MACD'] - df['MACD_signal'], label='Histogram', 
-                   color=np.where(df['MACD'] > df['MACD_signal'], '#2ecc71', '#e74c3c'), alpha=0.5)
-            ax3.set_title('MACD (12,26,9)', fontsize=12, pad=15)
-            ax3.legend(loc='upper left', fontsize=9)
-            ax3.grid(True, linestyle='--', alpha=0.7)
-
-            # Hacim grafiği (ax4)
-            ax4.bar(df.index, df['Volume']/1000000, color='#3498db', alpha=0.7)
-            ax4.set_title('Hacim (Milyon)', fontsize=12, pad=15)
-            ax4.set_ylabel('Hacim (M)')
-            ax4.grid(True, linestyle='--', alpha=0.5)
-
-            plt.tight_layout()
-
-            grafik_pencere = tk.Toplevel()
-            grafik_pencere.title(f"{hisse_kodu} Teknik Grafik - {periyot}")
-            grafik_pencere.geometry("1200x900")
-
-            canvas = FigureCanvasTkAgg(fig, master=grafik_pencere)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            def on_close():
-                plt.close(fig)
-                grafik_pencere.destroy()
-
-            grafik_pencere.protocol("WM_DELETE_WINDOW", on_close)
-
-        except Exception as e:
-            messagebox.showerror("Hata", f"Grafik oluşturulamadı:\n{str(e)}")
+        is_.bildir(0.4, "Teknik analiz")
+        df = is_.hesapla(teknik_analiz, df)
+        if df is None:
+            raise ValueError("Teknik analiz yapılamadı")
+
+        # Seriler pencere genişliğine indirgenir; çizim ana iş parçacığında mevcut figüre yazılır
+        is_.bildir(0.7, "Grafik hazırlanıyor")
+        return cizgi_verisi(df, hisse_kodu, periyot, piksel)
 
     def mum_grafigi_goster(self):
         hisse_kodu = self.hisse_var.get().strip().upper()
         periyot = self.periyot_var.get()
+        aralik = self.aralik_var.get()
 
         if not hisse_kodu:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        self.isler.gonder("mum", self._mum_grafigi_hazirla, hisse_kodu, periyot, aralik,
+                          tamamlandi=self.mum_grafikleri.goster,
+                          hata=lambda e: messagebox.showerror("Hata", f"Mum grafiği oluşturulamadı:\n{str(e)}"),
+                          aciklama=f"{hisse_kodu} mum grafiği")
 
-            if df.empty or len(df) < 5:
-                messagebox.showerror("Hata", "Yeterli veri bulunamadı")
-                return
+    @property
+    def mum_grafikleri(self):
+        if self._mum_grafikleri is None:
+            from charts import GrafikYoneticisi, MumPenceresi
+            self._mum_grafikleri = GrafikYoneticisi(self.root, BG_COLOR, pencere_sinifi=MumPenceresi)
+        return self._mum_grafikleri
+
+    def _mum_grafigi_hazirla(self, is_, hisse_kodu, periyot, aralik):
+        from charts import mum_verisi
+
+        is_.bildir(0.1, "Veri alınıyor")
+        df = self.bar_store.get_history(hisse_kodu, periyot, aralik)
+        periyot = _periyot_etiketi(periyot, aralik)
+
+        if df.empty or len(df) < 5:
+            raise ValueError("Yeterli veri bulunamadı")
 
-            df.index = pd.to_datetime(df.index)
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
-
-            grafik_pencere = tk.Toplevel()
-            grafik_pencere.title(f"{hisse_kodu} Mum Grafiği - {periyot}")
-            grafik_pencere.geometry("1100x850")
-
-            # Renk ve stil
-            mc = mpf.make_marketcolors(
-                up='#2ecc71', down='#e74c3c',
-                wick={'up':'#2ecc71', 'down':'#e74c3c'},
-                edge={'up':'#2ecc71', 'down':'#e74c3c'},
-                volume='#3498db'
-            )
-            s = mpf.make_mpf_style(marketcolors=mc, gridstyle='--', gridcolor='#dddddd')
-
-            # Mum grafiğini çiz, fig ve axes döner
-            fig, axes = mpf.plot(df,
-                    type='candle',
-                    style=s,
-                    title=f'\n{hisse_kodu} Mum Grafiği ({periyot})',
-                    ylabel='Fiyat (TL)',
-                    volume=True,
-                    mav=(20, 50, 200),
-                    tight_layout=True,
-                    returnfig=True,
-                    warn_too_much_data=10000,
-                    update_width_config=dict(
-                        candle_linewidth=1.0,
-                        candle_width=0.8,
-                        volume_linewidth=1.0
-                    ))
-
-            canvas = FigureCanvasTkAgg(fig, master=grafik_pencere)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-
-            def on_close():
-                plt.close(fig)
-                grafik_pencere.destroy()
-
-            grafik_pencere.protocol("WM_DELETE_WINDOW", on_close)
-
-        except Exception as e:
-            messagebox.showerror("Hata", f"Mum grafiği oluşturulamadı:\n{str(e)}")
+        # Ortalamalar tüm barlar üzerinden burada hesaplanır; mumlar çizimde görünüme göre gruplanır
+        is_.bildir(0.5, "Grafik hazırlanıyor")
+        return mum_verisi(df, hisse_kodu, periyot)
 
 
     def analiz_et(self):
         hisse_kodu = self.hisse_var.get().strip().upper()
         periyot = self.periyot_var.get()
+        aralik = self.aralik_var.get()
 
         if not hisse_kodu:
             messagebox.showwarning("Uyarı", "Lütfen bir hisse kodu seçin")
             return
 
-        try:
-            hisse = yf.Ticker(f"{hisse_kodu}.IS")
-            df = hisse.history(period=periyot)
+        if self._profil_istegi:
+            # Tek seferlik: veri alma, analiz ve rapor cProfile altında çalışır
+            self._profil_istegi = False
 
-            if df.empty or len(df) < 10:
-                messagebox.showerror("Hata", f"Yeterli veri bulunamadı (en az 10 iş günü gereklidir)\nSeçilen periyot: {periyot}")
-                return
+            def profilli(is_, *args):
+                return profille(self._analiz_hazirla, is_, *args)
 
-            df = self.teknik_analiz(df)
-            if df is None:
-                messagebox.showerror("Hata", "Teknik analiz yapılamadı")
-                return
+            def goster(sonuc):
+                rapor, profil = sonuc
+                self._analiz_goster(rapor)
+                self._profil_goster(f"{hisse_kodu} analiz", profil)
 
-            son_fiyat = df['Close'].iloc[-1]
-            onceki_fiyat = df['Close'].iloc[-2] if len(df) > 1 else son_fiyat
-            daily_change = son_fiyat - onceki_fiyat
-            percent_change = (son_fiyat/onceki_fiyat-1)*100
-
-            son = df.iloc[-1]
-            temel = self.temel_analiz(hisse_kodu)
-
-            # Analiz raporu oluştur
-            analiz = f"""
-📈 {hisse_kodu.upper()}.IS ANALİZ RAPORU - {datetime.now().strftime('%d.%m.%Y %H:%M')}
-{'='*80}
-
-🔹 FİYAT VE HACİM BİLGİLERİ ({periyot}):
-   • Son Fiyat: {son_fiyat:.2f} TL
-   • Günlük Değişim: {daily_change:+.2f} TL ({percent_change:+.2f}%)
-   • Ortalama Fiyat: {df['Close'].mean():.2f} TL
-   • Ortalama Hacim: {df['Volume'].mean()/1000000:.2f} M
-   • Son Hacim: {df['Volume'].iloc[-1]/1000000:.2f} M
-   • En Yüksek Fiyat: {df['Close'].max():.2f} TL
-   • En Düşük Fiyat: {df['Close'].min():.2f} TL
-   • En Yüksek Hacim: {df['Volume'].max()/1000000:.2f} M
-   • Volatilite: {(df['Close'].max() - df['Close'].min())/df['Close'].mean()*100:.2f}%
-
-📊 TEKNİK GÖSTERGELER:
-   • RSI (14): {son['RSI']:.2f} {"(Aşırı Alım ⚠)" if son['RSI'] > 70 else "(Aşırı Satım ⚠)" if son['RSI'] < 30 else ""}
-   • MACD: {son['MACD']:.2f} {"(Yukarı)" if son['MACD'] > son['MACD_signal'] else "(Aşağı)"}
-   • MACD Sinyal: {son['MACD_signal']:.2f}
-   • EMA 20: {son['EMA_20']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_20'] else "(Altında ▼)"}
-   • SMA 50: {son['SMA_50']:.2f} {"(Üstünde ▲)" if son['Close'] > son['SMA_50'] else "(Altında ▼)"}
-   • EMA 200: {son['EMA_200']:.2f} {"(Üstünde ▲)" if son['Close'] > son['EMA_200'] else "(Altında ▼)"}
-   • Bollinger Band: {"(Üst Band)" if son['Close'] > son['BB_upper'] else "(Alt Band)" if son['Close'] < son['BB_lower'] else "(Orta Band)"}
-   • OBV: {son['OBV']/1000000:+.2f} M
-   • Hacim Ortalama/Şimdi: {df['Volume'].mean()/1000000:.1f}M/{son['Volume']/1000000:.1f}M
-"""
-            # Temel analiz ekle
-            if temel:
-                analiz += f"""
-💰 TEMEL GÖSTERGELER:
-   • Piyasa Değeri: {temel.get('Piyasa Değeri', 'N/A')}
-   • F/K: {temel.get('F/K', 'N/A')}
-   • FD/FAVÖK: {temel.get('FD/FAVÖK', 'N/A')}
-   • Temettu Verimi: {temel.get('Temettu Verimi', 'N/A')}
-   • Son Çeyrek Kâr: {temel.get('Son Çeyrek Kâr', 'N/A')}
-   • 52 Hafta En Yüksek: {temel.get('52 Hafta En Yüksek', 'N/A')}
-   • 52 Hafta En Düşük: {temel.get('52 Hafta En Düşük', 'N/A')}
-
-"""
-            else:
-                analiz += "\n⚠ Temel analiz verileri alınamadı\n"
-
-            # Sinyal analizi
-            analiz += "\n💡 GENEL DEĞERLENDİRME:\n"
-            buy_signal = 0
-
-            # Al sinyalleri
-            if son['RSI'] < 35: buy_signal += 1
-            if son['MACD'] > son['MACD_signal']: buy_signal += 1
-            if son['Close'] > son['EMA_20']: buy_signal += 1
-            if son['Close'] > son['SMA_50']: buy_signal += 1
-            if son['Close'] > son['EMA_200']: buy_signal += 1
-            if son['Close'] < son['BB_lower']: buy_signal += 1
-
-            # Sinyal analizine hacim kontrolü ekleyin
-            if son['Volume'] > df['Volume'].mean() * 1.5:  # Ortalamanın 1.5 katından fazla hacim:
-                buy_signal += 1
-                analiz += "\n   • Yüksek Hacim: Alım satım ilgisinde artış"
-
-            if buy_signal >= 4:
-                analiz += "   • GÜÇLÜ AL SİNYALİ (Çoğunlukla olumlu göstergeler)"
-            elif buy_signal >= 2:
-                analiz += "   • Orta seviye al sinyali (Bazı olumlu göstergeler)"
-            elif buy_signal == 1:
-                analiz += "   • Zayıf al sinyali (Sınırlı olumlu gösterge)"
-            else:
-                analiz += "   • Satış baskısı (Olumsuz göstergeler hakim)"
+            self.isler.gonder("analiz", profilli, hisse_kodu, periyot, aralik,
+                              tamamlandi=goster,
+                              hata=lambda e: messagebox.showerror("Hata", f"Analiz yapılamadı:\n{str(e)}"),
+                              aciklama=f"{hisse_kodu} analiz (profil)")
+            return
+
+        self.isler.gonder("analiz", self._analiz_hazirla, hisse_kodu, periyot, aralik,
+                          tamamlandi=self._analiz_goster,
+                          hata=lambda e: messagebox.showerror("Hata", f"Analiz yapılamadı:\n{str(e)}"),
+                          aciklama=f"{hisse_kodu} analiz")
+
+    def _analiz_goster(self, analiz):
+        # Sonuçları göster
+        self.text_output.config(state=tk.NORMAL)
+        self.text_output.delete(1.0, tk.END)
+        self.text_output.insert(tk.END, analiz)
+        self.text_output.config(state=tk.DISABLED)
+
+    def _analiz_hazirla(self, is_, hisse_kodu, periyot, aralik):
+        from analysis import hisse_analizi, rapor_metni
 
-            # Sonuçları göster
-            self.text_output.config(state=tk.NORMAL)
-            self.text_output.delete(1.0, tk.END)
-            self.text_output.insert(tk.END, analiz)
-            self.text_output.config(state=tk.DISABLED)
+        with span('analiz_et'):
+            is_.bildir(0.1, "Veri alınıyor")
+            df = self.bar_store.get_history(hisse_kodu, periyot, aralik)
+            periyot = _periyot_etiketi(periyot, aralik)
 
-        except Exception as e:
-            messagebox.showerror("Hata", f"Analiz yapılamadı:\n{str(e)}")
+            analiz = hisse_analizi(hisse_kodu, periyot, df, self.temel_veri,
+                                   hesapla=is_.hesapla, ilerleme=is_.bildir)
+            is_.kontrol()
+            return rapor_metni(analiz)
 
 if __name__ == "__main__":
     root = tk.Tk()
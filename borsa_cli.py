@@ -0,0 +1,139 @@
+"""Arayüz olmadan toplu analiz raporu üretir.
+
+Örnek:
+    python borsa_cli.py THYAO GARAN ASELS --period 6mo --format json --output rapor.json
+    python borsa_cli.py --file hisseler.txt --format csv --workers 8
+    python borsa_cli.py THYAO --source kayit:benchmarks/fixtures   # ağsız, kayıttan
+    python borsa_cli.py --watchlist sabah --format html --output sabah.html   # grafikli rapor paketi
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis import hisse_analizi, rapor_metni, rapor_satiri
+from bar_store import BarStore, PERIYOTLAR
+from fundamentals import TemelVeriOnbellegi
+from providers import Birlestirici, kaynaktan
+
+
+def sembolleri_oku(path):
+    """Her satırda bir sembol olan dosyayı okur; boş ve # ile başlayan satırlar atlanır."""
+    with open(path, encoding='utf-8') as f:
+        return [satir.strip().upper() for satir in f if satir.strip() and not satir.startswith('#')]
+
+
+def toplu_analiz(symbols, periyot="3mo", isci=4, temel=True, bar_store=None, temel_veri=None):
+    """Sembolleri en fazla `isci` eşzamanlı işle analiz eder.
+
+    Barlar önce toplu indirme istekleriyle alınır. (analizler, hatalar) döndürür;
+    analizler giriş sırasını korur, hatalar [(sembol, mesaj)] listesidir.
+    """
+    bar_store = bar_store or BarStore()
+    if temel and temel_veri is None:
+        temel_veri = TemelVeriOnbellegi()
+    frames = bar_store.get_many(symbols, periyot)
+
+    def analiz(symbol):
+        try:
+            return hisse_analizi(symbol, periyot, frames.get(symbol.upper()),
+                                 temel_veri if temel else None), None
+        except Exception as e:
+            return None, str(e)
+
+    analizler, hatalar = [], []
+    with ThreadPoolExecutor(max_workers=isci) as havuz:
+        for symbol, (sonuc, hata) in zip(symbols, havuz.map(analiz, symbols)):
+            if sonuc is not None:
+                analizler.append(sonuc)
+            else:
+                hatalar.append((symbol, hata))
+    return analizler, hatalar
+
+
+def yaz(analizler, bicim, f):
+    if bicim == 'json':
+        json.dump(analizler, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    elif bicim == 'csv':
+        satirlar = [rapor_satiri(a) for a in analizler]
+        sutunlar = list(dict.fromkeys(k for satir in satirlar for k in satir))
+        writer = csv.DictWriter(f, fieldnames=sutunlar)
+        writer.writeheader()
+        writer.writerows(satirlar)
+    else:
+        for analiz in analizler:
+            f.write(rapor_metni(analiz))
+            f.write('\n\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BIST hisseleri için toplu analiz raporu")
+    parser.add_argument('symbols', nargs='*', help="Hisse kodları (ör. THYAO GARAN)")
+    parser.add_argument('--file', help="Her satırda bir hisse kodu olan dosya")
+    parser.add_argument('--period', default="3mo", choices=list(PERIYOTLAR), help="Veri periyodu (varsayılan: 3mo)")
+    parser.add_argument('--watchlist', help="Sembolleri bu izleme listesinden al")
+    parser.add_argument('--format', default='text', choices=['text', 'json', 'csv', 'html', 'pdf'],
+                        help="Çıktı biçimi; html ve pdf grafikli rapor paketi yazar ve --output gerektirir")
+    parser.add_argument('--output', help="Çıktı dosyası (varsayılan: standart çıktı)")
+    parser.add_argument('--workers', type=int, default=4, help="Eşzamanlı analiz (html/pdf için süreç) sayısı")
+    parser.add_argument('--no-fundamentals', action='store_true', help="Temel verileri alma")
+    parser.add_argument('--source', help="Veri kaynağı: yfinance, kayit ya da kayit:<dizin> "
+                                         "(varsayılan: BORSA_VERI_KAYNAGI ya da yfinance)")
+    args = parser.parse_args(argv)
+
+    symbols = [s.upper() for s in args.symbols]
+    if args.file:
+        symbols += sembolleri_oku(args.file)
+    if args.watchlist:
+        from watchlist import IzlemeListeleri
+        try:
+            symbols += IzlemeListeleri().semboller(args.watchlist)
+        except ValueError as e:
+            parser.error(str(e))
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        parser.error("En az bir hisse kodu, --file ya da --watchlist gerekli")
+    if args.format in ('html', 'pdf') and not args.output:
+        parser.error(f"{args.format} biçimi için --output gerekli")
+
+    bar_store = temel_veri = None
+    if args.source:
+        try:
+            saglayici = Birlestirici(kaynaktan(args.source))
+        except ValueError as e:
+            parser.error(str(e))
+        bar_store = BarStore(saglayici=saglayici)
+        if not args.no_fundamentals:
+            temel_veri = TemelVeriOnbellegi(saglayici=saglayici)
+
+    if args.format in ('html', 'pdf'):
+        from report_export import rapor_paketi
+        yol = args.output if args.output.lower().endswith(f'.{args.format}') else f"{args.output}.{args.format}"
+        if not args.no_fundamentals and temel_veri is None:
+            temel_veri = TemelVeriOnbellegi()
+        _, hatalar = rapor_paketi(symbols, args.period, yol, bar_store or BarStore(),
+                                  None if args.no_fundamentals else temel_veri,
+                                  isci=max(1, args.workers))
+        for symbol, hata in hatalar:
+            print(f"{symbol}: {hata}", file=sys.stderr)
+        return 1 if hatalar else 0
+
+    analizler, hatalar = toplu_analiz(symbols, args.period, max(1, args.workers),
+                                      temel=not args.no_fundamentals,
+                                      bar_store=bar_store, temel_veri=temel_veri)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            yaz(analizler, args.format, f)
+    else:
+        yaz(analizler, args.format, sys.stdout)
+
+    for symbol, hata in hatalar:
+        print(f"{symbol}: {hata}", file=sys.stderr)
+    return 1 if hatalar else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,669 @@
+import tkinter as tk
+from collections import OrderedDict
+
+import math
+
+import numpy as np
+import matplotlib.dates as mdates
+from matplotlib import style
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import FuncFormatter
+
+from diagnostics import span, tanilama
+
+# Çizgi grafik penceresinin varsayılan boyutu ve veri yokken kabul edilen çizim genişliği (piksel)
+PENCERE_BOYUTU = "1200x900"
+VARSAYILAN_PIKSEL = 1200
+
+# Fiyat/MACD ekseni figürün ~%70'ini, RSI/hacim ekseni ~%25'ini kaplar (width_ratios 3:1)
+ANA_EKSEN_ORANI = 0.7
+YAN_EKSEN_ORANI = 0.25
+
+FIYAT_SERILERI = ['Close', 'EMA_20', 'SMA_50', 'EMA_200']
+
+# Mum grafiği: mum başına en az piksel, hareketli ortalama pencereleri ve renkler
+MUM_BOYUTU = "1100x850"
+MUM_PIKSEL = 4
+ORTALAMALAR = {20: '#ff9f43', 50: '#5f27cd', 200: '#ff6b6b'}
+YUKSELIS_RENGI = '#2ecc71'
+DUSUS_RENGI = '#e74c3c'
+HACIM_RENGI = '#3498db'
+
+
+def _kova_indeksleri(y, kova, secim):
+    """y'yi `kova` eşit parçaya bölüp her parçadan `secim` ile seçilen elemanın indeksini döndürür."""
+    n = len(y)
+    boy = -(-n // kova)
+    kova = -(-n // boy)
+    dolgu = np.full(boy * kova - n, np.nan)
+    parcalar = np.concatenate([y, dolgu]).reshape(kova, boy)
+    gecerli = ~np.isnan(parcalar)
+    if secim == 'min':
+        secilen = np.argmin(np.where(gecerli, parcalar, np.inf), axis=1)
+    elif secim == 'max':
+        secilen = np.argmax(np.where(gecerli, parcalar, -np.inf), axis=1)
+    else:
+        secilen = np.argmax(np.where(gecerli, np.abs(parcalar), -np.inf), axis=1)
+    return np.arange(kova) * boy + secilen
+
+
+def min_max_azalt(x, y, kova):
+    """Seriyi kova başına en küçük ve en büyük noktayı koruyarak en fazla 2*kova noktaya indirir.
+
+    Tepe ve dipler kaybolmadığı için çizim, tüm noktalarla çizilenden piksel düzeyinde ayırt edilemez.
+    """
+    if len(y) <= 2 * kova:
+        return x, y
+    idx = np.sort(np.stack([_kova_indeksleri(y, kova, 'min'), _kova_indeksleri(y, kova, 'max')], axis=1), axis=1)
+    idx = idx.ravel()
+    return x[idx], y[idx]
+
+
+def tepe_azalt(x, y, kova):
+    """Çubuk benzeri seriler için kova başına mutlak değeri en büyük noktayı tutar."""
+    if len(y) <= kova:
+        return x, y
+    idx = _kova_indeksleri(y, kova, 'mutlak')
+    return x[idx], y[idx]
+
+
+def cizgi_verisi(df, hisse_kodu, periyot, piksel=VARSAYILAN_PIKSEL):
+    """teknik_analiz çıktısını çizgi grafiğin istediği, piksel genişliğine indirgenmiş dizilere çevirir.
+
+    Arayüzden bağımsızdır; arka plan iş parçacığında ya da süreç havuzunda çalışabilir.
+    """
+    index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    x = mdates.date2num(index.to_pydatetime())
+    ana = max(50, int(piksel * ANA_EKSEN_ORANI))
+    yan = max(50, int(piksel * YAN_EKSEN_ORANI))
+
+    def seri(sutun, kova=ana):
+        return min_max_azalt(x, df[sutun].to_numpy(dtype=float), kova)
+
+    upper = df['BB_upper'].to_numpy(dtype=float)
+    lower = df['BB_lower'].to_numpy(dtype=float)
+    if len(x) > 2 * ana:
+        ust_idx = _kova_indeksleri(upper, ana, 'max')
+        alt_idx = _kova_indeksleri(lower, ana, 'min')
+        bant = (x[np.minimum(ust_idx, alt_idx)], upper[ust_idx], lower[alt_idx])
+    else:
+        bant = (x, upper, lower)
+
+    hist = (df['MACD'] - df['MACD_signal']).to_numpy(dtype=float)
+    return {
+        'symbol': hisse_kodu,
+        'baslik': f'{hisse_kodu} Fiyat Grafiği ({periyot})',
+        'pencere_basligi': f"{hisse_kodu} Teknik Grafik - {periyot}",
+        'xlim': (x[0], x[-1]) if x[0] < x[-1] else (x[0] - 1, x[-1] + 1),
+        'fiyat': {sutun: seri(sutun) for sutun in FIYAT_SERILERI},
+        'bant': bant,
+        'rsi': seri('RSI', yan),
+        'macd': seri('MACD'),
+        'macd_signal': seri('MACD_signal'),
+        'histogram': tepe_azalt(x, hist, ana),
+        'hacim': tepe_azalt(x, df['Volume'].to_numpy(dtype=float) / 1000000, yan),
+        'nokta': len(x),
+    }
+
+
+def _sinirlar(*seriler, pay=0.05):
+    degerler = np.concatenate([np.asarray(s, dtype=float) for s in seriler])
+    degerler = degerler[np.isfinite(degerler)]
+    if not len(degerler):
+        return 0.0, 1.0
+    alt, ust = float(degerler.min()), float(degerler.max())
+    bosluk = (ust - alt) * pay or abs(ust) * pay or 1.0
+    return alt - bosluk, ust + bosluk
+
+
+class CizgiGrafik:
+    """Fiyat, RSI, MACD ve hacim eksenlerini bir kez kurar; yeni veriyi mevcut çizgilere yazar.
+
+    Her güncellemede yeni figür ya da eksen oluşturulmaz. Çizgiler ve koleksiyonlar
+    `animated` işaretlidir; arka plan değişmediyse yalnızca bunlar yeniden çizilir (blit).
+    """
+
+    def __init__(self, fig, arka_plan=None, animasyonlu=True):
+        self.fig = fig
+        with style.context('ggplot'):
+            gs = fig.add_gridspec(2, 2, height_ratios=[2, 1], width_ratios=[3, 1])
+            ax1 = fig.add_subplot(gs[0, 0])
+            ax2 = fig.add_subplot(gs[0, 1])
+            ax3 = fig.add_subplot(gs[1, 0], sharex=ax1)
+            ax4 = fig.add_subplot(gs[1, 1], sharex=ax2)
+        if arka_plan:
+            fig.patch.set_facecolor(arka_plan)
+        self.eksenler = (ax1, ax2, ax3, ax4)
+
+        # Fiyat grafiği (ax1)
+        self.fiyat = {
+            'Close': ax1.plot([], [], label='Kapanış', color='#2e86de', linewidth=2)[0],
+            'EMA_20': ax1.plot([], [], label='EMA 20', linestyle='--', color='#ff9f43')[0],
+            'SMA_50': ax1.plot([], [], label='SMA 50', linestyle=':', color='#5f27cd')[0],
+            'EMA_200': ax1.plot([], [], label='EMA 200', linestyle='-.', color='#ff6b6b')[0],
+        }
+        self.bant = None
+        ax1.set_ylabel('Fiyat (TL)', fontsize=10)
+        ax1.legend(loc='upper left', fontsize=9)
+
+        # RSI grafiği (ax2)
+        self.rsi = ax2.plot([], [], label='RSI 14', color='#10ac84', linewidth=2)[0]
+        ax2.axhline(70, color='#ff6b6b', linestyle='--', linewidth=1)
+        ax2.axhline(30, color='#1dd1a1', linestyle='--', linewidth=1)
+        ax2.set_title('RSI (14)', fontsize=12, pad=15)
+        ax2.set_ylabel('RSI', fontsize=10)
+        ax2.set_ylim(0, 100)
+        ax2.legend(loc='upper left', fontsize=9)
+
+        # MACD grafiği (ax3); histogram çubuk yerine tek bir dikey çizgi koleksiyonu
+        self.macd = ax3.plot([], [], label='MACD', color='#9c88ff', linewidth=1.5)[0]
+        self.macd_signal = ax3.plot([], [], label='Sinyal', color='#f368e0', linewidth=1.5)[0]
+        self.histogram = ax3.vlines([], [], [], label='Histogram', alpha=0.5, linewidth=2)
+        ax3.set_title('MACD (12,26,9)', fontsize=12, pad=15)
+        ax3.legend(loc='upper left', fontsize=9)
+
+        # Hacim grafiği (ax4)
+        self.hacim = ax4.vlines([], [], [], color='#3498db', alpha=0.7, linewidth=2)
+        ax4.set_title('Hacim (Milyon)', fontsize=12, pad=15)
+        ax4.set_ylabel('Hacim (M)')
+
+        for ax in self.eksenler:
+            ax.xaxis_date()
+            ax.grid(True, linestyle='--', alpha=0.7)
+        # ax3 ve ax4 x eksenini (ve tik ayarlarını) ax1 ve ax2 ile paylaşır
+        for ax, en_fazla in ((ax1, 10), (ax2, 5)):
+            locator = mdates.AutoDateLocator(minticks=2, maxticks=en_fazla)
+            ax.xaxis.set_major_locator(locator)
+            ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+
+        self.cizgiler = [*self.fiyat.values(), self.rsi, self.macd, self.macd_signal,
+                         self.histogram, self.hacim]
+        # Dosyaya kaydedilecek (arayüzsüz) figürlerde blit kullanılmaz
+        self.animasyonlu = animasyonlu
+        for artist in self.cizgiler:
+            artist.set_animated(animasyonlu)
+        self._gorunum = None
+
+    @property
+    def hareketli(self):
+        """Her blit'te yeniden çizilen sanatçılar."""
+        return self.cizgiler + ([self.bant] if self.bant is not None else [])
+
+    def uygula(self, veri):
+        """Veriyi çizgilere yazar. Eksen sınırları ya da başlık değiştiyse True döner (tam çizim gerekir)."""
+        ax1, ax2, ax3, ax4 = self.eksenler
+        for sutun, cizgi in self.fiyat.items():
+            cizgi.set_data(*veri['fiyat'][sutun])
+
+        if self.bant is not None:
+            self.bant.remove()
+        self.bant = ax1.fill_between(*veri['bant'], color='#c8d6e5', alpha=0.3, animated=self.animasyonlu)
+
+        self.rsi.set_data(*veri['rsi'])
+        self.macd.set_data(*veri['macd'])
+        self.macd_signal.set_data(*veri['macd_signal'])
+
+        hx, hy = veri['histogram']
+        self.histogram.set_segments(np.stack([np.stack([hx, np.zeros_like(hy)], axis=1),
+                                              np.stack([hx, np.nan_to_num(hy)], axis=1)], axis=1))
+        self.histogram.set_color(np.where(hy > 0, '#2ecc71', '#e74c3c'))
+
+        vx, vy = veri['hacim']
+        self.hacim.set_segments(np.stack([np.stack([vx, np.zeros_like(vy)], axis=1),
+                                          np.stack([vx, np.nan_to_num(vy)], axis=1)], axis=1))
+
+        fiyat_y = [y for _, y in veri['fiyat'].values()] + list(veri['bant'][1:])
+        gorunum = (
+            veri['baslik'],
+            veri['xlim'],
+            _sinirlar(*fiyat_y),
+            _sinirlar(veri['macd'][1], veri['macd_signal'][1], veri['histogram'][1]),
+            (0.0, _sinirlar(veri['hacim'][1])[1]),
+        )
+        if gorunum == self._gorunum:
+            return False
+
+        baslik, xlim, fiyat_lim, macd_lim, hacim_lim = gorunum
+        ax1.set_title(baslik, fontsize=14, pad=15)
+        ax1.set_xlim(xlim)
+        ax2.set_xlim(xlim)
+        ax1.set_ylim(fiyat_lim)
+        ax3.set_ylim(macd_lim)
+        ax4.set_ylim(hacim_lim)
+        if self._gorunum is None:
+            self.fig.tight_layout()
+        self._gorunum = gorunum
+        return True
+
+
+def mum_verisi(df, hisse_kodu, periyot):
+    """OHLCV verisini mum grafiğinin dizilerine çevirir; ortalamalar tam çözünürlükte hesaplanır."""
+    index = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    close = df['Close']
+    tarih = index.to_numpy(dtype='datetime64[s]')
+    adimlar = np.diff(tarih).astype(np.int64)
+    return {
+        'symbol': hisse_kodu,
+        'baslik': f'{hisse_kodu} Mum Grafiği ({periyot})',
+        'pencere_basligi': f"{hisse_kodu} Mum Grafiği - {periyot}",
+        'tarih': tarih,
+        'gun_ici': bool(len(adimlar) and adimlar.min() < 86400),
+        'acilis': df['Open'].to_numpy(dtype=float),
+        'yuksek': df['High'].to_numpy(dtype=float),
+        'dusuk': df['Low'].to_numpy(dtype=float),
+        'kapanis': close.to_numpy(dtype=float),
+        'hacim': df['Volume'].to_numpy(dtype=float),
+        'ortalamalar': {p: close.rolling(p).mean().to_numpy() for p in ORTALAMALAR},
+    }
+
+
+def kova_boyu(bar_sayisi, piksel, mum_piksel=MUM_PIKSEL):
+    """Görünen barları piksele sığdırmak için mum başına bar sayısı (1, 2, 5, 10, 20, 50 ...).
+
+    Basamaklı değerler yakınlaştırma sırasında her harekette değil, yalnızca
+    seviye değiştiğinde yeniden gruplama yapılmasını sağlar.
+    """
+    gereken = bar_sayisi * mum_piksel / max(piksel, 1)
+    if gereken <= 1:
+        return 1
+    us = 10 ** math.floor(math.log10(gereken))
+    for carpan in (1, 2, 5, 10):
+        if carpan * us >= gereken:
+            return carpan * us
+    return 10 * us
+
+
+def ohlc_topla(acilis, yuksek, dusuk, kapanis, hacim, kova, bas=0, bit=None):
+    """[bas, bit) aralığındaki barları `kova`'lık gruplarda tek muma indirger.
+
+    Gruplar indeks 0'a hizalıdır; kaydırma sırasında grup sınırları değişmez.
+    (başlangıç indeksleri, bar sayıları, o, h, l, c, v) döndürür.
+    """
+    n = len(kapanis)
+    bit = n if bit is None else min(bit, n)
+    baslar = np.arange((bas // kova) * kova, bit, kova)
+    if not len(baslar):
+        bos = np.empty(0)
+        return baslar, baslar, bos, bos, bos, bos, bos
+    bitisler = np.minimum(baslar + kova, n)
+    if kova == 1:
+        dilim = slice(baslar[0], bitisler[-1])
+        return (baslar, bitisler - baslar, acilis[dilim], yuksek[dilim], dusuk[dilim],
+                kapanis[dilim], hacim[dilim])
+    son = bitisler[-1]
+    yerel = baslar - baslar[0]
+    parca = slice(baslar[0], son)
+    return (baslar, bitisler - baslar,
+            acilis[baslar],
+            np.maximum.reduceat(yuksek[parca], yerel),
+            np.minimum.reduceat(dusuk[parca], yerel),
+            kapanis[bitisler - 1],
+            np.add.reduceat(np.nan_to_num(hacim[parca]), yerel))
+
+
+class MumGrafik:
+    """Çözünürlüğü görünüme göre ayarlanan mum grafiği.
+
+    Görünen bar sayısı piksel genişliğini aştığında barlar daha kaba mumlara
+    (ör. günlükten haftalığa) gruplanır; yakınlaştırma ve kaydırmada yeniden gruplanır.
+    Mumlar ve hacim birer koleksiyondur, bar başına ayrı yama oluşturulmaz.
+    """
+
+    def __init__(self, fig, arka_plan=None):
+        self.fig = fig
+        with style.context('ggplot'):
+            gs = fig.add_gridspec(2, 1, height_ratios=[3, 1], hspace=0.05)
+            self.ax = fig.add_subplot(gs[0])
+            self.ax_hacim = fig.add_subplot(gs[1], sharex=self.ax)
+        if arka_plan:
+            fig.patch.set_facecolor(arka_plan)
+
+        self.fitiller = LineCollection([], linewidths=1.0)
+        self.govdeler = PolyCollection([], linewidths=0.5)
+        self.hacim = PolyCollection([], facecolors=HACIM_RENGI, edgecolors=HACIM_RENGI, alpha=0.7)
+        self.ax.add_collection(self.fitiller)
+        self.ax.add_collection(self.govdeler)
+        self.ax_hacim.add_collection(self.hacim)
+        self.ortalamalar = {p: self.ax.plot([], [], color=renk, linewidth=1.2, label=f'MA {p}')[0]
+                            for p, renk in ORTALAMALAR.items()}
+
+        self.ax.set_ylabel('Fiyat (TL)')
+        self.ax.legend(loc='upper left', fontsize=9)
+        self.ax.grid(True, linestyle='--', color='#dddddd')
+        self.ax.tick_params(labelbottom=False)
+        self.ax_hacim.set_ylabel('Hacim')
+        self.ax_hacim.grid(True, linestyle='--', color='#dddddd')
+        self.ax_hacim.xaxis.set_major_formatter(FuncFormatter(self._tarih_etiketi))
+        fig.subplots_adjust(left=0.08, right=0.97, top=0.94, bottom=0.07)
+
+        self.veri = None
+        self.kova = 1
+        self._cizilen = None
+        # Yeniden gruplamadan sonra tuvalin çizilmesi için pencere tarafından atanır
+        self.yeniden_ciz = None
+        self.ax.callbacks.connect('xlim_changed', self._gorunum_degisti)
+
+    def uygula(self, veri):
+        self.veri = veri
+        self._cizilen = None
+        n = len(veri['kapanis'])
+        self.ax.set_xlim(-0.5, n - 0.5)
+        self.yenile()
+
+    def _gorunum_degisti(self, ax):
+        if self.yenile() and self.yeniden_ciz is not None:
+            self.yeniden_ciz()
+
+    def _tarih_etiketi(self, konum, _):
+        if self.veri is None:
+            return ''
+        i = int(round(konum))
+        if not 0 <= i < len(self.veri['tarih']):
+            return ''
+        tarih = self.veri['tarih'][i].astype('datetime64[s]').item()
+        return tarih.strftime('%d.%m %H:%M' if self.veri['gun_ici'] else '%d.%m.%Y')
+
+    def yenile(self):
+        """Görünen aralığı uygun çözünürlükte yeniden çizer; bir şey değiştiyse True döner."""
+        if self.veri is None:
+            return False
+        v = self.veri
+        n = len(v['kapanis'])
+        x0, x1 = self.ax.get_xlim()
+        bas = max(0, int(math.floor(x0)))
+        bit = min(n, int(math.ceil(x1)) + 1)
+        if bit <= bas:
+            return False
+        piksel = self.ax.get_window_extent().width
+        kova = kova_boyu(bit - bas, piksel)
+        anahtar = (kova, bas // kova, -(-bit // kova), round(piksel))
+        if anahtar == self._cizilen:
+            return False
+        self._cizilen = anahtar
+        self.kova = kova
+
+        baslar, sayilar, o, h, l, c, hacim = ohlc_topla(
+            v['acilis'], v['yuksek'], v['dusuk'], v['kapanis'], v['hacim'], kova, bas, bit)
+        x = baslar + (sayilar - 1) / 2
+        yari = sayilar * 0.4
+        alt, ust = np.minimum(o, c), np.maximum(o, c)
+        sol, sag = x - yari, x + yari
+
+        self.fitiller.set_segments(np.stack([np.stack([x, l], axis=1), np.stack([x, h], axis=1)], axis=1))
+        self.govdeler.set_verts(np.stack([np.stack([sol, alt], axis=1), np.stack([sol, ust], axis=1),
+                                          np.stack([sag, ust], axis=1), np.stack([sag, alt], axis=1)], axis=1))
+        renkler = np.where(c >= o, YUKSELIS_RENGI, DUSUS_RENGI)
+        self.fitiller.set_color(renkler)
+        self.govdeler.set_facecolor(renkler)
+        self.govdeler.set_edgecolor(renkler)
+        sifir = np.zeros_like(hacim)
+        self.hacim.set_verts(np.stack([np.stack([sol, sifir], axis=1), np.stack([sol, hacim], axis=1),
+                                       np.stack([sag, hacim], axis=1), np.stack([sag, sifir], axis=1)], axis=1))
+
+        # Ortalamalar tam çözünürlükte hesaplanmıştır; yalnızca çizim için piksele indirgenir
+        gorunen = np.arange(bas, bit)
+        for p, cizgi in self.ortalamalar.items():
+            cizgi.set_data(*min_max_azalt(gorunen, v['ortalamalar'][p][bas:bit], max(50, int(piksel))))
+
+        self.ax.set_ylim(*_sinirlar(l, h))
+        self.ax_hacim.set_ylim(0, _sinirlar(hacim)[1])
+        baslik = v['baslik'] if kova == 1 else f"{v['baslik']} - mum başına {kova} bar"
+        self.ax.set_title(baslik)
+        return True
+
+
+def ozsermaye_verisi(gecmis, piksel=VARSAYILAN_PIKSEL):
+    """PortfoyGecmisi.sonuc tablosunu getiri grafiğinin istediği, piksel genişliğine indirgenmiş dizilere çevirir."""
+    index = gecmis.index.tz_localize(None) if gecmis.index.tz is not None else gecmis.index
+    x = mdates.date2num(index.to_pydatetime())
+    kova = max(50, int(piksel * 0.9))
+    son = gecmis.iloc[-1]
+    return {
+        'symbol': 'PORTFÖY',
+        'baslik': (f"Portföy Değeri ({index[0]:%d.%m.%Y} - {index[-1]:%d.%m.%Y})   "
+                   f"Değer {son['deger']:,.2f} TL   K/Z {son['kz']:+,.2f} TL   "
+                   f"Gerçekleşen {son['gerceklesen']:+,.2f} TL   "
+                   f"Getiri %{son['birikimli_getiri'] * 100:+.2f}"),
+        'pencere_basligi': "Portföy Getiri Grafiği",
+        'xlim': (x[0], x[-1]) if x[0] < x[-1] else (x[0] - 1, x[-1] + 1),
+        'deger': min_max_azalt(x, gecmis['deger'].to_numpy(dtype=float), kova),
+        'maliyet': min_max_azalt(x, gecmis['maliyet'].to_numpy(dtype=float), kova),
+    }
+
+
+class OzsermayeGrafik:
+    """Portföy değeri ve net maliyet eğrileri; aradaki alan K/Z'ye göre renklenir."""
+
+    def __init__(self, fig, arka_plan=None):
+        self.fig = fig
+        with style.context('ggplot'):
+            self.ax = fig.add_subplot(1, 1, 1)
+        if arka_plan:
+            fig.patch.set_facecolor(arka_plan)
+        self.deger = self.ax.plot([], [], label='Değer', color='#2e86de', linewidth=2)[0]
+        self.maliyet = self.ax.plot([], [], label='Maliyet', color='#576574', linestyle='--', linewidth=1.2)[0]
+        self.alan = []
+        self.ax.set_ylabel('TL')
+        self.ax.legend(loc='upper left', fontsize=9)
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.ax.xaxis_date()
+        locator = mdates.AutoDateLocator(minticks=2, maxticks=10)
+        self.ax.xaxis.set_major_locator(locator)
+        self.ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        self.ax.yaxis.set_major_formatter(FuncFormatter(lambda y, _: f"{y:,.0f}"))
+        fig.subplots_adjust(left=0.09, right=0.97, top=0.93, bottom=0.08)
+
+    def uygula(self, veri):
+        self.deger.set_data(*veri['deger'])
+        self.maliyet.set_data(*veri['maliyet'])
+        for alan in self.alan:
+            alan.remove()
+        # Değer ve maliyet aynı x noktalarında olmayabilir; alan maliyetin değer noktalarına enterpolasyonuyla çizilir
+        x, y = veri['deger']
+        m = np.interp(x, *veri['maliyet'])
+        self.alan = [
+            self.ax.fill_between(x, y, m, where=y >= m, color=YUKSELIS_RENGI, alpha=0.15, interpolate=True),
+            self.ax.fill_between(x, y, m, where=y < m, color=DUSUS_RENGI, alpha=0.15, interpolate=True),
+        ]
+        self.ax.set_title(veri['baslik'], fontsize=12, pad=12)
+        self.ax.set_xlim(veri['xlim'])
+        self.ax.set_ylim(_sinirlar(veri['deger'][1], veri['maliyet'][1]))
+
+
+def korelasyon_verisi(semboller, matris, baslik):
+    """Korelasyon matrisini ısı haritası verisine çevirir.
+
+    Benzer hisseler yan yana gelsin diye semboller matrisin en büyük özvektörüne göre sıralanır.
+    """
+    matris = np.asarray(matris, dtype=float)
+    sira = np.arange(len(semboller))
+    if len(semboller) > 2:
+        _, vektorler = np.linalg.eigh(np.nan_to_num(matris))
+        sira = np.argsort(vektorler[:, -1], kind='stable')
+    return {
+        'symbol': 'KORELASYON',
+        'baslik': baslik,
+        'pencere_basligi': "Korelasyon Isı Haritası",
+        'semboller': [semboller[i] for i in sira],
+        'matris': matris[np.ix_(sira, sira)],
+    }
+
+
+class KorelasyonGrafik:
+    """Korelasyon ısı haritası; imleç altındaki hisse çifti ve değeri araç çubuğunda gösterilir."""
+
+    # Bu sayıdan fazla hissede eksen etiketleri okunamayacağı için gizlenir
+    ETIKET_SINIRI = 60
+
+    def __init__(self, fig, arka_plan=None):
+        self.fig = fig
+        self.ax = fig.add_subplot(1, 1, 1)
+        if arka_plan:
+            fig.patch.set_facecolor(arka_plan)
+        self.resim = self.ax.imshow(np.zeros((1, 1)), cmap='RdBu_r', vmin=-1, vmax=1, interpolation='nearest')
+        fig.colorbar(self.resim, ax=self.ax, fraction=0.046, pad=0.04)
+        self.semboller = []
+        self.matris = np.zeros((0, 0))
+        self.ax.format_coord = self._koordinat
+        fig.subplots_adjust(left=0.08, right=0.9, top=0.93, bottom=0.1)
+
+    def _koordinat(self, x, y):
+        i, j = int(round(y)), int(round(x))
+        if 0 <= i < len(self.semboller) and 0 <= j < len(self.semboller):
+            return f"{self.semboller[i]} - {self.semboller[j]}: {self.matris[i, j]:+.2f}"
+        return ""
+
+    def uygula(self, veri):
+        self.semboller = veri['semboller']
+        self.matris = veri['matris']
+        n = len(self.semboller)
+        self.resim.set_data(np.ma.masked_invalid(self.matris))
+        self.resim.set_extent((-0.5, n - 0.5, n - 0.5, -0.5))
+        if n <= self.ETIKET_SINIRI:
+            self.ax.set_xticks(range(n), self.semboller, rotation=90, fontsize=8)
+            self.ax.set_yticks(range(n), self.semboller, fontsize=8)
+        else:
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+        self.ax.set_title(veri['baslik'], fontsize=12, pad=12)
+
+
+def _tam_ciz(canvas):
+    # Tanılama açıkken çizim süresi ölçülebilsin diye eşzamanlı çizilir; kapalıyken Tk boşta kalınca çizer
+    if tanilama.etkin:
+        canvas.draw()
+    else:
+        canvas.draw_idle()
+
+
+class GrafikPenceresi:
+    """Tek bir grafiğin Toplevel penceresi; alt sınıflar yalnızca grafik sınıfını ve boyutları belirler.
+
+    Pencere, figür ve tuval ilk gösterimde bir kez kurulur; sonraki veriler aynı
+    grafiğe `uygula` ile yazılır. Kapatma isteği yöneticiye iletilir.
+    """
+    boyut = MUM_BOYUTU
+    figur_boyutu = (11, 8.5)
+    grafik_sinifi = None
+    arac_cubugu = True
+
+    def __init__(self, yonetici, symbol):
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+        self.pencere = tk.Toplevel(yonetici.root)
+        self.pencere.geometry(self.boyut)
+        self.fig = Figure(figsize=self.figur_boyutu)
+        self.grafik = self.grafik_sinifi(self.fig, yonetici.arka_plan)
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.pencere)
+        if self.arac_cubugu:
+            NavigationToolbar2Tk(self.canvas, self.pencere).pack(side=tk.BOTTOM, fill=tk.X)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.pencere.protocol("WM_DELETE_WINDOW", lambda: yonetici.kapat(symbol))
+
+    def guncelle(self, veri):
+        self.pencere.title(veri['pencere_basligi'])
+        with span('matplotlib'):
+            self.grafik.uygula(veri)
+            _tam_ciz(self.canvas)
+
+    def genislik(self):
+        return self.canvas.get_tk_widget().winfo_width()
+
+
+class CizgiPenceresi(GrafikPenceresi):
+    boyut = PENCERE_BOYUTU
+    figur_boyutu = (12, 9)
+    grafik_sinifi = CizgiGrafik
+    arac_cubugu = False
+
+    def __init__(self, yonetici, symbol):
+        super().__init__(yonetici, symbol)
+        self._arka = None
+        self.canvas.mpl_connect('draw_event', self._cizildi)
+
+    def _cizildi(self, event):
+        # Tam çizimden sonra (yeniden boyutlandırma dahil) arka planı sakla ve hareketlileri üstüne çiz
+        self._arka = self.canvas.copy_from_bbox(self.fig.bbox)
+        for artist in self.grafik.hareketli:
+            self.fig.draw_artist(artist)
+
+    def guncelle(self, veri):
+        self.pencere.title(veri['pencere_basligi'])
+        with span('matplotlib'):
+            if self.grafik.uygula(veri) or self._arka is None:
+                _tam_ciz(self.canvas)
+                return
+            self.canvas.restore_region(self._arka)
+            for artist in self.grafik.hareketli:
+                self.fig.draw_artist(artist)
+            self.canvas.blit(self.fig.bbox)
+
+
+class MumPenceresi(GrafikPenceresi):
+    grafik_sinifi = MumGrafik
+
+    def __init__(self, yonetici, symbol):
+        super().__init__(yonetici, symbol)
+        # Yakınlaştırma/kaydırma ya da yeniden boyutlandırmada mumlar yeniden gruplanır
+        self.grafik.yeniden_ciz = self.canvas.draw_idle
+        self.canvas.mpl_connect('resize_event', lambda event: self.grafik.yenile())
+
+
+class OzsermayePenceresi(GrafikPenceresi):
+    figur_boyutu = (11, 7)
+    grafik_sinifi = OzsermayeGrafik
+
+
+class KorelasyonPenceresi(GrafikPenceresi):
+    boyut = "900x850"
+    figur_boyutu = (9, 8.5)
+    grafik_sinifi = KorelasyonGrafik
+
+
+class GrafikYoneticisi:
+    """Grafik pencerelerini sembol başına bir pencere ve bir figürle sınırlar.
+
+    Aynı sembol için yeni istek açık pencereyi günceller. En fazla `max_pencere` pencere
+    açık tutulur; sınır aşılınca en uzun süredir kullanılmayan kapatılır.
+    `pencere_sinifi` çizgi (varsayılan), mum, portföy getiri ya da korelasyon penceresidir.
+    """
+
+    def __init__(self, root, arka_plan=None, max_pencere=6, pencere_sinifi=None):
+        self.root = root
+        self.arka_plan = arka_plan
+        self.max_pencere = max_pencere
+        self.pencere_sinifi = pencere_sinifi or CizgiPenceresi
+        self._pencereler = OrderedDict()
+
+    def __len__(self):
+        return len(self._pencereler)
+
+    def piksel_genisligi(self, symbol):
+        """Sembolün açık penceresinin çizim genişliği; pencere yoksa varsayılan."""
+        pencere = self._pencereler.get(symbol)
+        if pencere is not None and pencere.genislik() > 1:
+            return pencere.genislik()
+        return VARSAYILAN_PIKSEL
+
+    def goster(self, veri):
+        symbol = veri['symbol']
+        pencere = self._pencereler.get(symbol)
+        if pencere is None:
+            pencere = self._pencereler[symbol] = self.pencere_sinifi(self, symbol)
+            while len(self._pencereler) > self.max_pencere:
+                self.kapat(next(iter(self._pencereler)))
+        else:
+            self._pencereler.move_to_end(symbol)
+            pencere.pencere.deiconify()
+            pencere.pencere.lift()
+        pencere.guncelle(veri)
+
+    def kapat(self, symbol):
+        pencere = self._pencereler.pop(symbol, None)
+        if pencere is not None:
+            pencere.pencere.destroy()
+
+    def kapat_hepsi(self):
+        for symbol in list(self._pencereler):
+            self.kapat(symbol)
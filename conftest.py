@@ -0,0 +1 @@
+"""pytest kökü: testler depo kökündeki modülleri doğrudan içe aktarır."""
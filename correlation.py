@@ -0,0 +1,204 @@
+"""Hisse evreni genelinde günlük getiri korelasyonu ve kovaryansı.
+
+Günlük log getiriler (sembol x gün) matrisine hizalanır; bir sembolün işlem
+görmediği günler NaN kalır ve her çift yalnızca ikisinin de getirisi olan günlerle
+(çift bazında maske) hesaplanır. Ağırlıklı toplamlar günler bloklar halinde
+işlenerek birikir; bellekte sembol x sembol toplam matrisleri ve tek bir gün
+bloğu bulunur, sembol x sembol x gün boyutlu bir ara dizi oluşmaz. Yeni günler
+geldiğinde toplamlar üstel ağırlıkla sönümlenip yalnızca yeni günler eklenir.
+"""
+import numpy as np
+
+from portfolio_history import kapanis_matrisi
+
+# Bir blokta işlenen gün sayısı ve korelasyonun hesaplanması için gereken en az ortak gün
+GUN_BLOGU = 128
+EN_AZ_GUN = 20
+
+# Yarı ömür seçenekleri (gün); None eşit ağırlıktır
+YARI_OMURLER = {"Eşit ağırlık": None, "60 gün": 60, "120 gün": 120, "250 gün": 250}
+
+
+def getiri_matrisi(frames, semboller):
+    """{sembol: OHLCV} sözlüğünden (günler, sembol x gün log getiri matrisi) döndürür.
+
+    Kapanışı olmayan günler doldurulmaz; o günün ve sonraki günün getirisi NaN olur.
+    """
+    kapanis = kapanis_matrisi(frames, semboller)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        getiri = np.log(kapanis.where(kapanis > 0)).diff().iloc[1:]
+    return getiri.index, np.ascontiguousarray(getiri.to_numpy(dtype=float).T)
+
+
+def agirlikli_toplamlar(getiriler, lam=1.0, blok=GUN_BLOGU):
+    """Çift bazında maskeli ağırlıklı toplamlar.
+
+    Son günün ağırlığı 1, ondan k gün öncekinin lam**k'dır. Döndürülen sözlükte
+    (i, j) elemanları yalnızca i ve j'nin birlikte gözlendiği günleri kapsar:
+    w (ağırlık), x (i'nin getirisi), xx (i'nin karesi), xy (çarpım) ve n (gün sayısı).
+    """
+    n_sembol, n_gun = getiriler.shape
+    toplam = {ad: np.zeros((n_sembol, n_sembol)) for ad in ('w', 'x', 'xx', 'xy')}
+    toplam['n'] = np.zeros((n_sembol, n_sembol), dtype=np.int64)
+    for bas in range(0, n_gun, blok):
+        parca = getiriler[:, bas:bas + blok]
+        uzunluk = parca.shape[1]
+        maske = ~np.isnan(parca)
+        x = np.where(maske, parca, 0.0)
+        m = maske.astype(float)
+        # Blok içindeki ağırlıklar bloğun son gününe göre; önceki birikim blok boyunca sönümlenir
+        agirlik = lam ** np.arange(uzunluk - 1, -1, -1, dtype=float)
+        sonum = lam ** uzunluk
+        mw, xw = m * agirlik, x * agirlik
+        for ad in ('w', 'x', 'xx', 'xy'):
+            toplam[ad] *= sonum
+        toplam['w'] += mw @ m.T
+        toplam['x'] += xw @ m.T
+        toplam['xx'] += (xw * x) @ m.T
+        toplam['xy'] += xw @ x.T
+        toplam['n'] += np.rint(m @ m.T).astype(np.int64)
+    return toplam
+
+
+def topla(a, b, lam_b):
+    """`a` birikimine ondan sonraki `lam_b` kadar sönümle (lam ** gün sayısı) `b` bloğunu ekler."""
+    return {ad: (a[ad] * lam_b + b[ad]) if ad != 'n' else a[ad] + b[ad] for ad in a}
+
+
+def korelasyon_ve_kovaryans(toplam, en_az=EN_AZ_GUN):
+    """Toplamlardan (korelasyon, kovaryans) float32 matrisleri; ortak günü az olan çiftler NaN."""
+    w = toplam['w']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ort = toplam['x'] / w
+        kov = toplam['xy'] / w - ort * ort.T
+        var = toplam['xx'] / w - ort * ort
+        kor = kov / np.sqrt(var * var.T)
+    gecersiz = (toplam['n'] < en_az) | ~np.isfinite(kor)
+    kor = np.clip(kor, -1.0, 1.0)
+    kor[gecersiz] = np.nan
+    kov[toplam['n'] < en_az] = np.nan
+    kosegen = np.diag_indices_from(kor)
+    kor[kosegen] = np.where(toplam['n'][kosegen] >= en_az, 1.0, np.nan)
+    return kor.astype(np.float32), kov.astype(np.float32)
+
+
+def panel_getiri_matrisi(panel, semboller, periyot=None):
+    """getiri_matrisi'nin fiyat panelinden okuyan karşılığı; paneli olmayan semboller NaN satırdır.
+
+    Kapanışlar DataFrame'e dönüşmeden doğrudan panel satırlarından alınır.
+    """
+    secili, tarihler, matrisler = panel.alt_matrisler(semboller, ('Close',), periyot)
+    kapanis = np.full((len(semboller), len(tarihler)), np.nan)
+    satir = {symbol: i for i, symbol in enumerate(semboller)}
+    kapanis[[satir[s] for s in secili]] = matrisler['Close']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        getiri = np.diff(np.log(np.where(kapanis > 0, kapanis, np.nan)), axis=1)
+    return tarihler[1:].tz_localize(None).normalize(), getiri
+
+
+class KorelasyonMotoru:
+    """Hisse evreninin korelasyon/kovaryans matrisini önbellekte tutar ve artımlı günceller.
+
+    Son gün (henüz kapanmamış olabilir) birikime katılmaz, her güncellemede
+    birikimin bir kopyasına eklenir. Sembol listesi ya da yarı ömür değişirse
+    matris baştan kurulur. `panel` (FiyatPaneli) verilirse kapanışlar panelden okunur.
+    """
+
+    def __init__(self, bar_store, periyot="2y", yari_omur=None, en_az=EN_AZ_GUN, panel=None):
+        self.bar_store = bar_store
+        self.panel = panel
+        self.periyot = periyot
+        self.yari_omur = yari_omur
+        self.en_az = en_az
+        self.sifirla()
+
+    @property
+    def lam(self):
+        return 0.5 ** (1 / self.yari_omur) if self.yari_omur else 1.0
+
+    def sifirla(self):
+        self.semboller = []
+        self.son_gun = None
+        self.korelasyon = np.empty((0, 0), dtype=np.float32)
+        self.kovaryans = np.empty((0, 0), dtype=np.float32)
+        self.adet = np.empty((0, 0), dtype=np.int64)
+        self._birikim = None
+        self._indeks = {}
+
+    def ayarla(self, periyot=None, yari_omur=None):
+        """Periyodu ya da yarı ömrü değiştirir; değiştiyse önbellek sıfırlanır."""
+        if (periyot or self.periyot, yari_omur) != (self.periyot, self.yari_omur):
+            self.periyot = periyot or self.periyot
+            self.yari_omur = yari_omur
+            self.sifirla()
+
+    def guncelle(self, semboller, is_=None):
+        """Barları toplu okur ve matrisi günceller; yeni gün yoksa önbellek aynen kalır."""
+        semboller = sorted({s.upper() for s in semboller})
+        if semboller != self.semboller:
+            self.sifirla()
+
+        if is_ is not None:
+            is_.bildir(0.1, f"{len(semboller)} hissenin fiyat geçmişi okunuyor")
+        if self.panel is not None:
+            self.panel.guncelle(self.bar_store, semboller, self.periyot)
+        else:
+            frames = self.bar_store.get_many(semboller, self.periyot)
+        if is_ is not None:
+            is_.kontrol()
+            is_.bildir(0.6, "Korelasyon hesaplanıyor")
+
+        if self.panel is not None:
+            gunler, getiriler = panel_getiri_matrisi(self.panel, semboller, self.periyot)
+        else:
+            gunler, getiriler = getiri_matrisi(frames, semboller)
+        if not len(gunler):
+            self.sifirla()
+            return self
+
+        # Birikim son günden önceki günleri kapsar
+        kesin = len(gunler) - 1
+        bas = 0 if self.son_gun is None else int(gunler.searchsorted(self.son_gun, side='right'))
+        if self._birikim is None or bas < kesin:
+            yeni = agirlikli_toplamlar(getiriler[:, bas:kesin], self.lam)
+            self._birikim = yeni if self._birikim is None else topla(self._birikim, yeni, self.lam ** (kesin - bas))
+            self.son_gun = gunler[kesin - 1] if kesin else None
+
+        son = agirlikli_toplamlar(getiriler[:, kesin:], self.lam)
+        toplam = topla(self._birikim, son, self.lam)
+        self.korelasyon, self.kovaryans = korelasyon_ve_kovaryans(toplam, self.en_az)
+        self.adet = toplam['n']
+        self.semboller = semboller
+        self._indeks = {symbol: i for i, symbol in enumerate(semboller)}
+        return self
+
+    def alt_matris(self, semboller):
+        """Verilen sembollerin (hesaplananlar arasında olanların) korelasyon alt matrisi."""
+        secili = [s for s in semboller if s in self._indeks]
+        idx = [self._indeks[s] for s in secili]
+        return secili, self.korelasyon[np.ix_(idx, idx)]
+
+    def en_benzer(self, symbol, adet=10, ters=False):
+        """`symbol` ile en yüksek (ters=True ise en düşük) korelasyonlu hisseler.
+
+        (sembol, korelasyon, ortak gün) listesi döndürür.
+        """
+        i = self._indeks.get(symbol.upper())
+        if i is None:
+            return []
+        satir = self.korelasyon[i].astype(float)
+        satir[i] = np.nan
+        gecerli = np.flatnonzero(~np.isnan(satir))
+        if not len(gecerli):
+            return []
+        sira = gecerli[np.argsort(satir[gecerli] if ters else -satir[gecerli], kind='stable')][:adet]
+        return [(self.semboller[j], float(satir[j]), int(self.adet[i, j])) for j in sira]
+
+    def ortalama_korelasyon(self, semboller):
+        """Sembollerin kendi aralarındaki çift korelasyonlarının ortalaması."""
+        _, kor = self.alt_matris(semboller)
+        if len(kor) < 2:
+            return float('nan')
+        ust = kor[np.triu_indices(len(kor), k=1)]
+        ust = ust[~np.isnan(ust)]
+        return float(ust.mean()) if len(ust) else float('nan')
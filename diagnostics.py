@@ -0,0 +1,161 @@
+"""Sıcak yollar için hafif zaman ölçümü ve sayaçlar.
+
+Ölçüm kapalıyken `span()` paylaşılan boş bir bağlam yöneticisi, `say()` tek bir
+bayrak kontrolü yapar; açılış ya da analiz süresine fark edilir bir yük eklemez.
+`BORSA_TANILAMA=1` ortam değişkeniyle ya da Tanılama penceresinden açılır.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import defaultdict, deque
+
+# Aşama adları; Tanılama penceresinde bu sırayla gösterilir
+ASAMALAR = ['yfinance', 'teknik_analiz', 'temel_analiz', 'sqlite', 'matplotlib']
+
+
+class _BosSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_BOS_SPAN = _BosSpan()
+
+
+class _Span:
+    __slots__ = ('_tanilama', '_ad', '_bas')
+
+    def __init__(self, tanilama, ad):
+        self._tanilama = tanilama
+        self._ad = ad
+
+    def __enter__(self):
+        self._bas = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._tanilama.kaydet(self._ad, time.perf_counter() - self._bas)
+        return False
+
+
+class Tanilama:
+    """Aşama sürelerini (aşama başına son `kapasite` ölçüm) ve sayaçları tutar."""
+
+    def __init__(self, etkin=False, kapasite=2000, kayit_kapasitesi=20000):
+        self.etkin = etkin
+        self._sureler = defaultdict(lambda: deque(maxlen=kapasite))
+        self._toplamlar = defaultdict(float)
+        self._adetler = defaultdict(int)
+        self._sayaclar = defaultdict(int)
+        # JSON-lines dışa aktarımı için olay günlüğü
+        self._olaylar = deque(maxlen=kayit_kapasitesi)
+        self._kilit = threading.Lock()
+
+    def span(self, ad):
+        """`with tanilama.span('sqlite'):` bloğunun süresini ölçer."""
+        if not self.etkin:
+            return _BOS_SPAN
+        return _Span(self, ad)
+
+    def kaydet(self, ad, saniye):
+        with self._kilit:
+            self._sureler[ad].append(saniye)
+            self._toplamlar[ad] += saniye
+            self._adetler[ad] += 1
+            self._olaylar.append({'t': time.time(), 'tur': 'span', 'ad': ad, 'ms': saniye * 1000,
+                                  'thread': threading.current_thread().name})
+
+    def say(self, ad, miktar=1):
+        if not self.etkin:
+            return
+        with self._kilit:
+            self._sayaclar[ad] += miktar
+            self._olaylar.append({'t': time.time(), 'tur': 'sayac', 'ad': ad, 'miktar': miktar})
+
+    def ozet(self):
+        """({aşama: {adet, p50, p90, p99, en_cok, toplam} (ms)}, {sayaç: değer}) döndürür."""
+        with self._kilit:
+            sureler = {ad: sorted(d) for ad, d in self._sureler.items()}
+            toplamlar = dict(self._toplamlar)
+            adetler = dict(self._adetler)
+            sayaclar = dict(self._sayaclar)
+
+        asamalar = {}
+        for ad, sirali in sureler.items():
+            if not sirali:
+                continue
+            asamalar[ad] = {
+                'adet': adetler[ad],
+                'p50': _yuzdelik(sirali, 0.50) * 1000,
+                'p90': _yuzdelik(sirali, 0.90) * 1000,
+                'p99': _yuzdelik(sirali, 0.99) * 1000,
+                'en_cok': sirali[-1] * 1000,
+                'toplam': toplamlar[ad] * 1000,
+            }
+        return asamalar, sayaclar
+
+    def sifirla(self):
+        with self._kilit:
+            self._sureler.clear()
+            self._toplamlar.clear()
+            self._adetler.clear()
+            self._sayaclar.clear()
+            self._olaylar.clear()
+
+    def jsonl_yaz(self, path):
+        """Olay günlüğünü ve güncel özeti JSON-lines olarak yazar; yazılan satır sayısını döndürür."""
+        with self._kilit:
+            olaylar = list(self._olaylar)
+        asamalar, sayaclar = self.ozet()
+        with open(path, 'w', encoding='utf-8') as f:
+            for olay in olaylar:
+                f.write(json.dumps(olay, ensure_ascii=False) + '\n')
+            f.write(json.dumps({'t': time.time(), 'tur': 'ozet', 'asamalar': asamalar,
+                                'sayaclar': sayaclar}, ensure_ascii=False) + '\n')
+        return len(olaylar) + 1
+
+    def ag_cagrisi(self, veri):
+        """Bir ağ çağrısını ve dönen verinin yaklaşık boyutunu (bayt) sayar.
+
+        yfinance HTTP trafiğini dışarı vermediği için boyut, dönen DataFrame'in
+        bellek boyutu ya da sözlüğün JSON uzunluğu olarak yaklaşık hesaplanır.
+        """
+        if not self.etkin:
+            return
+        boyut = 0
+        if hasattr(veri, 'memory_usage'):
+            boyut = int(veri.memory_usage(index=True).sum())
+        elif veri is not None:
+            boyut = len(json.dumps(veri, default=str))
+        self.say('ag_cagrisi')
+        self.say('ag_bayt', boyut)
+
+
+def _yuzdelik(sirali, oran):
+    return sirali[min(len(sirali) - 1, int(oran * len(sirali)))]
+
+
+def profille(fn, *args, satir=40, **kwargs):
+    """fn'i cProfile altında çalıştırır; (sonuç, kümülatif süreye göre rapor metni) döndürür.
+
+    Yalnızca çağıran iş parçacığı profillenir.
+    """
+    profil = cProfile.Profile()
+    try:
+        sonuc = profil.runcall(fn, *args, **kwargs)
+    finally:
+        cikti = io.StringIO()
+        pstats.Stats(profil, stream=cikti).sort_stats('cumulative').print_stats(satir)
+    return sonuc, cikti.getvalue()
+
+
+tanilama = Tanilama(etkin=os.environ.get('BORSA_TANILAMA') == '1')
+span = tanilama.span
+say = tanilama.say
+ag_cagrisi = tanilama.ag_cagrisi
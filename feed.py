@@ -0,0 +1,205 @@
+import queue
+import threading
+
+import numpy as np
+import pandas as pd
+
+from indicators import GOSTERGE_SUTUNLARI
+from streaming import ArtimliGostergeler
+
+BAR_ALANLARI = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Bir BIST seansı 1 dakikalık aralıkta ~510 bar; önceki günün bir kısmıyla birlikte sığar
+VARSAYILAN_KAPASITE = 1024
+
+# Aralığa göre yoklama sıklığı (saniye)
+YOKLAMA_ARALIKLARI = {"1m": 60, "5m": 120, "15m": 300, "1h": 600, "1d": 900}
+
+# Gün sınırları İstanbul saatine (UTC+3) göre belirlenir
+UTC_FARKI = 3 * 3600
+
+
+class HalkaTampon:
+    """Sabit kapasiteli, sütun başına NumPy dizisi tutan halka tampon.
+
+    Her değer hem `i` hem `i + kapasite` konumuna yazılır; böylece son `n` kayıt
+    her zaman bitişik bir dilimdir ve `son(alan)` kopyalamadan görünüm döndürür.
+    Bellek kullanımı eklenen kayıt sayısından bağımsızdır.
+    """
+
+    def __init__(self, kapasite, alanlar):
+        self.kapasite = kapasite
+        self.ts = np.zeros(2 * kapasite, dtype=np.int64)
+        self._veri = {alan: np.full(2 * kapasite, np.nan) for alan in alanlar}
+        self._bas = 0
+        self.uzunluk = 0
+
+    def __len__(self):
+        return self.uzunluk
+
+    @property
+    def son_ts(self):
+        if not self.uzunluk:
+            return None
+        return int(self.ts[self._bas + self.uzunluk - 1])
+
+    def ekle(self, ts, degerler):
+        """Yeni kaydı sona ekler; `ts` son kayıtla aynıysa son kaydın üzerine yazar."""
+        if self.uzunluk and ts == self.son_ts:
+            konum = (self._bas + self.uzunluk - 1) % self.kapasite
+        elif self.uzunluk < self.kapasite:
+            konum = (self._bas + self.uzunluk) % self.kapasite
+            self.uzunluk += 1
+        else:
+            konum = self._bas
+            self._bas = (self._bas + 1) % self.kapasite
+
+        for k in (konum, konum + self.kapasite):
+            self.ts[k] = ts
+            for alan, deger in degerler.items():
+                self._veri[alan][k] = deger
+
+    def son(self, alan, n=None):
+        """Alanın en eski kayıttan en yeniye bitişik görünümü (son `n` kayıt)."""
+        n = self.uzunluk if n is None else min(n, self.uzunluk)
+        bit = self._bas + self.uzunluk
+        dizi = self.ts if alan == 'ts' else self._veri[alan]
+        return dizi[bit - n:bit]
+
+
+class SembolAkisi:
+    """Bir sembolün bar tamponu ve göstergeleri.
+
+    Göstergeler kapanmış son bara kadar artımlı tutulur; henüz kapanmamış son bar
+    her turda bu durumun bir kopyası üzerinden yeniden hesaplanır.
+    """
+
+    def __init__(self, kapasite=VARSAYILAN_KAPASITE):
+        self.tampon = HalkaTampon(kapasite, BAR_ALANLARI + GOSTERGE_SUTUNLARI)
+        self._kapali = ArtimliGostergeler()
+        self._kapali_ts = None
+        self.son = None
+
+    def isle(self, barlar):
+        """Yeni (ve güncellenen son) barları işler; değişen bar sayısını döndürür."""
+        if barlar.empty:
+            return 0
+        ts = ((barlar.index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy()
+        ohlcv = barlar[BAR_ALANLARI].to_numpy(dtype=float)
+
+        son_i = len(ohlcv) - 1
+        degisen = 0
+        for i in range(son_i + 1):
+            if self._kapali_ts is not None and ts[i] <= self._kapali_ts:
+                continue
+            if self._ayni(int(ts[i]), ohlcv[i]):
+                # Yeniden okunan son bar değişmemiş; yalnızca ardından bar geldiyse kapatılır
+                if i == son_i:
+                    continue
+            else:
+                degisen += 1
+            if i < son_i:
+                # Kendinden sonra bar gelmiş olan bar kapanmıştır; kalıcı duruma işlenir
+                gostergeler = self._kapali.guncelle(ohlcv[i, 1], ohlcv[i, 2], ohlcv[i, 3], ohlcv[i, 4])
+                self._kapali_ts = int(ts[i])
+            else:
+                gecici = ArtimliGostergeler.durumdan(self._kapali.durum())
+                gostergeler = gecici.guncelle(ohlcv[i, 1], ohlcv[i, 2], ohlcv[i, 3], ohlcv[i, 4])
+            degerler = dict(zip(BAR_ALANLARI, ohlcv[i]))
+            degerler.update(gostergeler)
+            self.tampon.ekle(int(ts[i]), degerler)
+
+        if not degisen:
+            return 0
+        self.son = {alan: float(self.tampon.son(alan, 1)[0]) for alan in BAR_ALANLARI + GOSTERGE_SUTUNLARI}
+        self.son['ts'] = self.tampon.son_ts
+        self.son['degisim'] = self._gunluk_degisim()
+        return degisen
+
+    def _ayni(self, ts, ohlcv):
+        """Bar tampondaki son barla aynı zamanlı ve aynı değerli mi."""
+        if ts != self.tampon.son_ts:
+            return False
+        saklanan = [self.tampon.son(alan, 1)[0] for alan in BAR_ALANLARI]
+        return np.array_equal(ohlcv, saklanan, equal_nan=True)
+
+    def _gunluk_degisim(self):
+        """Son fiyatın tampondaki önceki günün son kapanışına göre yüzde değişimi."""
+        gunler = (self.tampon.son('ts') + UTC_FARKI) // 86400
+        onceki = np.flatnonzero(gunler < gunler[-1])
+        if not len(onceki):
+            return float('nan')
+        kapanis = self.tampon.son('Close')
+        return float((kapanis[-1] / kapanis[onceki[-1]] - 1) * 100)
+
+
+class CanliAkis:
+    """İzlenen sembollerin yeni barlarını arka planda periyodik olarak toplu çeker.
+
+    Her turda tüm semboller tek bir toplu istekle tamamlanır ve yalnızca son
+    işlenen bardan sonraki barlar okunup tamponlara eklenir. Değişen semboller
+    `sonuclar` kuyruğuna (sembol, son değerler) olarak konur; Tk tarafı kuyruğu
+    `after` ile boşaltır.
+    """
+
+    def __init__(self, bar_store, interval="1m", aralik=None, kapasite=VARSAYILAN_KAPASITE):
+        self.bar_store = bar_store
+        self.interval = interval
+        self.aralik = aralik or YOKLAMA_ARALIKLARI.get(interval, 60)
+        self.kapasite = kapasite
+        self.sonuclar = queue.Queue()
+        self._akislar = {}
+        self._kilit = threading.Lock()
+        self._durdur = threading.Event()
+        self._uyandir = threading.Event()
+        self._thread = threading.Thread(target=self._calis, daemon=True)
+        self._thread.start()
+
+    def izle(self, symbols):
+        with self._kilit:
+            for symbol in symbols:
+                self._akislar.setdefault(symbol.upper(), SembolAkisi(self.kapasite))
+        self._uyandir.set()
+
+    def birak(self, symbol):
+        with self._kilit:
+            self._akislar.pop(symbol.upper(), None)
+
+    def akis(self, symbol):
+        with self._kilit:
+            return self._akislar.get(symbol.upper())
+
+    def durdur(self):
+        self._durdur.set()
+        self._uyandir.set()
+
+    def _calis(self):
+        while not self._durdur.is_set():
+            try:
+                self.tur()
+            except Exception as e:
+                print(f"Canlı akış hatası: {e}")
+            self._uyandir.wait(self.aralik)
+            self._uyandir.clear()
+
+    def tur(self):
+        """Bir yoklama turu; güncellenen sembol sayısını döndürür."""
+        with self._kilit:
+            akislar = dict(self._akislar)
+        if not akislar:
+            return 0
+
+        # Kapanmamış son bar güncellenmiş olabileceği için son bar da yeniden okunur
+        sonra = {symbol: pd.Timestamp(akis.tampon.son_ts - 1, unit='s', tz='UTC')
+                 for symbol, akis in akislar.items() if akis.tampon.son_ts is not None}
+        frames = self.bar_store.yeni_barlar(list(akislar), self.interval, sonra)
+
+        guncellenen = 0
+        for symbol, akis in akislar.items():
+            if self._durdur.is_set():
+                break
+            barlar = frames.get(symbol)
+            if barlar is not None and akis.isle(barlar):
+                self.sonuclar.put((symbol, dict(akis.son)))
+                guncellenen += 1
+        return guncellenen
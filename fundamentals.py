@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from diagnostics import say
+from providers import saglayici as varsayilan_saglayici
+
+# `info` sözlüğünden raporda kullanılan alanlar; geri kalanı saklanmaz
+TEMEL_ALANLAR = [
+    'marketCap', 'forwardPE', 'enterpriseToEbitda', 'dividendYield',
+    'profitMargins', 'fiftyTwoWeekHigh', 'fiftyTwoWeekLow',
+]
+
+
+class TemelVeriOnbellegi:
+    """Sağlayıcıdan gelen `info` sonuçlarını bellekte (LRU) ve diskte süreli olarak saklar.
+
+    Süresi dolmamış kayıt varsa ağa çıkılmaz. İndirme başarısız olursa eski kayıt
+    varsa o döndürülür.
+    """
+
+    def __init__(self, db_path=None, ttl=6 * 3600, max_kayit=256, saglayici=None):
+        self.saglayici = saglayici or varsayilan_saglayici()
+        self.conn = sqlite3.connect(db_path or self.saglayici.onbellek_yolu('market_data.db'),
+                                    check_same_thread=False)
+        self.ttl = ttl
+        self.max_kayit = max_kayit
+        self._bellek = OrderedDict()
+        self._kilit = threading.RLock()
+        self.create_tables()
+
+    def create_tables(self):
+        with self._kilit:
+            self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS fundamentals (
+                symbol TEXT PRIMARY KEY,
+                info TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )''')
+            self.conn.commit()
+
+    def get(self, symbol, zorla=False):
+        """(info, fetched_at) döndürür; veri alınamazsa (None, None)."""
+        symbol = symbol.upper()
+        kayit = self._bellekten(symbol) or self._diskten(symbol)
+        if kayit is not None and not zorla and time.time() - kayit[1] < self.ttl:
+            say('temel_onbellek_isabet')
+            return kayit
+        say('temel_onbellek_kacirma')
+
+        try:
+            info = self.saglayici.temel(symbol)
+        except Exception as e:
+            print(f"Temel veri alınamadı ({symbol}): {e}")
+            return kayit if kayit is not None else (None, None)
+
+        kayit = ({alan: info[alan] for alan in TEMEL_ALANLAR if alan in info}, time.time())
+        self._kaydet(symbol, kayit)
+        return kayit
+
+    def onceden_getir(self, symbols, isci=4):
+        """Sembollerin temel verilerini arka planda önbelleğe alır."""
+        def calistir():
+            with ThreadPoolExecutor(max_workers=isci) as havuz:
+                list(havuz.map(self.get, symbols))
+
+        thread = threading.Thread(target=calistir, daemon=True)
+        thread.start()
+        return thread
+
+    def _bellekten(self, symbol):
+        with self._kilit:
+            kayit = self._bellek.get(symbol)
+            if kayit is not None:
+                self._bellek.move_to_end(symbol)
+            return kayit
+
+    def _diskten(self, symbol):
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT info, fetched_at FROM fundamentals WHERE symbol=?', (symbol,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            kayit = (json.loads(row[0]), row[1])
+            self._bellege_ekle(symbol, kayit)
+            return kayit
+
+    def _kaydet(self, symbol, kayit):
+        with self._kilit:
+            self._bellege_ekle(symbol, kayit)
+            self.conn.execute('''
+            INSERT OR REPLACE INTO fundamentals (symbol, info, fetched_at)
+            VALUES (?, ?, ?)
+            ''', (symbol, json.dumps(kayit[0]), kayit[1]))
+            self.conn.commit()
+
+    def _bellege_ekle(self, symbol, kayit):
+        self._bellek[symbol] = kayit
+        self._bellek.move_to_end(symbol)
+        while len(self._bellek) > self.max_kayit:
+            self._bellek.popitem(last=False)
+
+
+def veri_yasi_metni(fetched_at, simdi=None):
+    """Verinin ne kadar önce alındığını okunur biçimde döndürür."""
+    saniye = max(0, (simdi or time.time()) - fetched_at)
+    if saniye < 60:
+        return "az önce"
+    if saniye < 3600:
+        return f"{saniye // 60:.0f} dk önce"
+    if saniye < 86400:
+        return f"{saniye // 3600:.0f} sa önce"
+    return f"{saniye // 86400:.0f} gün önce"
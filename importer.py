@@ -0,0 +1,248 @@
+import csv
+import hashlib
+import math
+import os
+import re
+import unicodedata
+from datetime import datetime
+
+# Aracı kurum dosyalarında karşılaşılan sütun adları.
+# Karşılaştırmalar _sadelestir ile Türkçe karakterlerden arındırılmış küçük harflerle yapılır
+SUTUN_ADLARI = {
+    'symbol': ['hisse', 'hisse kodu', 'sembol', 'symbol', 'menkul', 'kod', 'ticker'],
+    'operation': ['islem', 'islem tipi', 'al/sat', 'yon', 'operation', 'side', 'type'],
+    'price': ['fiyat', 'islem fiyati', 'gerceklesen fiyat', 'price'],
+    'quantity': ['adet', 'miktar', 'lot', 'gerceklesen adet', 'quantity', 'qty'],
+    'date': ['tarih', 'islem tarihi', 'zaman', 'date', 'datetime'],
+    'ref': ['referans', 'referans no', 'islem no', 'emir no', 'ref', 'id', 'trade id'],
+}
+
+ISLEM_KARSILIKLARI = {
+    'al': 'BUY', 'alis': 'BUY', 'a': 'BUY', 'buy': 'BUY', 'b': 'BUY',
+    'sat': 'SELL', 'satis': 'SELL', 's': 'SELL', 'sell': 'SELL',
+}
+
+TARIH_BICIMLERI = [
+    '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d',
+    '%d.%m.%Y %H:%M:%S', '%d.%m.%Y %H:%M', '%d.%m.%Y',
+    '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y',
+]
+
+ZORUNLU_SUTUNLAR = ['symbol', 'operation', 'price', 'quantity', 'date']
+
+
+class IceAktarmaRaporu:
+    def __init__(self):
+        self.okunan = 0
+        self.eklenen = 0
+        self.hatalar = []
+
+    @property
+    def gecerli(self):
+        return self.okunan - len(self.hatalar)
+
+    @property
+    def tekrar(self):
+        """Daha önce içe aktarıldığı için atlanan satırlar."""
+        return self.gecerli - self.eklenen
+
+    def ozet(self):
+        return (f"Okunan satır: {self.okunan}\n"
+                f"Eklenen işlem: {self.eklenen}\n"
+                f"Zaten kayıtlı (atlanan): {self.tekrar}\n"
+                f"Hatalı satır: {len(self.hatalar)}")
+
+
+def ice_aktar(portfolio, path):
+    """CSV/XLSX dosyasındaki işlemleri doğrulayıp tek bir SQLite işleminde portföye ekler."""
+    rapor = IceAktarmaRaporu()
+    satirlar = satirlari_oku(path)
+    basliklar = next(satirlar, None)
+    if basliklar is None:
+        raise ValueError("Dosya boş")
+    sutunlar = sutunlari_esle(basliklar[1])
+
+    def gecerli_satirlar():
+        tekrar_sayaci = {}
+        for satir_no, degerler in satirlar:
+            if not any(str(v).strip() for v in degerler if v is not None):
+                continue
+            rapor.okunan += 1
+            try:
+                kayit = satiri_dogrula(degerler, sutunlar)
+            except ValueError as e:
+                rapor.hatalar.append((satir_no, str(e)))
+                continue
+            yield kayit + (dogal_anahtar(kayit, degerler, sutunlar, tekrar_sayaci),)
+
+    rapor.eklenen = portfolio.import_transactions(gecerli_satirlar())
+    return rapor
+
+
+def satirlari_oku(path):
+    """(satır no, değer listesi) üretir; ilk satır başlıktır."""
+    uzanti = os.path.splitext(path)[1].lower()
+    if uzanti in ('.xlsx', '.xlsm'):
+        return _xlsx_oku(path)
+    return _csv_oku(path)
+
+
+def _csv_oku(path):
+    for encoding in ('utf-8-sig', 'cp1254'):
+        try:
+            with open(path, newline='', encoding=encoding) as f:
+                f.read(1 << 16)
+            break
+        except UnicodeDecodeError:
+            continue
+
+    with open(path, newline='', encoding=encoding) as f:
+        ornek = f.read(1 << 14)
+        f.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(ornek, delimiters=';,\t')
+        except csv.Error:
+            dialect = csv.excel
+        for satir_no, degerler in enumerate(csv.reader(f, dialect), start=1):
+            yield satir_no, degerler
+
+
+def _xlsx_oku(path):
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError("XLSX dosyaları için openpyxl paketi gerekli (pip install openpyxl)")
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        for satir_no, degerler in enumerate(wb.active.iter_rows(values_only=True), start=1):
+            yield satir_no, list(degerler)
+    finally:
+        wb.close()
+
+
+def sutunlari_esle(basliklar):
+    """Alan adı -> sütun indeksi eşlemesini döndürür."""
+    sutunlar = {}
+    normal = [_sadelestir(b) for b in basliklar]
+    for alan, adlar in SUTUN_ADLARI.items():
+        for i, baslik in enumerate(normal):
+            if baslik in adlar:
+                sutunlar[alan] = i
+                break
+
+    eksik = [alan for alan in ZORUNLU_SUTUNLAR if alan not in sutunlar]
+    if eksik:
+        raise ValueError(f"Dosyada bulunamayan sütunlar: {', '.join(eksik)}")
+    return sutunlar
+
+
+def satiri_dogrula(degerler, sutunlar):
+    """Satırı (symbol, operation, price, quantity, date) demetine çevirir, hatalıysa ValueError."""
+    def al(alan):
+        i = sutunlar[alan]
+        return degerler[i] if i < len(degerler) else None
+
+    symbol = str(al('symbol') or '').strip().upper()
+    if symbol.endswith('.IS'):
+        symbol = symbol[:-3]
+    if not symbol:
+        raise ValueError("Hisse kodu boş")
+
+    operation = ISLEM_KARSILIKLARI.get(_sadelestir(al('operation')))
+    if operation is None:
+        raise ValueError(f"Geçersiz işlem tipi: {al('operation')!r}")
+
+    price = _sayi(al('price'), 'Fiyat')
+    if price <= 0:
+        raise ValueError(f"Fiyat pozitif olmalı: {al('price')!r}")
+
+    quantity = _sayi(al('quantity'), 'Adet')
+    if quantity <= 0 or quantity != int(quantity):
+        raise ValueError(f"Adet pozitif tam sayı olmalı: {al('quantity')!r}")
+
+    return symbol, operation, price, int(quantity), _tarih(al('date'))
+
+
+def dogal_anahtar(kayit, degerler, sutunlar, tekrar_sayaci):
+    """Aynı dosya tekrar içe aktarıldığında aynı çıkan anahtar.
+
+    Dosyada işlem numarası varsa o kullanılır. Yoksa satırın içeriği ile dosyadaki
+    kaçıncı özdeş satır olduğu birlikte özetlenir; böylece aynı fiyat ve adetle
+    gerçekleşmiş gerçek tekrar işlemler de korunur.
+    """
+    if 'ref' in sutunlar and sutunlar['ref'] < len(degerler):
+        ref = str(degerler[sutunlar['ref']] or '').strip()
+        if ref:
+            return f"ref:{ref}"
+
+    tekrar_sayaci[kayit] = sira = tekrar_sayaci.get(kayit, 0) + 1
+    ozet = hashlib.sha1(repr((kayit, sira)).encode('utf-8')).hexdigest()
+    return f"satir:{ozet}"
+
+
+def _sadelestir(deger):
+    """'İşlem Tipi' -> 'islem tipi'"""
+    metin = unicodedata.normalize('NFKD', str(deger or '').strip())
+    metin = ''.join(c for c in metin if not unicodedata.combining(c))
+    return metin.replace('ı', 'i').replace('I', 'i').lower()
+
+
+def _sayi(deger, alan):
+    if isinstance(deger, (int, float)):
+        sayi = float(deger)
+    else:
+        sayi = _metin_sayi(deger, alan)
+    # "inf"/"nan" float() ile okunur ama fiyat ya da adet olamaz
+    if not math.isfinite(sayi):
+        raise ValueError(f"{alan} sayı değil: {deger!r}")
+    return sayi
+
+
+def _metin_sayi(deger, alan):
+    """'1.234,56' (Türkçe) ve '1,234.56' (İngilizce) biçimlerini okur; belirsiz yazımda ValueError.
+
+    İki ayırıcı birlikte geçiyorsa sondaki ondalık ayırıcıdır ve ardından 1-2 hane
+    gelmelidir. Tek tür ayırıcı 3 haneli gruplar oluşturuyorsa binlik sayılır
+    ('1.000' = 1000), aksi halde ondalıktır ('12,5' = 12.5).
+    """
+    metin = str(deger or '').strip().replace(' ', '').replace('TL', '')
+    isaret = metin[:1] if metin[:1] in ('+', '-') else ''
+    govde = metin[len(isaret):]
+    ayiricilar = {c for c in govde if c in '.,'}
+    if len(ayiricilar) == 2:
+        ondalik = govde[max(govde.rfind('.'), govde.rfind(','))]
+        binlik = '.' if ondalik == ',' else ','
+        tam, _, kesir = govde.rpartition(ondalik)
+        if not (re.fullmatch(r'\d{1,2}', kesir) and _binlik_gruplari(tam, binlik)):
+            raise ValueError(f"{alan} sayı biçimi anlaşılamadı: {deger!r}")
+        govde = f"{tam.replace(binlik, '')}.{kesir}"
+    elif ayiricilar:
+        ayirici = ayiricilar.pop()
+        if _binlik_gruplari(govde, ayirici):
+            govde = govde.replace(ayirici, '')
+        elif govde.count(ayirici) == 1:
+            govde = govde.replace(ayirici, '.')
+        else:
+            raise ValueError(f"{alan} sayı biçimi anlaşılamadı: {deger!r}")
+    try:
+        return float(isaret + govde)
+    except ValueError:
+        raise ValueError(f"{alan} sayı değil: {deger!r}")
+
+
+def _binlik_gruplari(metin, ayirici):
+    # '1.234.567' gibi: baştaki grup 1-3 hane (0 ile başlamaz), sonrakiler tam 3 hane
+    return re.fullmatch(rf'[1-9]\d{{0,2}}(?:{re.escape(ayirici)}\d{{3}})+', metin) is not None
+
+
+def _tarih(deger):
+    if isinstance(deger, datetime):
+        return deger.strftime('%Y-%m-%d %H:%M:%S')
+    metin = str(deger or '').strip()
+    for bicim in TARIH_BICIMLERI:
+        try:
+            return datetime.strptime(metin, bicim).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+    raise ValueError(f"Tarih anlaşılamadı: {deger!r}")
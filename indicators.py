@@ -0,0 +1,166 @@
+import numpy as np
+
+# teknik_analiz'in ürettiği gösterge sütunları
+GOSTERGE_SUTUNLARI = [
+    'RSI', 'Stoch_%K', 'MACD', 'MACD_signal', 'EMA_20', 'SMA_50', 'EMA_200',
+    'BB_upper', 'BB_middle', 'BB_lower', 'OBV',
+]
+
+# Blok içindeki b**-j çarpanının üst sınırı (e**20 ~ 5e8); hassasiyet kaybını sınırlar
+_BLOK_USSU = 20.0
+
+
+def gostergeleri_hesapla(close, high, low, volume):
+    """`ta` kütüphanesiyle aynı gösterge sütunlarını NumPy ile hesaplar.
+
+    Girdiler 1-B (bar) ya da 2-B (sembol x bar) dizilerdir ve çıktılar aynı şekilde
+    döner. Satır başındaki NaN'lar henüz işlem görmemiş sembol olarak yorumlanır;
+    aradaki boşluklar fiyatta bir önceki değerle, hacimde sıfırla doldurulur.
+    """
+    close = _hazirla(close)
+    tek = close.ndim == 1
+    if tek:
+        close = close[None, :]
+    high = _ileri_doldur(_hazirla(high).reshape(close.shape))
+    low = _ileri_doldur(_hazirla(low).reshape(close.shape))
+    volume = np.nan_to_num(_hazirla(volume).reshape(close.shape))
+    close = _ileri_doldur(close)
+
+    gecerli = ~np.isnan(close)
+    sayac = np.cumsum(gecerli, axis=-1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Momentum göstergeleri
+        onceki = np.empty_like(close)
+        onceki[:, 0] = np.nan
+        onceki[:, 1:] = close[:, :-1]
+        fark = close - onceki
+        up = np.where(fark > 0, fark, 0.0)
+        down = np.where(fark < 0, -fark, 0.0)
+        up[~gecerli] = np.nan
+        down[~gecerli] = np.nan
+        emaup = _ewm(up, 1 / 14, 14)
+        emadn = _ewm(down, 1 / 14, 14)
+        rsi = np.where(emadn == 0, 100.0, 100 - (100 / (1 + emaup / emadn)))
+
+        smin = _kayan(low, 14, np.min)
+        smax = _kayan(high, 14, np.max)
+        stoch = 100 * (close - smin) / (smax - smin)
+
+        # Trend göstergeleri
+        macd = _ewm(close, 2 / 13, 12, gecerli, sayac) - _ewm(close, 2 / 27, 26, gecerli, sayac)
+        macd_signal = _ewm(macd, 2 / 10, 9)
+        ema_20 = _ewm(close, 2 / 21, 20, gecerli, sayac)
+        ema_200 = _ewm(close, 2 / 201, 200, gecerli, sayac)
+        sma_50, _ = _kayan_ortalama(close, 50, sayac)
+
+        # Volatilite göstergeleri
+        bb_middle, bb_std = _kayan_ortalama(close, 20, sayac, std=True)
+
+        # Hacim analizi
+        isaret = np.where(close < onceki, -1.0, 1.0)
+        obv = np.cumsum(np.where(gecerli, isaret * volume, 0.0), axis=-1)
+        obv[~gecerli] = np.nan
+
+    sonuc = {
+        'RSI': rsi,
+        'Stoch_%K': stoch,
+        'MACD': macd,
+        'MACD_signal': macd_signal,
+        'EMA_20': ema_20,
+        'SMA_50': sma_50,
+        'EMA_200': ema_200,
+        'BB_upper': bb_middle + 2 * bb_std,
+        'BB_middle': bb_middle,
+        'BB_lower': bb_middle - 2 * bb_std,
+        'OBV': obv,
+    }
+    if tek:
+        sonuc = {k: v[0] for k, v in sonuc.items()}
+    return sonuc
+
+
+def _hazirla(x):
+    return np.ascontiguousarray(x, dtype=np.float64)
+
+
+def _ileri_doldur(x):
+    """Her satırda NaN'ları son geçerli değerle doldurur; baştaki NaN'lar kalır."""
+    gecerli = ~np.isnan(x)
+    if gecerli.all():
+        return x
+    idx = np.where(gecerli, np.arange(x.shape[-1]), 0)
+    np.maximum.accumulate(idx, axis=-1, out=idx)
+    return np.take_along_axis(x, idx, axis=-1)
+
+
+def _yinele(x, alpha):
+    """y[t] = (1 - alpha) * y[t-1] + alpha * x[t], y[-1] = 0 yinelemesini bloklar halinde çözer.
+
+    Her blok içinde kapalı form (kümülatif toplam) kullanılır, böylece Python döngüsü
+    bar başına değil blok başına döner.
+    """
+    b = 1.0 - alpha
+    blok = max(1, int(_BLOK_USSU / -np.log(b)))
+    n = x.shape[-1]
+    y = np.empty_like(x)
+    onceki = np.zeros(x.shape[:-1])
+    for s in range(0, n, blok):
+        parca = x[..., s:s + blok]
+        j = np.arange(parca.shape[-1])
+        kuvvet = b ** j
+        toplam = np.cumsum(parca / kuvvet, axis=-1)
+        y[..., s:s + blok] = kuvvet * (alpha * toplam + b * onceki[..., None])
+        onceki = y[..., s + parca.shape[-1] - 1]
+    return y
+
+
+def _ewm(x, alpha, min_periods, gecerli=None, sayac=None):
+    """pandas `ewm(alpha=..., adjust=False, min_periods=...)` eşdeğeri."""
+    if gecerli is None:
+        gecerli = ~np.isnan(x)
+        sayac = np.cumsum(gecerli, axis=-1)
+    # İlk geçerli değer alpha'ya bölünürse yineleme y = x ile başlar
+    x0 = np.where(gecerli, x, 0.0)
+    ilk = gecerli & (sayac == 1)
+    x0[ilk] /= alpha
+    y = _yinele(x0, alpha)
+    y[sayac < min_periods] = np.nan
+    return y
+
+
+def _kayan(x, pencere, fn):
+    """`rolling(pencere, min_periods=pencere)` ile min/max."""
+    sonuc = np.full_like(x, np.nan)
+    if x.shape[-1] >= pencere:
+        gorunum = np.lib.stride_tricks.sliding_window_view(x, pencere, axis=-1)
+        sonuc[..., pencere - 1:] = fn(gorunum, axis=-1)
+    return sonuc
+
+
+def _kayan_ortalama(x, pencere, sayac, std=False):
+    """Kümülatif toplamlarla kayan ortalama ve (ddof=0) standart sapma."""
+    # Büyük değerlerde iptal hatasını azaltmak için satırı ilk değerine göre kaydırıyoruz
+    ilk = np.argmax(sayac >= 1, axis=-1)[..., None]
+    kayma = np.nan_to_num(np.take_along_axis(x, ilk, axis=-1))
+    z = np.nan_to_num(x - kayma)
+
+    def pencere_toplami(v):
+        cs = np.cumsum(v, axis=-1)
+        toplam = cs.copy()
+        toplam[..., pencere:] -= cs[..., :-pencere]
+        return toplam
+
+    s1 = pencere_toplami(z)
+    ortalama = s1 / pencere
+    eksik = sayac < pencere
+    ortalama_fiyat = ortalama + kayma
+    ortalama_fiyat[eksik] = np.nan
+
+    if not std:
+        return ortalama_fiyat, None
+    s2 = pencere_toplami(z * z)
+    varyans = np.maximum(s2 / pencere - ortalama * ortalama, 0.0)
+    sapma = np.sqrt(varyans)
+    sapma[eksik] = np.nan
+    return ortalama_fiyat, sapma
@@ -0,0 +1,152 @@
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class IsIptalEdildi(Exception):
+    """Yerine daha yeni bir istek geldiği için iptal edilen işler bunu fırlatır."""
+
+
+class Is:
+    """Yürütücüye gönderilen tek bir iş; ilerleme bildirir ve iptal durumunu taşır."""
+
+    def __init__(self, yurutucu, anahtar, aciklama):
+        self._yurutucu = yurutucu
+        self.anahtar = anahtar
+        self.aciklama = aciklama
+        self.ilerleme = 0.0
+        self.durum = "Bekliyor"
+        self.future = None
+        self._iptal = threading.Event()
+
+    @property
+    def iptal_edildi(self):
+        return self._iptal.is_set()
+
+    def iptal_et(self):
+        self._iptal.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def kontrol(self):
+        """İş iptal edildiyse aşamalar arasında çalışmayı keser."""
+        if self._iptal.is_set():
+            raise IsIptalEdildi(self.aciklama)
+
+    def bildir(self, ilerleme, durum=None):
+        """İş parçacığından ilerleme bildirir; arayüz ana döngüde güncellenir."""
+        self.kontrol()
+        self._yurutucu._kuyruk.put(("ilerleme", self, (ilerleme, durum)))
+
+    def hesapla(self, fn, *args, **kwargs):
+        """CPU ağırlıklı bir fonksiyonu varsa süreç havuzunda, yoksa bu iş parçacığında çalıştırır."""
+        self.kontrol()
+        sonuc = self._yurutucu.hesapla(fn, *args, **kwargs)
+        self.kontrol()
+        return sonuc
+
+
+class IsYurutucu:
+    """Ağ ve hesaplama işlerini Tk ana döngüsünü bloklamadan çalıştırır.
+
+    Her iş bir anahtarla (ör. sonucunu gösterecek pencere) gönderilir; aynı anahtarla
+    gelen yeni istek eskisini iptal eder ve eski işin sonucu hiçbir zaman gösterilmez.
+    Sonuçlar ve ilerleme bildirimleri bir kuyruk üzerinden `root.after` ile ana
+    iş parçacığına taşınır.
+    """
+
+    def __init__(self, root, io_isci=4, cpu_isci=0, durum_callback=None, aralik=50):
+        self.root = root
+        self._io = ThreadPoolExecutor(max_workers=io_isci, thread_name_prefix="borsa-io")
+        self._cpu = ProcessPoolExecutor(max_workers=cpu_isci) if cpu_isci else None
+        self._kuyruk = queue.Queue()
+        self._aktif = {}
+        self._aralik = aralik
+        self.durum_callback = durum_callback
+        self.root.after(self._aralik, self._bosalt)
+
+    def gonder(self, anahtar, fn, *args, tamamlandi=None, hata=None, aciklama=None, **kwargs):
+        """`fn(is_, *args, **kwargs)` fonksiyonunu G/Ç havuzunda çalıştırır.
+
+        `tamamlandi(sonuc)` ve `hata(istisna)` ana iş parçacığında çağrılır.
+        """
+        eski = self._aktif.get(anahtar)
+        if eski is not None:
+            eski.iptal_et()
+
+        is_ = Is(self, anahtar, aciklama or anahtar)
+        self._aktif[anahtar] = is_
+        is_.future = self._io.submit(self._calistir, is_, fn, args, kwargs)
+        is_.future.add_done_callback(
+            lambda future: self._kuyruk.put(("bitti", is_, (future, tamamlandi, hata))))
+        self._durum_bildir()
+        return is_
+
+    def iptal_et(self, anahtar):
+        is_ = self._aktif.pop(anahtar, None)
+        if is_ is not None:
+            is_.iptal_et()
+            self._durum_bildir()
+
+    def hesapla(self, fn, *args, **kwargs):
+        if self._cpu is None:
+            return fn(*args, **kwargs)
+        return self._cpu.submit(fn, *args, **kwargs).result()
+
+    def aktif_isler(self):
+        return list(self._aktif.values())
+
+    def kapat(self):
+        for is_ in self._aktif.values():
+            is_.iptal_et()
+        self._aktif.clear()
+        self._io.shutdown(wait=False, cancel_futures=True)
+        if self._cpu is not None:
+            self._cpu.shutdown(wait=False, cancel_futures=True)
+
+    def _calistir(self, is_, fn, args, kwargs):
+        is_.kontrol()
+        self._kuyruk.put(("ilerleme", is_, (0.0, "Çalışıyor")))
+        return fn(is_, *args, **kwargs)
+
+    def _bosalt(self):
+        try:
+            while True:
+                tur, is_, veri = self._kuyruk.get_nowait()
+                # Yerine yenisi gelmiş işlerin bildirimleri yok sayılır
+                if self._aktif.get(is_.anahtar) is not is_ or is_.iptal_edildi:
+                    continue
+                if tur == "ilerleme":
+                    is_.ilerleme, durum = veri
+                    if durum:
+                        is_.durum = durum
+                else:
+                    del self._aktif[is_.anahtar]
+                    try:
+                        self._sonuclandir(*veri)
+                    except Exception as e:
+                        # Bir geri çağırmanın hatası sonraki işlerin bildirimlerini durdurmamalı
+                        print(f"'{is_.aciklama}' sonucu işlenirken hata: {e}")
+                self._durum_bildir()
+        except queue.Empty:
+            pass
+        finally:
+            self.root.after(self._aralik, self._bosalt)
+
+    def _sonuclandir(self, future, tamamlandi, hata):
+        if future.cancelled():
+            return
+        istisna = future.exception()
+        if isinstance(istisna, IsIptalEdildi):
+            return
+        if istisna is not None:
+            if hata is not None:
+                hata(istisna)
+            else:
+                print(f"İş hatası: {istisna}")
+        elif tamamlandi is not None:
+            tamamlandi(future.result())
+
+    def _durum_bildir(self):
+        if self.durum_callback is not None:
+            self.durum_callback(self.aktif_isler())
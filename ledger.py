@@ -0,0 +1,209 @@
+"""Alım lotları defteri: satışları alım lotlarıyla eşleştirip gerçekleşen K/Z'yi kaydeder.
+
+FIFO'da satış en eski açık lottan başlayarak eşleşir; ortalama maliyette (AVG)
+sembol başına tek bir lot tutulur ve alımlar onun ortalamasına katılır. Açık lotlar,
+gerçekleşen satırlar ve sembol başına açık adet/maliyet SQLite'ta saklanır. Yeni
+işlem geçmiş yeniden oynatılmadan uygulanır: satış yalnızca tükettiği lotları
+okur ve her lot bir kez tükendiği için işlem başına maliyet amortize O(1)'dir.
+Sembolün son işleminden eski tarihli bir işlem gelirse yalnızca o sembol yeniden kurulur.
+"""
+from collections import deque
+
+YONTEMLER = {'FIFO': "FIFO (İlk giren ilk çıkar)", 'AVG': "Ortalama maliyet"}
+
+
+def tablolari_olustur(cursor):
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS lots (
+        buy_tx_id INTEGER PRIMARY KEY,
+        symbol TEXT NOT NULL,
+        date TEXT NOT NULL,
+        price REAL NOT NULL,
+        quantity INTEGER NOT NULL
+    )''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_lots_symbol_date
+    ON lots (symbol, date, buy_tx_id)''')
+    # Eşleşecek açık lot bulunamayan satış miktarı maliyet ve K/Z'si NULL olarak kaydedilir
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS realized (
+        id INTEGER PRIMARY KEY,
+        sell_tx_id INTEGER NOT NULL,
+        buy_tx_id INTEGER,
+        symbol TEXT NOT NULL,
+        date TEXT NOT NULL,
+        quantity INTEGER NOT NULL,
+        proceeds REAL NOT NULL,
+        cost REAL,
+        pnl REAL
+    )''')
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_realized_symbol_date
+    ON realized (symbol, date)''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS lot_state (
+        symbol TEXT PRIMARY KEY,
+        last_date TEXT NOT NULL,
+        open_quantity INTEGER NOT NULL,
+        open_cost REAL NOT NULL
+    )''')
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS ledger_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )''')
+    cursor.execute("INSERT OR IGNORE INTO ledger_meta (key, value) VALUES ('method', 'FIFO')")
+
+
+class _LotKuyrugu:
+    """Sembolün açık lotları: önce veritabanındakiler (ihtiyaç oldukça okunur), sonra yeni eklenenler.
+
+    Lot: [buy_tx_id, date, price, quantity].
+    """
+
+    def __init__(self, okuyucu):
+        self._okuyucu = okuyucu
+        self._kayitli = deque()
+        self.yeni = deque()
+        self.silinen = []
+        self.degisen = {}
+
+    def bas(self):
+        if self._kayitli:
+            return self._kayitli[0]
+        satir = next(self._okuyucu, None)
+        if satir is not None:
+            self._kayitli.append(list(satir))
+            return self._kayitli[0]
+        return self.yeni[0] if self.yeni else None
+
+    def degisti(self, lot):
+        if self._kayitli and lot is self._kayitli[0]:
+            self.degisen[lot[0]] = lot
+
+    def dus(self):
+        if self._kayitli:
+            lot = self._kayitli.popleft()
+            self.silinen.append(lot[0])
+            self.degisen.pop(lot[0], None)
+        else:
+            self.yeni.popleft()
+
+
+class LotDefteri:
+    def __init__(self, conn):
+        self.conn = conn
+
+    @property
+    def yontem(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT value FROM ledger_meta WHERE key='method'")
+        return cursor.fetchone()[0]
+
+    def uygula(self, cursor, islemler):
+        """(id, symbol, operation, price, quantity, date) işlemlerini deftere işler.
+
+        Çağıran SQLite işlemini (transaction) açar ve kapatır.
+        """
+        yontem = self.yontem
+        gruplar = {}
+        for islem in sorted(islemler, key=lambda i: (i[1], i[5], i[0])):
+            gruplar.setdefault(islem[1], []).append(islem)
+        for symbol, grup in gruplar.items():
+            self._sembol_uygula(cursor, symbol, grup, yontem)
+
+    def yeniden_kur(self, cursor, symbol=None):
+        """Sembolün (verilmezse tümünün) defterini işlemlerden baştan kurar."""
+        yontem = self.yontem
+        if symbol is None:
+            for tablo in ('lots', 'realized', 'lot_state'):
+                cursor.execute(f'DELETE FROM {tablo}')
+            cursor.execute('SELECT DISTINCT symbol FROM transactions')
+            semboller = [row[0] for row in cursor.fetchall()]
+        else:
+            for tablo in ('lots', 'realized', 'lot_state'):
+                cursor.execute(f'DELETE FROM {tablo} WHERE symbol=?', (symbol,))
+            semboller = [symbol]
+
+        for symbol in semboller:
+            cursor.execute('''
+            SELECT id, symbol, operation, price, quantity, date FROM transactions
+            WHERE symbol=? ORDER BY date, id
+            ''', (symbol,))
+            islemler = cursor.fetchall()
+            if islemler:
+                self._sembol_uygula(cursor, symbol, islemler, yontem, bastan=True)
+
+    def _sembol_uygula(self, cursor, symbol, islemler, yontem, bastan=False):
+        cursor.execute('SELECT last_date, open_quantity, open_cost FROM lot_state WHERE symbol=?', (symbol,))
+        durum = cursor.fetchone()
+        if durum is not None and not bastan and islemler[0][5] < durum[0]:
+            # Geriye tarihli işlem: FIFO sırası değişebileceği için sembol baştan kurulur
+            self.yeniden_kur(cursor, symbol)
+            return
+        acik_adet, acik_maliyet = (durum[1], durum[2]) if durum is not None else (0, 0.0)
+
+        okuyucu = self.conn.execute('''
+        SELECT buy_tx_id, date, price, quantity FROM lots
+        WHERE symbol=? ORDER BY date, buy_tx_id
+        ''', (symbol,))
+        kuyruk = _LotKuyrugu(okuyucu)
+        gerceklesen = []
+
+        for tx_id, _, operation, price, quantity, date in islemler:
+            if operation == 'BUY':
+                lot = kuyruk.bas() if yontem == 'AVG' else None
+                if lot is not None:
+                    # Ortalama maliyet: tek lotun fiyatı ağırlıklı ortalamayla güncellenir
+                    lot[2] = (lot[2] * lot[3] + price * quantity) / (lot[3] + quantity)
+                    lot[3] += quantity
+                    kuyruk.degisti(lot)
+                else:
+                    kuyruk.yeni.append([tx_id, date, price, quantity])
+                acik_adet += quantity
+                acik_maliyet += price * quantity
+                continue
+
+            kalan = quantity
+            while kalan > 0:
+                lot = kuyruk.bas()
+                if lot is None:
+                    gerceklesen.append((tx_id, None, symbol, date, kalan, price * kalan, None, None))
+                    break
+                adet = min(kalan, lot[3])
+                maliyet = lot[2] * adet
+                gerceklesen.append((tx_id, lot[0] if yontem == 'FIFO' else None, symbol, date, adet,
+                                    price * adet, maliyet, price * adet - maliyet))
+                kalan -= adet
+                acik_adet -= adet
+                acik_maliyet -= maliyet
+                lot[3] -= adet
+                if lot[3] == 0:
+                    kuyruk.dus()
+                else:
+                    kuyruk.degisti(lot)
+            if acik_adet == 0:
+                acik_maliyet = 0.0
+        okuyucu.close()
+
+        if kuyruk.silinen:
+            cursor.executemany('DELETE FROM lots WHERE buy_tx_id=?', ((i,) for i in kuyruk.silinen))
+        if kuyruk.degisen:
+            cursor.executemany('UPDATE lots SET price=?, quantity=? WHERE buy_tx_id=?',
+                               ((lot[2], lot[3], lot[0]) for lot in kuyruk.degisen.values()))
+        if kuyruk.yeni:
+            cursor.executemany('''
+            INSERT INTO lots (buy_tx_id, symbol, date, price, quantity)
+            VALUES (?, ?, ?, ?, ?)
+            ''', ((lot[0], symbol, lot[1], lot[2], lot[3]) for lot in kuyruk.yeni))
+        if gerceklesen:
+            cursor.executemany('''
+            INSERT INTO realized (sell_tx_id, buy_tx_id, symbol, date, quantity, proceeds, cost, pnl)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', gerceklesen)
+
+        son_tarih = max(islemler[-1][5], durum[0]) if durum is not None and not bastan else islemler[-1][5]
+        cursor.execute('''
+        INSERT OR REPLACE INTO lot_state (symbol, last_date, open_quantity, open_cost)
+        VALUES (?, ?, ?, ?)
+        ''', (symbol, son_tarih, acik_adet, acik_maliyet))
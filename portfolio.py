@@ -2,10 +2,23 @@
 import sqlite3
 from datetime import datetime
 
+from diagnostics import span
+from ledger import YONTEMLER, LotDefteri, tablolari_olustur
+
+# portfolio.db şema sürümü (PRAGMA user_version)
+SCHEMA_VERSION = 3
+
 class Portfolio:
-    def __init__(self):
-        self.conn = sqlite3.connect('portfolio.db')
+    def __init__(self, db_path='portfolio.db'):
+        self.conn = sqlite3.connect(db_path)
+        # WAL ile okuyucular yazmayı beklemez; NORMAL, WAL'da her commit'te fsync yapmaz ama tutarlıdır
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.defter = LotDefteri(self.conn)
         self.create_tables()
+
+    def close(self):
+        self.conn.close()
         
     def create_tables(self):
         cursor = self.conn.cursor()
@@ -19,57 +32,232 @@ class Portfolio:
             date TEXT NOT NULL
         )''')
         self.conn.commit()
+        self.migrate()
+
+    def migrate(self):
+        """Eski portfolio.db dosyalarını güncel şemaya yükseltir."""
+        cursor = self.conn.cursor()
+        cursor.execute('PRAGMA user_version')
+        version = cursor.fetchone()[0]
+
+        if version < 1:
+            # Sembol başına net adet, net maliyet ve son işlem tarihi; add_transaction ile güncel tutulur
+            with self.conn:
+                cursor.execute('''
+                CREATE TABLE IF NOT EXISTS positions (
+                    symbol TEXT PRIMARY KEY,
+                    quantity INTEGER NOT NULL,
+                    cost REAL NOT NULL,
+                    last_date TEXT NOT NULL
+                )''')
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_transactions_symbol_date
+                ON transactions (symbol, date)''')
+                cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_transactions_date
+                ON transactions (date)''')
+                cursor.execute('''
+                INSERT OR REPLACE INTO positions (symbol, quantity, cost, last_date)
+                SELECT
+                    symbol,
+                    SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END),
+                    SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END),
+                    MAX(date)
+                FROM transactions
+                GROUP BY symbol
+                ''')
+                cursor.execute('PRAGMA user_version = 1')
+
+        if version < 2:
+            # Aracı kurum dosyalarından gelen işlemler için doğal anahtar; tekrar içe aktarmayı engeller
+            with self.conn:
+                cursor.execute('ALTER TABLE transactions ADD COLUMN source_key TEXT')
+                cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_transactions_source_key
+                ON transactions (source_key)''')
+                cursor.execute('PRAGMA user_version = 2')
+
+        if version < 3:
+            # Açık alım lotları ve gerçekleşen K/Z; mevcut işlemlerden bir kez kurulur
+            with self.conn:
+                tablolari_olustur(cursor)
+                self.defter.yeniden_kur(cursor)
+                cursor.execute('PRAGMA user_version = 3')
         
     def add_transaction(self, symbol, operation, price, quantity, date=None):
         cursor = self.conn.cursor()
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        cursor.execute('''
-        INSERT INTO transactions (symbol, operation, price, quantity, date)
-        VALUES (?, ?, ?, ?, ?)
-        ''', (symbol.upper(), operation, price, quantity, date))
-        self.conn.commit()
+        symbol = symbol.upper()
+        # İşlem ve pozisyon güncellemesi aynı SQLite işleminde yapılır
+        with span('sqlite'), self.conn:
+            cursor.execute('''
+            INSERT INTO transactions (symbol, operation, price, quantity, date)
+            VALUES (?, ?, ?, ?, ?)
+            ''', (symbol, operation, price, quantity, date))
+            self.defter.uygula(cursor, [(cursor.lastrowid, symbol, operation, price, quantity, date)])
+            signed_quantity = quantity if operation == 'BUY' else -quantity
+            cursor.execute('''
+            INSERT INTO positions (symbol, quantity, cost, last_date)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(symbol) DO UPDATE SET
+                quantity = quantity + excluded.quantity,
+                cost = cost + excluded.cost,
+                last_date = MAX(last_date, excluded.last_date)
+            ''', (symbol, signed_quantity, price * signed_quantity, date))
         
-    def get_portfolio(self):
+    def import_transactions(self, rows):
+        """(symbol, operation, price, quantity, date, source_key) satırlarını tek işlemde ekler.
+
+        Aynı source_key ile daha önce eklenmiş satırlar atlanır. Eklenen satır sayısını döndürür.
+        """
         cursor = self.conn.cursor()
-        cursor.execute('''
-        WITH PortfolioSummary AS (
-            SELECT 
+        with self.conn:
+            # Yazma kilidi MAX(id) okunmadan alınır; başka bir bağlantının araya giren
+            # işlemi bu içe aktarmanın satırları arasında sayılmaz
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM transactions')
+            last_id = cursor.fetchone()[0]
+
+            cursor.executemany('''
+            INSERT OR IGNORE INTO transactions (symbol, operation, price, quantity, date, source_key)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+
+            # Pozisyonlar yalnızca bu içe aktarmada eklenen satırlardan güncellenir
+            cursor.execute('''
+            INSERT INTO positions (symbol, quantity, cost, last_date)
+            SELECT
                 symbol,
-                SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END) as total_quantity,
-                SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END) as total_cost,
-                MAX(date) as last_transaction_date
+                SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END),
+                SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END),
+                MAX(date)
             FROM transactions
+            WHERE id > ?
             GROUP BY symbol
-            HAVING total_quantity > 0
-        )
-        SELECT 
-            symbol,
-            total_quantity,
-            ABS(total_cost) as total_cost,
-            last_transaction_date,
-            ABS(total_cost/total_quantity) as avg_cost
-        FROM PortfolioSummary
-        ORDER BY last_transaction_date DESC
-        ''')
-        return cursor.fetchall()
+            ON CONFLICT(symbol) DO UPDATE SET
+                quantity = quantity + excluded.quantity,
+                cost = cost + excluded.cost,
+                last_date = MAX(last_date, excluded.last_date)
+            ''', (last_id,))
+
+            cursor.execute('''
+            SELECT id, symbol, operation, price, quantity, date FROM transactions
+            WHERE id > ?
+            ''', (last_id,))
+            eklenenler = cursor.fetchall()
+            self.defter.uygula(cursor, eklenenler)
+            return len(eklenenler)
+
+    def get_portfolio(self):
+        cursor = self.conn.cursor()
+        # Ortalama maliyet açık lotlardan gelir. Eşleşecek lotu olmayan satışlar açık lotları
+        # azaltmadığı için toplam maliyet lot adediyle değil, pozisyon adediyle hesaplanır
+        with span('sqlite'):
+            cursor.execute('''
+            SELECT 
+                p.symbol,
+                p.quantity as total_quantity,
+                COALESCE(s.open_cost / NULLIF(s.open_quantity, 0), ABS(p.cost/p.quantity)) * p.quantity
+                    as total_cost,
+                p.last_date as last_transaction_date,
+                COALESCE(s.open_cost / NULLIF(s.open_quantity, 0), ABS(p.cost/p.quantity)) as avg_cost
+            FROM positions p
+            LEFT JOIN lot_state s ON s.symbol = p.symbol
+            WHERE p.quantity > 0
+            ORDER BY p.last_date DESC
+            ''')
+            return cursor.fetchall()
         
     def get_transactions(self, symbol=None):
         cursor = self.conn.cursor()
         if symbol:
-            cursor.execute('SELECT * FROM transactions WHERE symbol=? ORDER BY date DESC', (symbol.upper(),))
+            cursor.execute('''
+            SELECT id, symbol, operation, price, quantity, date
+            FROM transactions
+            WHERE symbol=?
+            ORDER BY date DESC
+            ''', (symbol.upper(),))
         else:
-            cursor.execute('SELECT * FROM transactions ORDER BY date DESC')
+            cursor.execute('''
+            SELECT id, symbol, operation, price, quantity, date
+            FROM transactions
+            ORDER BY date DESC
+            ''')
+        return cursor.fetchall()
+
+    def get_transactions_since(self, last_id=0):
+        """id'si last_id'den büyük işlemleri ekleniş sırasıyla döndürür (artımlı okuma için)."""
+        cursor = self.conn.cursor()
+        with span('sqlite'):
+            cursor.execute('''
+            SELECT id, symbol, operation, price, quantity, date
+            FROM transactions
+            WHERE id > ?
+            ORDER BY id
+            ''', (last_id,))
+            return cursor.fetchall()
+
+    def get_realized_pnl(self, year=None):
+        """Yıl ve sembol bazında gerçekleşen K/Z.
+
+        (yıl, sembol, adet, satış tutarı, maliyet, K/Z, eşleşmeyen adet) satırları döndürür;
+        eşleşmeyen adet, alımı kayıtlarda olmayan satış miktarıdır.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+        SELECT
+            substr(date, 1, 4) as year,
+            symbol,
+            SUM(quantity),
+            SUM(proceeds),
+            SUM(cost),
+            SUM(pnl),
+            SUM(CASE WHEN cost IS NULL THEN quantity ELSE 0 END)
+        FROM realized
+        WHERE ? IS NULL OR substr(date, 1, 4) = ?
+        GROUP BY year, symbol
+        ORDER BY year, symbol
+        ''', (year, str(year) if year is not None else None))
         return cursor.fetchall()
 
+    def get_realized_by_day(self):
+        """(gün, gerçekleşen K/Z, eşleşmeyen satış tutarı) satırları.
+
+        Portföy geçmişinde net yatırımı açık lot maliyetine çevirmek için kullanılır.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('''
+        SELECT
+            substr(date, 1, 10),
+            SUM(COALESCE(pnl, 0)),
+            SUM(CASE WHEN cost IS NULL THEN proceeds ELSE 0 END)
+        FROM realized
+        GROUP BY 1 ORDER BY 1
+        ''')
+        return cursor.fetchall()
+
+    @property
+    def cost_method(self):
+        return self.defter.yontem
+
+    def set_cost_method(self, method):
+        """Maliyet yöntemini ('FIFO' ya da 'AVG') değiştirir ve defteri baştan kurar."""
+        if method not in YONTEMLER:
+            raise ValueError(f"Bilinmeyen maliyet yöntemi: {method}")
+        cursor = self.conn.cursor()
+        with self.conn:
+            cursor.execute("UPDATE ledger_meta SET value=? WHERE key='method'", (method,))
+            self.defter.yeniden_kur(cursor)
+
     def get_portfolio_summary(self):
         """Portföy özet bilgilerini döndürür"""
         cursor = self.conn.cursor()
         cursor.execute('''
         SELECT 
-            COUNT(DISTINCT symbol) as total_stocks,
-            SUM(CASE WHEN operation='BUY' THEN price*quantity ELSE -price*quantity END) as total_investment,
-            SUM(CASE WHEN operation='BUY' THEN quantity ELSE -quantity END) as total_shares
-        FROM transactions
+            COUNT(*) as total_stocks,
+            SUM(cost) as total_investment,
+            SUM(quantity) as total_shares
+        FROM positions
         ''')
         return cursor.fetchone()
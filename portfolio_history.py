@@ -0,0 +1,193 @@
+"""Portföyün ilk işlemden bugüne günlük değer (NAV), getiri, maliyet ve K/Z geçmişi.
+
+Günlük pozisyon matrisi işlemlerin kümülatif toplamıyla, değer ise bu matrisin
+kapanış fiyatı matrisiyle çarpımıyla bulunur; gün ya da işlem başına Python döngüsü
+yoktur. Yeni işlem ya da bar geldiğinde yalnızca etkilenen ilk günden sonrası
+yeniden hesaplanır.
+"""
+import numpy as np
+import pandas as pd
+
+from bar_store import PERIYOT_SIRASI, PERIYOTLAR
+
+GECMIS_SUTUNLARI = ['deger', 'maliyet', 'kz', 'gerceklesen', 'net_yatirim', 'akis', 'getiri', 'birikimli_getiri']
+
+
+def periyot_sec(baslangic, bugun=None):
+    """`baslangic` gününden bugüne kadarki günlük barları kapsayan en kısa periyot."""
+    gun = ((bugun or pd.Timestamp.now()).normalize() - pd.Timestamp(baslangic).normalize()).days
+    for periyot in PERIYOT_SIRASI:
+        birim, miktar = PERIYOTLAR[periyot]
+        # 'd' işlem günü olduğu için takvim gününe 7/5 oranıyla çevrilir
+        kapsam = {'d': miktar * 7 / 5, 'mo': miktar * 30, 'y': miktar * 365}.get(birim, np.inf)
+        if kapsam >= gun + 5:
+            return periyot
+    return "max"
+
+
+def kapanis_matrisi(frames, semboller):
+    """{sembol: OHLCV} sözlüğünden (gün x sembol) kapanış tablosu; indeks saat dilimsiz gün başlarıdır."""
+    seriler = {}
+    for symbol in semboller:
+        df = frames.get(symbol)
+        if df is None or df.empty:
+            continue
+        close = df['Close']
+        index = close.index.tz_localize(None) if close.index.tz is not None else close.index
+        close = pd.Series(close.to_numpy(dtype=float), index=index.normalize())
+        seriler[symbol] = close[~close.index.duplicated(keep='last')]
+    if not seriler:
+        return pd.DataFrame(columns=semboller, dtype=float)
+    return pd.concat(seriler, axis=1).reindex(columns=semboller).sort_index()
+
+
+class PortfoyGecmisi:
+    """İşlemleri ve fiyatları artımlı okuyarak günlük portföy geçmişini güncel tutar.
+
+    `sonuc` sütunları: deger (pozisyonların piyasa değeri), maliyet (açık lotların
+    maliyeti), kz (gerçekleşmemiş K/Z, deger - maliyet), gerceklesen (lot defterinden
+    birikimli gerçekleşen K/Z), net_yatirim (alımlar - satışlar), akis (o günkü net
+    alım tutarı), getiri (akıştan arındırılmış günlük getiri) ve birikimli_getiri
+    (zaman ağırlıklı).
+
+    Satılan lotların maliyeti satış tutarı eksi gerçekleşen K/Z olduğundan açık lot
+    maliyeti her gün net_yatirim + gerceklesen'dir (alımı kayıtlarda olmayan
+    satışların tutarı da geri eklenir).
+    """
+
+    def __init__(self, bar_store):
+        self.bar_store = bar_store
+        self.sifirla()
+
+    def sifirla(self):
+        """Tüm geçmişi bir sonraki güncellemede ilk işlemden yeniden hesaplatır."""
+        self.sonuc = pd.DataFrame(columns=GECMIS_SUTUNLARI, dtype=float)
+        self.pozisyonlar = pd.DataFrame(dtype=float)
+        self._son_id = 0
+        self._gun = np.empty(0, dtype='datetime64[ns]')
+        self._sembol = np.empty(0, dtype=object)
+        self._adet = np.empty(0)
+        self._nakit = np.empty(0)
+        self._fiyat = np.empty(0)
+
+    def guncelle(self, portfolio):
+        """Yeni işlemleri okur ve geçmişi günceller; `sonuc` tablosunu döndürür.
+
+        `portfolio` çağıran iş parçacığında açılmış bir Portfolio olmalıdır.
+        """
+        yeni = portfolio.get_transactions_since(self._son_id)
+        yeni_ilk_gun = self._islemleri_ekle(yeni) if yeni else None
+        if not len(self._gun):
+            return self.sonuc
+
+        semboller = sorted(set(self._sembol))
+        ilk_gun = self._gun.min()
+        frames = self.bar_store.get_many(semboller, periyot_sec(ilk_gun))
+        kapanis = kapanis_matrisi(frames, semboller)
+        gunler = kapanis.index.union(pd.DatetimeIndex(np.unique(self._gun)))
+        gunler = gunler[gunler >= ilk_gun]
+
+        # Önceki sonuçtan korunacak gün sayısı: son gün (bar henüz kapanmamış olabilir)
+        # ve yeni işlemlerin ilk gününden itibaren yeniden hesaplanır
+        p = 0
+        if len(self.sonuc):
+            bas = self.sonuc.index[-1]
+            if yeni_ilk_gun is not None:
+                bas = min(bas, yeni_ilk_gun)
+            p = int(gunler.searchsorted(bas))
+            if not gunler[:p].equals(self.sonuc.index[:p]):
+                p = 0
+
+        self._hesapla(gunler, semboller, kapanis, p)
+        self._gerceklesen_uygula(portfolio.get_realized_by_day())
+        return self.sonuc
+
+    def _gerceklesen_uygula(self, gunluk):
+        # Geriye tarihli işlemler geçmiş gerçekleşen K/Z'yi değiştirebildiği için bu sütunlar
+        # her seferinde (gün başına tek toplamla) baştan hesaplanır
+        gunler = self.sonuc.index
+        gerceklesen = eslesmeyen = np.zeros(len(gunler))
+        if gunluk:
+            tarihler, kz, tutar = zip(*gunluk)
+            gi = np.minimum(gunler.searchsorted(pd.to_datetime(list(tarihler))), len(gunler) - 1)
+            gerceklesen = np.cumsum(np.bincount(gi, weights=np.array(kz, dtype=float), minlength=len(gunler)))
+            eslesmeyen = np.cumsum(np.bincount(gi, weights=np.array(tutar, dtype=float), minlength=len(gunler)))
+        self.sonuc['gerceklesen'] = gerceklesen
+        self.sonuc['maliyet'] = self.sonuc['net_yatirim'] + gerceklesen + eslesmeyen
+        self.sonuc['kz'] = self.sonuc['deger'] - self.sonuc['maliyet']
+
+    def _islemleri_ekle(self, satirlar):
+        """Yeni işlemleri dizilere ekler; en erken işlem gününü döndürür."""
+        ids, semboller, islemler, fiyatlar, adetler, tarihler = zip(*satirlar)
+        self._son_id = max(ids)
+        isaret = np.where(np.array(islemler) == 'BUY', 1.0, -1.0)
+        adet = isaret * np.array(adetler, dtype=float)
+        fiyat = np.array(fiyatlar, dtype=float)
+        gun = pd.to_datetime(pd.Series(tarihler), format='mixed').dt.normalize().to_numpy()
+
+        self._gun = np.concatenate([self._gun, gun])
+        self._sembol = np.concatenate([self._sembol, np.array(semboller, dtype=object)])
+        self._adet = np.concatenate([self._adet, adet])
+        self._nakit = np.concatenate([self._nakit, adet * fiyat])
+        self._fiyat = np.concatenate([self._fiyat, fiyat])
+        return pd.Timestamp(gun.min())
+
+    def _hesapla(self, gunler, semboller, kapanis, p):
+        n_gun, n_sembol = len(gunler), len(semboller)
+        sembol_idx = pd.Index(semboller).get_indexer(self._sembol)
+        # Tatil gününe düşen işlemler sonraki işlem gününe, son günden sonrakiler son güne yazılır
+        gun_idx = np.minimum(gunler.searchsorted(self._gun), n_gun - 1)
+
+        # Kapanışı olmayan günlerde son kapanış, hiç kapanış yoksa son işlem fiyatı kullanılır
+        islem_fiyati = np.full((n_gun, n_sembol), np.nan)
+        islem_fiyati[gun_idx, sembol_idx] = self._fiyat
+        fiyat = (kapanis.reindex(gunler).ffill().to_numpy()
+                 if len(kapanis) else np.full((n_gun, n_sembol), np.nan))
+        fiyat = np.where(np.isnan(fiyat), pd.DataFrame(islem_fiyati).ffill().to_numpy(), fiyat)[p:]
+
+        kuyruk = gun_idx >= p
+        gi = gun_idx[kuyruk] - p
+        n = n_gun - p
+        degisim = np.zeros((n, n_sembol))
+        np.add.at(degisim, (gi, sembol_idx[kuyruk]), self._adet[kuyruk])
+        akis = np.bincount(gi, weights=self._nakit[kuyruk], minlength=n)
+
+        if p:
+            onceki_poz = self.pozisyonlar.iloc[p - 1].reindex(semboller, fill_value=0.0).to_numpy()
+            onceki = self.sonuc.iloc[p - 1]
+            onceki_maliyet, onceki_deger, onceki_birikimli = onceki['net_yatirim'], onceki['deger'], onceki['birikimli_getiri']
+        else:
+            onceki_poz = np.zeros(n_sembol)
+            onceki_maliyet = onceki_deger = onceki_birikimli = 0.0
+
+        poz = onceki_poz + np.cumsum(degisim, axis=0)
+        deger = np.where(poz != 0, poz * fiyat, 0.0).sum(axis=1)
+        net_yatirim = onceki_maliyet + np.cumsum(akis)
+
+        # Günlük getiri gün içindeki alım/satım akışından arındırılır: (V_t - akış_t) / V_{t-1} - 1
+        onceki_degerler = np.concatenate([[onceki_deger], deger[:-1]])
+        getiri = np.zeros(n)
+        np.divide(deger - akis, onceki_degerler, out=getiri, where=onceki_degerler > 0)
+        getiri = np.where(onceki_degerler > 0, getiri - 1, 0.0)
+        birikimli = (1 + onceki_birikimli) * np.cumprod(1 + getiri) - 1
+
+        index = gunler[p:]
+        kuyruk_sonuc = pd.DataFrame({
+            'deger': deger,
+            'maliyet': net_yatirim,
+            'kz': deger - net_yatirim,
+            'gerceklesen': 0.0,
+            'net_yatirim': net_yatirim,
+            'akis': akis,
+            'getiri': getiri,
+            'birikimli_getiri': birikimli,
+        }, index=index)
+        kuyruk_poz = pd.DataFrame(poz, index=index, columns=semboller)
+
+        if p:
+            self.sonuc = pd.concat([self.sonuc.iloc[:p], kuyruk_sonuc])
+            self.pozisyonlar = pd.concat([self.pozisyonlar.iloc[:p].reindex(columns=semboller, fill_value=0.0),
+                                          kuyruk_poz])
+        else:
+            self.sonuc = kuyruk_sonuc
+            self.pozisyonlar = kuyruk_poz
@@ -0,0 +1,341 @@
+"""Tüm hisse evreni için bellek eşlemeli (memmap), sütun bazlı günlük fiyat paneli.
+
+Her alan ayrı bir dosyada (sembol x gün) C sırasıyla tutulur: Open/High/Low/Close
+float32, Volume int64. Bir sembolün satırı bitişik olduğundan tek sembol görünümü,
+bir günün sütunu da adımlı (strided) bir görünüm olarak kopyasız okunur; sayfalar
+yalnızca dokunuldukça belleğe gelir. Sembol ve gün indeksleri `meta.json`da durur,
+açılışta barlar SQLite'tan yeniden okunup ayrıştırılmaz.
+
+Gün ekseninde boş sütun payı bırakılır; yeni günler bu paya, yeni semboller dosya
+sonuna yazılır. Araya gün girmesi (ör. daha uzun geçmişli yeni sembol) ya da payın
+dolması dosyaları yeni bir nesil olarak baştan kurar. `meta.json` en son ve atomik
+yazıldığı için okuyucular hiçbir zaman yarım yazılmış bir indeks görmez.
+"""
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from bar_store import PERIYOT_SIRASI, PERIYOTLAR, ZAMAN_DILIMI
+from diagnostics import span
+
+ALANLAR = {
+    'Open': np.float32,
+    'High': np.float32,
+    'Low': np.float32,
+    'Close': np.float32,
+    'Volume': np.int64,
+}
+
+PANEL_DIZINI = 'price_panel'
+META_DOSYASI = 'meta.json'
+BICIM_SURUMU = 1
+
+# Gün ekseninde yeniden kurmadan eklenebilecek gün sayısı (~1 işlem yılı)
+GUN_PAYI = 256
+# Yeniden kurarken bir seferde kopyalanan satır sayısı
+KOPYA_BLOGU = 256
+
+
+def panel_dizini(bar_store):
+    """Bar deposunun sağlayıcısına göre panel dizini; kayıttan okuyan sağlayıcılar için geçici dizin."""
+    dizin = bar_store.saglayici.onbellek_yolu(PANEL_DIZINI)
+    if dizin == ':memory:':
+        # Kayıt verisi gerçek panele karışmasın diye süreç ömrünce geçici dizinde tutulur
+        dizin = tempfile.mkdtemp(prefix='fiyat_paneli_')
+    return dizin
+
+
+def _saniye(index):
+    """DatetimeIndex'i BarStore'daki gibi UTC epoch saniyesine çevirir."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is None:
+        index = index.tz_localize(ZAMAN_DILIMI)
+    return ((index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy(dtype=np.int64)
+
+
+def _bos(alan):
+    return np.nan if np.issubdtype(ALANLAR[alan], np.floating) else 0
+
+
+class FiyatPaneli:
+    """Günlük OHLCV barlarının sembol x gün dizileri; dosyalar `dizin` altında tutulur.
+
+    Okuma metotları (`sembol`, `kesit`, `matris`) memmap görünümleri döndürür;
+    bunlar değiştirilmemeli ve panel yeniden kurulduktan sonra tutulmamalıdır.
+    Eksik barlar fiyatlarda NaN, hacimde 0'dır. Yazma işlemleri tek bir kilitle
+    sıralanır; süreç havuzundaki okuyucular paneli `salt_okunur=True` ile açar.
+    """
+
+    def __init__(self, dizin=PANEL_DIZINI, salt_okunur=False):
+        self.dizin = dizin
+        self.salt_okunur = salt_okunur
+        self._kilit = threading.RLock()
+        if not salt_okunur:
+            os.makedirs(dizin, exist_ok=True)
+        self._yukle()
+
+    # -- okuma --
+
+    def _yukle(self):
+        path = os.path.join(self.dizin, META_DOSYASI)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('bicim') != BICIM_SURUMU:
+                raise ValueError(f"Desteklenmeyen fiyat paneli biçimi: {meta.get('bicim')} ({self.dizin})")
+        else:
+            meta = {'nesil': 0, 'kapasite': 0, 'gun_sayisi': 0, 'semboller': [], 'son': [],
+                    'periyotlar': [], 'degisiklik': 0}
+        self.nesil = meta['nesil']
+        self.kapasite = meta['kapasite']
+        self.semboller = meta['semboller']
+        self.degisiklik = meta['degisiklik']
+        self._son = meta['son']
+        self._periyotlar = meta['periyotlar']
+        self._indeks = {symbol: i for i, symbol in enumerate(self.semboller)}
+        n_gun = meta['gun_sayisi']
+        self._gunler = (np.fromfile(self._dosya('gunler'), dtype=np.int64, count=n_gun)
+                        if n_gun else np.empty(0, dtype=np.int64))
+        self._alanlar = {alan: self._esle(alan, len(self.semboller)) for alan in ALANLAR}
+        self._tarih_indeksi = None
+
+    def _dosya(self, ad, nesil=None):
+        return os.path.join(self.dizin, f"{ad}.{self.nesil if nesil is None else nesil}.bin")
+
+    def _esle(self, alan, n_sembol, nesil=None, mod=None):
+        sekil = (n_sembol, self.kapasite)
+        if not n_sembol or not self.kapasite:
+            return np.empty(sekil, dtype=ALANLAR[alan])
+        mod = mod or ('r' if self.salt_okunur else 'r+')
+        return np.memmap(self._dosya(alan, nesil), dtype=ALANLAR[alan], mode=mod, shape=sekil)
+
+    def __len__(self):
+        return len(self.semboller)
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._indeks
+
+    @property
+    def gun_sayisi(self):
+        return len(self._gunler)
+
+    def tarihler(self, bas=0, bit=None):
+        """Gün ekseninin [bas, bit) aralığı, BarStore çerçeveleriyle aynı saat diliminde."""
+        if self._tarih_indeksi is None or len(self._tarih_indeksi) != len(self._gunler):
+            self._tarih_indeksi = pd.DatetimeIndex(pd.to_datetime(self._gunler, unit='s', utc=True)
+                                                   .tz_convert(ZAMAN_DILIMI), name="Date")
+        return self._tarih_indeksi[bas:bit]
+
+    def _baslangic(self, bit, periyot, gecerli=None):
+        """`bit` gününde biten periyodun ilk gün indeksi (BarStore._kes ile aynı kurallar)."""
+        if periyot is None or not bit:
+            return 0
+        birim, miktar = PERIYOTLAR[periyot]
+        if birim == "max":
+            return 0
+        if birim == "d":
+            # Gün periyotları işlem günü sayısıdır; sembolün bar olan günleri sayılır
+            gunler = np.flatnonzero(gecerli) if gecerli is not None else np.arange(bit)
+            return int(gunler[-min(miktar, len(gunler))]) if len(gunler) else 0
+        son = self.tarihler(bit - 1, bit)[0].normalize()
+        offset = pd.DateOffset(months=miktar) if birim == "mo" else pd.DateOffset(years=miktar)
+        return int(np.searchsorted(self._gunler[:bit], _saniye([son - offset])[0], side='right'))
+
+    def sembol(self, symbol, periyot=None):
+        """(tarihler, {alan: 1-B görünüm}) döndürür; görünümler sembolün son barında biter.
+
+        Satır bitişik olduğundan kopya yapılmaz. Sembolün ilk barından önceki günler NaN'dır.
+        """
+        i = self._indeks[symbol.upper()]
+        bit = self._son[i] + 1
+        gecerli = ~np.isnan(self._alanlar['Close'][i, :bit]) if periyot and PERIYOTLAR[periyot][0] == "d" else None
+        bas = self._baslangic(bit, periyot, gecerli)
+        return self.tarihler(bas, bit), {alan: dizi[i, bas:bit] for alan, dizi in self._alanlar.items()}
+
+    def cerceve(self, symbol, periyot=None):
+        """Sembolün barlarını BarStore.get_history biçiminde (float64) DataFrame olarak döndürür.
+
+        teknik_analiz gibi tablo bekleyen kodlar içindir; yalnızca bu sembolün
+        satırı kopyalanır ve bar olmayan günler atlanır.
+        """
+        with self._kilit:
+            tarihler, alanlar = self.sembol(symbol, periyot)
+            var = ~np.isnan(alanlar['Close'])
+            return pd.DataFrame({alan: dizi[var] if alan == 'Volume' else dizi[var].astype(np.float64)
+                                 for alan, dizi in alanlar.items()}, index=tarihler[var])
+
+    def kesit(self, tarih):
+        """Bir günün tüm semboller için {alan: 1-B adımlı görünüm} sözlüğü; gün yoksa KeyError."""
+        ts = _saniye([pd.Timestamp(tarih)])[0]
+        j = int(np.searchsorted(self._gunler, ts))
+        if j >= len(self._gunler) or self._gunler[j] != ts:
+            raise KeyError(tarih)
+        return {alan: dizi[:, j] for alan, dizi in self._alanlar.items()}
+
+    def matris(self, alan, periyot=None):
+        """(tarihler, sembol x gün görünümü) döndürür; periyot panelin son gününe göre kesilir."""
+        bit = len(self._gunler)
+        bas = self._baslangic(bit, periyot)
+        return self.tarihler(bas, bit), self._alanlar[alan][:, bas:bit]
+
+    def alt_matrisler(self, semboller, alanlar=tuple(ALANLAR), periyot=None, dtype=np.float64):
+        """Verilen sembollerin (panelde olanların) satırları: (semboller, tarihler, {alan: kopya}).
+
+        Yalnızca seçili satırların istenen penceresi `dtype`'a çevrilerek kopyalanır;
+        seçili sembollerin hiçbirinin barı olmayan günler çıkarılır.
+        """
+        with self._kilit:
+            secili = [s.upper() for s in semboller if s.upper() in self._indeks]
+            satir = [self._indeks[s] for s in secili]
+            bit = len(self._gunler)
+            bas = self._baslangic(bit, periyot)
+            dolu = ~np.isnan(self._alanlar['Close'][satir, bas:bit]).all(axis=0)
+            sutun = bas + np.flatnonzero(dolu)
+            matrisler = {alan: self._alanlar[alan][np.ix_(satir, sutun)].astype(dtype) for alan in alanlar}
+            return secili, self.tarihler()[sutun], matrisler
+
+    # -- yazma --
+
+    def guncelle(self, bar_store, semboller, periyot="1y"):
+        """Sembollerin panelde olmayan barlarını BarStore'dan okuyup ekler; eklenen sembol sayısını döndürür.
+
+        Paneldeki ve periyodu karşılanan semboller için yalnızca son bardan (o dahil,
+        henüz kapanmamış olabilir) sonrası okunur.
+        """
+        semboller = list(dict.fromkeys(s.upper() for s in semboller))
+        sonra = {}
+        for symbol in semboller:
+            i = self._indeks.get(symbol)
+            if i is not None and PERIYOT_SIRASI.index(self._periyotlar[i]) >= PERIYOT_SIRASI.index(periyot):
+                sonra[symbol] = pd.Timestamp(int(self._gunler[self._son[i]]) - 1, unit='s', tz='UTC')
+        frames = bar_store.yeni_barlar(semboller, "1d", sonra, periyot)
+        return self.ekle(frames, {s: periyot for s in semboller if s not in sonra})
+
+    def ekle(self, frames, periyotlar=None):
+        """{sembol: OHLCV} barlarını yazar; aynı günün barı varsa üzerine yazılır.
+
+        `periyotlar` {sembol: periyot} verilirse o sembollerin ne kadar geçmişi
+        kapsadığı kaydedilir (daha kısa bir periyot kaydı daraltmaz). Barı olmayan
+        semboller panele eklenmez.
+        """
+        if self.salt_okunur:
+            raise ValueError("Fiyat paneli salt okunur açıldı")
+        frames = {s.upper(): df.sort_index() for s, df in frames.items() if df is not None and not df.empty}
+        if not frames:
+            return 0
+
+        with self._kilit, span('fiyat_paneli'):
+            zamanlar = {s: _saniye(df.index) for s, df in frames.items()}
+            yeni_semboller = [s for s in frames if s not in self._indeks]
+            gelen = np.unique(np.concatenate(list(zamanlar.values())))
+            eksik = np.setdiff1d(gelen, self._gunler, assume_unique=True)
+
+            son_gun = self._gunler[-1] if len(self._gunler) else None
+            araya = len(eksik) and son_gun is not None and eksik[0] <= son_gun
+            if araya or len(self._gunler) + len(eksik) > self.kapasite:
+                self._yeniden_kur(np.union1d(self._gunler, gelen), self.semboller + yeni_semboller)
+            else:
+                if yeni_semboller:
+                    self._satir_ekle(yeni_semboller)
+                if len(eksik):
+                    # Yeni günler ayrılan paya yazılır; mevcut satırların yeri değişmez
+                    gunler = np.memmap(self._dosya('gunler'), dtype=np.int64, mode='r+', shape=(self.kapasite,))
+                    gunler[len(self._gunler):len(self._gunler) + len(eksik)] = eksik
+                    gunler.flush()
+                    self._gunler = np.concatenate([self._gunler, eksik])
+
+            for symbol, df in frames.items():
+                i = self._indeks[symbol]
+                j = np.searchsorted(self._gunler, zamanlar[symbol])
+                for alan, dizi in self._alanlar.items():
+                    degerler = df[alan].to_numpy(dtype=np.float64)
+                    if alan == 'Volume':
+                        degerler = np.nan_to_num(degerler).astype(np.int64)
+                    dizi[i, j] = degerler
+                self._son[i] = max(self._son[i], int(j[-1]))
+            for symbol, periyot in (periyotlar or {}).items():
+                i = self._indeks.get(symbol.upper())
+                if i is not None and PERIYOT_SIRASI.index(periyot) > PERIYOT_SIRASI.index(self._periyotlar[i]):
+                    self._periyotlar[i] = periyot
+
+            for dizi in self._alanlar.values():
+                if isinstance(dizi, np.memmap):
+                    dizi.flush()
+            self._meta_yaz()
+        return len(frames)
+
+    def _satir_ekle(self, semboller):
+        # Satırlar C sırasıyla dosya sonuna eklenir; mevcut satırlar ve görünümler yerinde kalır
+        for alan in ALANLAR:
+            if self.kapasite:
+                with open(self._dosya(alan), 'ab') as f:
+                    np.full((len(semboller), self.kapasite), _bos(alan), dtype=ALANLAR[alan]).tofile(f)
+        for symbol in semboller:
+            self._indeks[symbol] = len(self.semboller)
+            self.semboller.append(symbol)
+            self._son.append(0)
+            self._periyotlar.append(PERIYOT_SIRASI[0])
+        self._alanlar = {alan: self._esle(alan, len(self.semboller)) for alan in ALANLAR}
+
+    def _yeniden_kur(self, gunler, semboller):
+        """Dosyaları yeni gün ekseni ve sembol listesiyle yeni nesil olarak yazar; eski veri taşınır."""
+        eski_nesil, eski_gunler, eski_alanlar = self.nesil, self._gunler, self._alanlar
+        n_eski = len(self.semboller)
+        konum = np.searchsorted(gunler, eski_gunler)
+
+        self.nesil += 1
+        self.kapasite = len(gunler) + GUN_PAYI
+        sayfa = np.full(self.kapasite, 0, dtype=np.int64)
+        sayfa[:len(gunler)] = gunler
+        sayfa.tofile(self._dosya('gunler'))
+
+        yeni_alanlar = {}
+        for alan in ALANLAR:
+            dizi = self._esle(alan, len(semboller), mod='w+')
+            for bas in range(0, len(semboller), KOPYA_BLOGU):
+                blok = dizi[bas:bas + KOPYA_BLOGU]
+                blok[:] = _bos(alan)
+                if bas < n_eski and len(eski_gunler):
+                    bit = min(bas + KOPYA_BLOGU, n_eski)
+                    blok[:bit - bas, konum] = eski_alanlar[alan][bas:bit, :len(eski_gunler)]
+            dizi.flush()
+            yeni_alanlar[alan] = dizi
+
+        self._son = [int(konum[s]) if len(eski_gunler) else 0 for s in self._son]
+        self._gunler = np.asarray(gunler, dtype=np.int64)
+        self._tarih_indeksi = None
+        self._alanlar = yeni_alanlar
+        for symbol in semboller[n_eski:]:
+            self._indeks[symbol] = len(self.semboller)
+            self.semboller.append(symbol)
+            self._son.append(0)
+            self._periyotlar.append(PERIYOT_SIRASI[0])
+        self._meta_yaz()
+
+        # Eski nesil, açık görünümü olan okuyucular varsa (ör. Windows) silinemeyebilir
+        for ad in list(ALANLAR) + ['gunler']:
+            try:
+                os.remove(self._dosya(ad, eski_nesil))
+            except OSError:
+                pass
+
+    def _meta_yaz(self):
+        self.degisiklik += 1
+        meta = {
+            'bicim': BICIM_SURUMU,
+            'nesil': self.nesil,
+            'kapasite': self.kapasite,
+            'gun_sayisi': len(self._gunler),
+            'semboller': self.semboller,
+            'son': self._son,
+            'periyotlar': self._periyotlar,
+            'degisiklik': self.degisiklik,
+        }
+        path = os.path.join(self.dizin, META_DOSYASI)
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(path + '.tmp', path)
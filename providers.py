@@ -0,0 +1,329 @@
+"""Piyasa verisi kaynakları.
+
+Geçmiş barlar, toplu son fiyatlar, temel veriler ve hisse listesi `VeriSaglayici`
+arayüzü üzerinden alınır. `YFinanceSaglayici` Yahoo Finance ve Asenax'a bağlanır,
+`KayitSaglayici` daha önce kaydedilmiş dosyalardan ağsız ve her seferinde aynı
+sonucu verir. `saglayici()` süreç genelinde paylaşılan, eşzamanlı aynı istekleri
+birleştiren örneği döndürür; kaynak `BORSA_VERI_KAYNAGI` ortam değişkeniyle seçilir:
+
+    BORSA_VERI_KAYNAGI=yfinance                 # varsayılan
+    BORSA_VERI_KAYNAGI=kayit                    # benchmarks/fixtures
+    BORSA_VERI_KAYNAGI=kayit:/yol/kayit_dizini
+
+pandas ve yfinance ilk istekte yüklenir; modül açılışta içe aktarılabilir.
+"""
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+
+from diagnostics import ag_cagrisi, say, span
+
+ASENAX_URL = "https://api.asenax.com/bist/list/"
+
+# Kayıt dizini düzeni `python -m benchmarks.fixtures --record` çıktısıyla aynıdır
+VARSAYILAN_KAYIT_DIZINI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+
+
+class VeriSaglayici(ABC):
+    """Piyasa verisi kaynağı arayüzü. Semboller `.IS` eki olmadan verilir."""
+
+    @abstractmethod
+    def gecmis(self, symbols, interval="1d", period=None, start=None, end=None):
+        """{sembol: OHLCV DataFrame} döndürür; verisi olmayan semboller sözlükte yer almaz."""
+
+    @abstractmethod
+    def fiyatlar(self, symbols):
+        """{sembol: son kapanış fiyatı} döndürür."""
+
+    @abstractmethod
+    def temel(self, symbol):
+        """`info` sözlüğünü döndürür; alınamazsa hata fırlatır."""
+
+    @abstractmethod
+    def hisse_listesi(self):
+        """BIST hisse kodları listesini döndürür; alınamazsa None."""
+
+    def onbellek_yolu(self, varsayilan):
+        """Bu kaynaktan gelen verinin saklanacağı SQLite dosyası."""
+        return varsayilan
+
+
+class TokenKovasi:
+    """Saniyede `hiz` isteğe, en fazla `kapasite` isteklik ani yüke izin verir."""
+
+    def __init__(self, hiz, kapasite):
+        self.hiz = hiz
+        self.kapasite = kapasite
+        self._jeton = float(kapasite)
+        self._son = time.monotonic()
+        self._kilit = threading.Lock()
+
+    def al(self, adet=1):
+        """Jeton yoksa gelene kadar bekler; beklenen süreyi döndürür."""
+        beklenen = 0.0
+        while True:
+            with self._kilit:
+                simdi = time.monotonic()
+                self._jeton = min(self.kapasite, self._jeton + (simdi - self._son) * self.hiz)
+                self._son = simdi
+                if self._jeton >= adet:
+                    self._jeton -= adet
+                    return beklenen
+                bekle = (adet - self._jeton) / self.hiz
+            time.sleep(bekle)
+            beklenen += bekle
+
+
+class YFinanceSaglayici(VeriSaglayici):
+    """Yahoo Finance (yfinance) ve hisse listesi için Asenax.
+
+    Her istek önce token kovasından jeton alır; hata olursa üstel bekleme ve
+    rastgele sapmayla `deneme` kez denenir.
+    """
+
+    def __init__(self, hiz=2.0, kapasite=5, deneme=3, bekleme=0.5, en_uzun_bekleme=8.0):
+        self.kova = TokenKovasi(hiz, kapasite)
+        self.deneme = deneme
+        self.bekleme = bekleme
+        self.en_uzun_bekleme = en_uzun_bekleme
+
+    def _dene(self, fn, *args, **kwargs):
+        for deneme in range(self.deneme):
+            self.kova.al()
+            try:
+                with span('yfinance'):
+                    sonuc = fn(*args, **kwargs)
+                ag_cagrisi(sonuc)
+                return sonuc
+            except Exception:
+                if deneme == self.deneme - 1:
+                    raise
+                say('yeniden_deneme')
+                bekle = min(self.en_uzun_bekleme, self.bekleme * 2 ** deneme)
+                time.sleep(bekle * random.uniform(0.5, 1.5))
+
+    def gecmis(self, symbols, interval="1d", period=None, start=None, end=None):
+        import pandas as pd
+        import yfinance as yf
+
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        zaman = {'period': period} if period is not None else {'start': start, 'end': end}
+
+        if len(symbols) == 1:
+            df = self._dene(lambda: yf.Ticker(f"{symbols[0]}.IS").history(interval=interval, **zaman))
+            return {symbols[0]: df} if df is not None and not df.empty else {}
+
+        tickers = [f"{s}.IS" for s in symbols]
+        df = self._dene(yf.download, tickers, interval=interval, group_by="ticker", progress=False,
+                        threads=True, auto_adjust=True, **zaman)
+        frames = {}
+        if df is None or df.empty:
+            return frames
+        if not isinstance(df.columns, pd.MultiIndex):
+            # Eski yfinance sürümleri tek sembolde sütunları gruplamaz
+            return {symbols[0]: df.dropna(how="all")}
+        for symbol, ticker in zip(symbols, tickers):
+            if ticker in df.columns.get_level_values(0):
+                frames[symbol] = df[ticker].dropna(how="all")
+        return frames
+
+    def fiyatlar(self, symbols):
+        import pandas as pd
+        import yfinance as yf
+
+        if not symbols:
+            return {}
+        tickers = [f"{s}.IS" for s in symbols]
+        df = self._dene(yf.download, tickers, period="5d", progress=False, threads=True, auto_adjust=False)
+        if df is None or df.empty:
+            return {}
+
+        close = df['Close']
+        if isinstance(close, pd.Series):
+            close = close.to_frame(tickers[0])
+
+        # Tatil/askıya alınmış hisselerde son satır boş olabilir, son geçerli değeri al
+        son = close.ffill().iloc[-1]
+        fiyatlar = {}
+        for ticker, fiyat in son.items():
+            if pd.notna(fiyat):
+                fiyatlar[ticker[:-3] if ticker.endswith(".IS") else ticker] = float(fiyat)
+        return fiyatlar
+
+    def temel(self, symbol):
+        import yfinance as yf
+        return self._dene(lambda: yf.Ticker(f"{symbol}.IS").info)
+
+    def hisse_listesi(self):
+        """Asenax API üzerinden BIST hisse listesini çeker, başarısız olursa None döndürür."""
+        import requests
+
+        def indir():
+            response = requests.get(ASENAX_URL, timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        try:
+            data = self._dene(indir)
+
+            # 'data' içindeki 'kod' alanlarını al ve listeye ekle
+            if data["code"] == "0":
+                hisseler = [item["kod"] for item in data["data"] if "kod" in item]
+                if hisseler:
+                    return hisseler
+                else:
+                    print("Asenax API boş liste döndürdü.")
+            else:
+                print(f"Asenax API başarısız yanıt döndürdü: {data['code']}")
+        except Exception as e:
+            print(f"Asenax API'den hisse listesi alınırken hata: {e}")
+        return None
+
+
+class KayitSaglayici(VeriSaglayici):
+    """Kayıt dizinindeki `ohlcv.csv.gz`, `info.json` ve (varsa) `hisse_listesi.json` dosyalarından okur.
+
+    Dosyalar benchmarks.fixtures ile aynı biçimde okunur; kayıt yoksa oradaki
+    sentetik veri kullanılır. Yalnızca günlük barlar vardır; `period` verilirse tüm kayıt döner ve periyot
+    BarStore tarafında kesilir. Kayıt gerçek önbellekle karışmasın diye veriler
+    bellekteki bir SQLite veritabanında tutulur.
+    """
+
+    def __init__(self, dizin=VARSAYILAN_KAYIT_DIZINI):
+        self.dizin = dizin
+        self._frames = None
+        self._infolar = None
+        self._kilit = threading.Lock()
+
+    def _yukle(self):
+        from benchmarks.fixtures import ohlcv_yukle
+
+        with self._kilit:
+            if self._frames is None:
+                self._frames = ohlcv_yukle(self.dizin)
+            return self._frames
+
+    def gecmis(self, symbols, interval="1d", period=None, start=None, end=None):
+        import pandas as pd
+
+        if interval != "1d":
+            return {}
+        frames = self._yukle()
+        sonuc = {}
+        for symbol in symbols:
+            df = frames.get(symbol)
+            if df is None:
+                continue
+            if start is not None:
+                df = df[df.index >= pd.Timestamp(start).tz_localize(df.index.tz)]
+            if end is not None:
+                df = df[df.index < pd.Timestamp(end).tz_localize(df.index.tz)]
+            if not df.empty:
+                sonuc[symbol] = df
+        return sonuc
+
+    def fiyatlar(self, symbols):
+        frames = self._yukle()
+        return {symbol: float(frames[symbol]['Close'].iloc[-1]) for symbol in symbols if symbol in frames}
+
+    def temel(self, symbol):
+        from benchmarks.fixtures import info_yukle
+
+        with self._kilit:
+            if self._infolar is None:
+                self._infolar = info_yukle(self.dizin)
+        if symbol not in self._infolar:
+            raise KeyError(f"{symbol} için kayıtlı temel veri yok")
+        return self._infolar[symbol]
+
+    def hisse_listesi(self):
+        try:
+            with open(os.path.join(self.dizin, 'hisse_listesi.json'), encoding='utf-8') as f:
+                return json.load(f)['hisseler']
+        except (OSError, ValueError, KeyError):
+            return sorted(self._yukle())
+
+    def onbellek_yolu(self, varsayilan):
+        return ':memory:'
+
+
+class Birlestirici(VeriSaglayici):
+    """Aynı anda yapılan özdeş istekleri alt sağlayıcıya tek istek olarak iletir.
+
+    İlk istek çalışırken gelen özdeşleri aynı Future'ı bekler ve aynı sonucu
+    (ya da hatayı) alır. Sonuçlar paylaşıldığı için çağıranlar onları değiştirmemelidir.
+    """
+
+    def __init__(self, alt):
+        self.alt = alt
+        self._bekleyenler = {}
+        self._kilit = threading.Lock()
+
+    def _birlestir(self, anahtar, fn, *args, **kwargs):
+        with self._kilit:
+            gelecek = self._bekleyenler.get(anahtar)
+            sahip = gelecek is None
+            if sahip:
+                gelecek = self._bekleyenler[anahtar] = Future()
+        if not sahip:
+            say('birlestirilen_istek')
+            return gelecek.result()
+
+        try:
+            sonuc = fn(*args, **kwargs)
+        except BaseException as e:
+            gelecek.set_exception(e)
+            raise
+        else:
+            gelecek.set_result(sonuc)
+            return sonuc
+        finally:
+            with self._kilit:
+                del self._bekleyenler[anahtar]
+
+    def gecmis(self, symbols, interval="1d", period=None, start=None, end=None):
+        symbols = tuple(symbols)
+        return self._birlestir(('gecmis', symbols, interval, period, str(start), str(end)),
+                               self.alt.gecmis, symbols, interval, period=period, start=start, end=end)
+
+    def fiyatlar(self, symbols):
+        symbols = tuple(symbols)
+        return self._birlestir(('fiyatlar', symbols), self.alt.fiyatlar, symbols)
+
+    def temel(self, symbol):
+        return self._birlestir(('temel', symbol), self.alt.temel, symbol)
+
+    def hisse_listesi(self):
+        return self._birlestir(('hisse_listesi',), self.alt.hisse_listesi)
+
+    def onbellek_yolu(self, varsayilan):
+        return self.alt.onbellek_yolu(varsayilan)
+
+
+def kaynaktan(kaynak):
+    """'yfinance', 'kayit' ya da 'kayit:<dizin>' tanımından sağlayıcı oluşturur."""
+    ad, _, dizin = kaynak.partition(':')
+    if ad == 'yfinance':
+        return YFinanceSaglayici()
+    if ad == 'kayit':
+        return KayitSaglayici(dizin or VARSAYILAN_KAYIT_DIZINI)
+    raise ValueError(f"Bilinmeyen veri kaynağı: {kaynak}")
+
+
+_saglayici = None
+_saglayici_kilidi = threading.Lock()
+
+
+def saglayici():
+    """Süreç genelinde paylaşılan (istekleri birleştiren) sağlayıcı."""
+    global _saglayici
+    with _saglayici_kilidi:
+        if _saglayici is None:
+            _saglayici = Birlestirici(kaynaktan(os.environ.get('BORSA_VERI_KAYNAGI', 'yfinance')))
+        return _saglayici
@@ -0,0 +1,47 @@
+import queue
+import threading
+
+from providers import saglayici
+
+
+def son_fiyatlari_getir(symbols):
+    """Tek bir toplu istekle sembollerin son kapanış fiyatlarını döndürür."""
+    if not symbols:
+        return {}
+    return dict(saglayici().fiyatlar(list(symbols)))
+
+
+class FiyatGuncelleyici:
+    """Fiyat isteklerini arka plandaki bir iş parçacığında toplu olarak çalıştırır.
+
+    Sonuçlar `sonuclar` kuyruğuna konur; Tk tarafı kuyruğu `after` ile boşaltır.
+    """
+
+    def __init__(self):
+        self.sonuclar = queue.Queue()
+        self._istekler = queue.Queue()
+        self._thread = threading.Thread(target=self._calis, daemon=True)
+        self._thread.start()
+
+    def iste(self, symbols):
+        self._istekler.put(list(symbols))
+
+    def durdur(self):
+        self._istekler.put(None)
+
+    def _calis(self):
+        while True:
+            symbols = self._istekler.get()
+            if symbols is None:
+                break
+            # Bekleyen eski istekler varsa yalnızca en sonuncusunu çalıştır
+            while not self._istekler.empty():
+                sonraki = self._istekler.get()
+                if sonraki is None:
+                    return
+                symbols = sonraki
+            try:
+                self.sonuclar.put(son_fiyatlari_getir(symbols))
+            except Exception as e:
+                print(f"Fiyat güncelleme hatası: {e}")
+                self.sonuclar.put({})
@@ -0,0 +1,247 @@
+"""Bir hisse listesi için toplu analiz raporu: teknik/temel rapor metni, çizgi ve mum grafikleri.
+
+Barlar tek toplu istekle BarStore'dan, temel veriler TemelVeriOnbellegi'nden (süresi
+dolmamışsa ağa çıkmadan) alınır. Analiz ve grafik çizimi süreç havuzunda, ekransız
+Agg arka ucuyla yapılır; işçiler yalnızca sonuç sözlüğünü ve PNG baytlarını döndürür.
+Sonuçlar giriş sırasıyla tek bir HTML (görseller gömülü) ya da PDF dosyasına yazılır.
+"""
+import base64
+import html
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from analysis import hisse_analizi, rapor_metni, teknik_analiz
+from diagnostics import span
+
+BICIMLER = ('html', 'pdf')
+
+# Grafik boyutları (inç) ve çözünürlük; çizgi grafik pencere boyutuyla aynı oranda
+CIZGI_BOYUTU = (12, 9)
+MUM_BOYUTU = (11, 8.5)
+DPI = 80
+
+# PDF sayfası (A4 yatay) ve özet sayfası başına satır
+SAYFA_BOYUTU = (11.69, 8.27)
+OZET_SATIRI = 40
+
+
+# Süreç başına bir kez kurulup her sembolde yeniden kullanılan grafikler (eksenler ve
+# yerleşim her seferinde baştan hesaplanmaz, yalnızca veri yazılır)
+_grafikler = {}
+
+
+def _havuz_baslat():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _grafik(sinif, boyut, **kwargs):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    if sinif not in _grafikler:
+        # Mumların gruplanması eksenin piksel genişliğine bağlı olduğundan tuval baştan bağlanır
+        fig = Figure(figsize=boyut, dpi=DPI)
+        FigureCanvasAgg(fig)
+        _grafikler[sinif] = sinif(fig, 'white', **kwargs)
+    return _grafikler[sinif]
+
+
+def _png(fig):
+    tampon = io.BytesIO()
+    fig.canvas.print_png(tampon)
+    return tampon.getvalue()
+
+
+def sembol_raporu(symbol, periyot, df, temel_kaydi=None):
+    """Tek sembolün analizini, rapor metnini ve iki grafiğin PNG'sini üretir (süreç havuzunda çalışır).
+
+    `temel_kaydi` TemelVeriOnbellegi.get sonucudur, (info, fetched_at). Veri yetersizse ValueError.
+    """
+    from charts import CizgiGrafik, MumGrafik, cizgi_verisi, mum_verisi
+
+    with span('sembol_raporu'):
+        gostergeli = teknik_analiz(df) if df is not None and len(df) else None
+        temel_veri = {symbol: temel_kaydi} if temel_kaydi is not None else None
+        # Göstergeler grafik için zaten hesaplandı; hisse_analizi aynı tabloyu kullanır
+        analiz = hisse_analizi(symbol, periyot, df, temel_veri, hesapla=lambda fn, veri: gostergeli)
+
+        grafik = _grafik(CizgiGrafik, CIZGI_BOYUTU, animasyonlu=False)
+        grafik.uygula(cizgi_verisi(gostergeli, symbol, periyot, CIZGI_BOYUTU[0] * DPI))
+        cizgi = _png(grafik.fig)
+
+        grafik = _grafik(MumGrafik, MUM_BOYUTU)
+        grafik.uygula(mum_verisi(df, symbol, periyot))
+        mum = _png(grafik.fig)
+
+    return {'analiz': analiz, 'metin': rapor_metni(analiz), 'cizgi': cizgi, 'mum': mum}
+
+
+def rapor_paketi(symbols, periyot, yol, bar_store, temel_veri=None, isci=None,
+                 ilerleme=None, iptal=None):
+    """`symbols` için raporları üretip `yol`a yazar; biçim uzantıdan (.html / .pdf) belirlenir.
+
+    `ilerleme(biten, toplam)` her sembol bittiğinde ana akışta çağrılır ve istisna
+    fırlatarak işi kesebilir; `iptal()` True dönerse kalan semboller atlanır ve dosya
+    yazılmaz. (yazılan sembol sayısı, [(sembol, hata)]) döndürür.
+    """
+    bicim = os.path.splitext(yol)[1].lstrip('.').lower()
+    if bicim not in BICIMLER:
+        raise ValueError(f"Desteklenmeyen rapor biçimi: {yol} (.html ya da .pdf olmalı)")
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+    isci = isci or max(1, (os.cpu_count() or 2) - 1)
+
+    sonuclar, hatalar = {}, {}
+    with ThreadPoolExecutor(max_workers=4) as temel_havuzu:
+        # Temel veriler (önbellekte değilse) barlar okunurken ayrı iş parçacıklarında alınır
+        temeller = {symbol: temel_havuzu.submit(temel_veri.get, symbol) for symbol in symbols} if temel_veri else {}
+        frames = bar_store.get_many(symbols, periyot)
+
+        with ProcessPoolExecutor(max_workers=isci, initializer=_havuz_baslat) as havuz:
+            futures = {}
+            for symbol in symbols:
+                df = frames.get(symbol)
+                if df is None or df.empty:
+                    hatalar[symbol] = "Veri bulunamadı"
+                    continue
+                temel_kaydi = temeller[symbol].result() if symbol in temeller else None
+                futures[havuz.submit(sembol_raporu, symbol, periyot, df, temel_kaydi)] = symbol
+
+            try:
+                biten = len(hatalar)
+                for future in as_completed(futures):
+                    symbol = futures[future]
+                    try:
+                        sonuclar[symbol] = future.result()
+                    except Exception as e:
+                        hatalar[symbol] = str(e)
+                    biten += 1
+                    if ilerleme is not None:
+                        ilerleme(biten, len(symbols))
+                    if iptal is not None and iptal():
+                        break
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            if iptal is not None and iptal():
+                for future in futures:
+                    future.cancel()
+                return 0, []
+
+    sirali = [sonuclar[s] for s in symbols if s in sonuclar]
+    hatalar = [(s, hatalar[s]) for s in symbols if s in hatalar]
+    baslik = f"Hisse Raporu - {periyot} - {datetime.now().strftime('%d.%m.%Y %H:%M')}"
+    with span('rapor_yaz'):
+        if bicim == 'html':
+            with open(yol, 'w', encoding='utf-8') as f:
+                html_yaz(sirali, hatalar, baslik, f)
+        else:
+            pdf_yaz(sirali, hatalar, baslik, yol)
+    return len(sirali), hatalar
+
+
+def ozet_satiri(analiz):
+    fiyat = analiz['fiyat']
+    return (analiz['symbol'], f"{fiyat['son']:.2f}", f"{fiyat['yuzde']:+.2f}",
+            f"{analiz['teknik']['RSI']:.1f}", str(analiz['puan']), analiz['sinyal'])
+
+
+OZET_SUTUNLARI = ('Hisse', 'Son Fiyat', 'Değişim %', 'RSI', 'Puan', 'Sinyal')
+
+
+def html_yaz(sonuclar, hatalar, baslik, f):
+    """Görselleri base64 gömülü, tek başına açılabilen bir HTML yazar."""
+    e = html.escape
+    f.write(f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>{e(baslik)}</title>
+<style>
+body {{ font-family: "Segoe UI", sans-serif; background: #f8f9fa; color: #2c3e50; margin: 2em; }}
+table {{ border-collapse: collapse; background: white; }}
+th, td {{ border: 1px solid #dee2e6; padding: 4px 12px; text-align: center; }}
+th {{ background: #2c3e50; color: white; }}
+section {{ background: white; margin: 2em 0; padding: 1em 2em; page-break-before: always; }}
+pre {{ font-family: Consolas, monospace; font-size: 13px; white-space: pre-wrap; }}
+img {{ max-width: 100%; display: block; margin: 1em 0; }}
+</style>
+</head>
+<body>
+<h1>{e(baslik)}</h1>
+<table>
+<tr>{''.join(f'<th>{e(s)}</th>' for s in OZET_SUTUNLARI)}</tr>
+""")
+    for sonuc in sonuclar:
+        symbol, *hucreler = ozet_satiri(sonuc['analiz'])
+        f.write(f'<tr><td><a href="#{e(symbol)}">{e(symbol)}</a></td>'
+                f"{''.join(f'<td>{e(h)}</td>' for h in hucreler)}</tr>\n")
+    f.write("</table>\n")
+    if hatalar:
+        f.write("<h3>Rapor oluşturulamayan hisseler</h3>\n<ul>\n")
+        for symbol, hata in hatalar:
+            f.write(f"<li>{e(symbol)}: {e(hata)}</li>\n")
+        f.write("</ul>\n")
+
+    for sonuc in sonuclar:
+        symbol = sonuc['analiz']['symbol']
+        f.write(f'<section id="{e(symbol)}">\n<pre>{e(sonuc["metin"].strip())}</pre>\n')
+        for anahtar, ad in (('cizgi', 'Teknik grafik'), ('mum', 'Mum grafiği')):
+            veri = base64.b64encode(sonuc[anahtar]).decode('ascii')
+            f.write(f'<img alt="{e(symbol)} {ad}" src="data:image/png;base64,{veri}">\n')
+        f.write("</section>\n")
+    f.write("</body>\n</html>\n")
+
+
+def _pdf_metni(metin):
+    # Emojiler PDF yazı tiplerinde bulunmadığı için atlanır
+    return ''.join(ch for ch in metin if ord(ch) <= 0xFFFF)
+
+
+def pdf_yaz(sonuclar, hatalar, baslik, yol):
+    """Özet sayfalarından sonra her hisse için rapor + çizgi grafik ve mum grafiği sayfaları yazar."""
+    import matplotlib.image as mpimg
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+
+    def sayfa():
+        return Figure(figsize=SAYFA_BOYUTU)
+
+    def resim(fig, png, konum):
+        ax = fig.add_axes(konum)
+        ax.imshow(mpimg.imread(io.BytesIO(png), format='png'), interpolation='none')
+        ax.set_axis_off()
+
+    with PdfPages(yol) as pdf:
+        satirlar = [ozet_satiri(s['analiz']) for s in sonuclar]
+        for bas in range(0, max(len(satirlar), 1), OZET_SATIRI):
+            fig = sayfa()
+            fig.text(0.05, 0.95, baslik, fontsize=14, weight='bold', va='top')
+            parca = satirlar[bas:bas + OZET_SATIRI]
+            if parca:
+                ax = fig.add_axes([0.05, 0.05, 0.9, 0.85])
+                ax.set_axis_off()
+                tablo = ax.table(cellText=parca, colLabels=OZET_SUTUNLARI, loc='upper center', cellLoc='center')
+                tablo.auto_set_font_size(False)
+                tablo.set_fontsize(8)
+            pdf.savefig(fig)
+
+        if hatalar:
+            fig = sayfa()
+            fig.text(0.05, 0.95, "Rapor oluşturulamayan hisseler", fontsize=14, weight='bold', va='top')
+            fig.text(0.05, 0.9, '\n'.join(f"{s}: {h}" for s, h in hatalar), fontsize=9, va='top',
+                     family='monospace')
+            pdf.savefig(fig)
+
+        for sonuc in sonuclar:
+            fig = sayfa()
+            fig.text(0.02, 0.98, _pdf_metni(sonuc['metin'].strip()), fontsize=6.5, va='top', family='monospace')
+            resim(fig, sonuc['cizgi'], [0.42, 0.05, 0.57, 0.9])
+            pdf.savefig(fig)
+
+            fig = sayfa()
+            resim(fig, sonuc['mum'], [0.02, 0.02, 0.96, 0.96])
+            pdf.savefig(fig)
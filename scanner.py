@@ -0,0 +1,115 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from analysis import MIN_BAR, teknik_analiz, sinyal_puani, sinyal_seviyesi
+
+
+def tara_sembol(symbol, df):
+    """Tek bir sembol için teknik analiz ve sinyal puanını hesaplar (süreç havuzunda çalışır)."""
+    if df is None or len(df) < MIN_BAR:
+        return None
+    df = teknik_analiz(df)
+    if df is None:
+        return None
+
+    buy_signal, yuksek_hacim = sinyal_puani(df)
+    son = df.iloc[-1]
+    onceki = df['Close'].iloc[-2]
+    return {
+        'symbol': symbol,
+        'puan': buy_signal,
+        'fiyat': float(son['Close']),
+        'degisim': float((son['Close'] / onceki - 1) * 100),
+        'rsi': float(son['RSI']),
+        'yuksek_hacim': yuksek_hacim,
+        'sinyal': sinyal_seviyesi(buy_signal)[0],
+    }
+
+
+# Süreç başına açık fiyat paneli; panel yazıldıkça (degisiklik) yeniden açılır
+_paneller = {}
+
+
+def tara_panelden(symbol, dizin, degisiklik, periyot):
+    """Sembolün barlarını fiyat panelinden okuyup tara_sembol'ü çalıştırır (süreç havuzunda çalışır).
+
+    Barlar süreçler arasında taşınmaz; işçi paneli salt okunur açar ve yalnızca
+    bu sembolün satırını kopyalar.
+    """
+    from price_panel import FiyatPaneli
+
+    panel = _paneller.get(dizin)
+    try:
+        if panel is None or panel.degisiklik < degisiklik:
+            panel = _paneller[dizin] = FiyatPaneli(dizin, salt_okunur=True)
+        df = panel.cerceve(symbol, periyot) if symbol in panel else None
+    except FileNotFoundError:
+        # Panel bu arada yeni nesil olarak yeniden kurulmuş olabilir
+        panel = _paneller[dizin] = FiyatPaneli(dizin, salt_okunur=True)
+        df = panel.cerceve(symbol, periyot) if symbol in panel else None
+    return tara_sembol(symbol, df)
+
+
+class Tarayici:
+    """Sembol listesini parça parça toplu indirir ve puanlamayı süreç havuzunda yapar.
+
+    Bir parça hesaplanırken sonraki parça indirilir; her sonuç hazır olduğu anda
+    `sonuc_callback` ile bildirilir (havuzun iş parçacığından çağrılır).
+    `panel` (FiyatPaneli) verilirse parçalar panele yazılır ve işçiler barları
+    süreçler arası kopyalamak yerine panelden okur.
+    """
+
+    def __init__(self, bar_store, isci=None, parca=100, panel=None):
+        self.bar_store = bar_store
+        self.isci = isci or max(1, (os.cpu_count() or 2) - 1)
+        self.parca = parca
+        self.panel = panel
+
+    def tara(self, symbols, periyot, sonuc_callback, ilerleme_callback=None, iptal=None):
+        toplam = len(symbols)
+        bitenler = [0]
+        kilit = threading.Lock()
+
+        def tamamlandi(future):
+            with kilit:
+                bitenler[0] += 1
+                biten = bitenler[0]
+            if not future.cancelled() and future.exception() is None and future.result():
+                sonuc_callback(future.result())
+            elif not future.cancelled() and future.exception() is not None:
+                print(f"Tarama hatası: {future.exception()}")
+            if ilerleme_callback is not None:
+                ilerleme_callback(biten, toplam)
+
+        with ProcessPoolExecutor(max_workers=self.isci) as havuz:
+            futures = []
+            for i in range(0, toplam, self.parca):
+                if iptal is not None and iptal():
+                    break
+                parca = symbols[i:i + self.parca]
+                if self.panel is not None:
+                    try:
+                        self.panel.guncelle(self.bar_store, parca, periyot)
+                    except Exception as e:
+                        print(f"Toplu veri indirme hatası: {e}")
+                    for symbol in parca:
+                        future = havuz.submit(tara_panelden, symbol, self.panel.dizin, self.panel.degisiklik, periyot)
+                        future.add_done_callback(tamamlandi)
+                        futures.append(future)
+                    continue
+
+                try:
+                    frames = self.bar_store.get_many(parca, periyot)
+                except Exception as e:
+                    print(f"Toplu veri indirme hatası: {e}")
+                    frames = {}
+                for symbol in parca:
+                    future = havuz.submit(tara_sembol, symbol, frames.get(symbol))
+                    future.add_done_callback(tamamlandi)
+                    futures.append(future)
+
+            if iptal is not None and iptal():
+                for future in futures:
+                    future.cancel()
+            wait(futures)
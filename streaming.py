@@ -0,0 +1,276 @@
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+class ArtimliEMA:
+    """pandas `ewm(adjust=False, min_periods=...)` ile aynı sonucu veren artımlı EMA."""
+
+    def __init__(self, alpha, min_periods):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.deger = NAN
+        self.sayac = 0
+
+    def guncelle(self, x):
+        if x != x:
+            return self.sonuc()
+        if self.sayac == 0:
+            self.deger = x
+        else:
+            self.deger += self.alpha * (x - self.deger)
+        self.sayac += 1
+        return self.sonuc()
+
+    def sonuc(self):
+        return self.deger if self.sayac >= self.min_periods else NAN
+
+    def durum(self):
+        return {'deger': self.deger, 'sayac': self.sayac}
+
+    def yukle(self, durum):
+        self.deger, self.sayac = durum['deger'], durum['sayac']
+
+
+class ArtimliRSI:
+    """Wilder ortalamalarıyla RSI."""
+
+    def __init__(self, window=14):
+        self.up = ArtimliEMA(1 / window, window)
+        self.down = ArtimliEMA(1 / window, window)
+        self.onceki = NAN
+
+    def guncelle(self, close):
+        fark = close - self.onceki
+        self.onceki = close
+        emaup = self.up.guncelle(fark if fark > 0 else 0.0)
+        emadn = self.down.guncelle(-fark if fark < 0 else 0.0)
+        if emadn == 0:
+            return 100.0
+        return 100 - (100 / (1 + emaup / emadn))
+
+    def durum(self):
+        return {'up': self.up.durum(), 'down': self.down.durum(), 'onceki': self.onceki}
+
+    def yukle(self, durum):
+        self.up.yukle(durum['up'])
+        self.down.yukle(durum['down'])
+        self.onceki = durum['onceki']
+
+
+class ArtimliMACD:
+    def __init__(self, fast=12, slow=26, sign=9):
+        self.fast = ArtimliEMA(2 / (fast + 1), fast)
+        self.slow = ArtimliEMA(2 / (slow + 1), slow)
+        self.signal = ArtimliEMA(2 / (sign + 1), sign)
+
+    def guncelle(self, close):
+        macd = self.fast.guncelle(close) - self.slow.guncelle(close)
+        # Sinyal hattı MACD geçerli olduğu andan itibaren başlar
+        return macd, self.signal.guncelle(macd)
+
+    def durum(self):
+        return {'fast': self.fast.durum(), 'slow': self.slow.durum(), 'signal': self.signal.durum()}
+
+    def yukle(self, durum):
+        self.fast.yukle(durum['fast'])
+        self.slow.yukle(durum['slow'])
+        self.signal.yukle(durum['signal'])
+
+
+class KayanPencere:
+    """Sabit pencerede toplam ve kareler toplamını tutarak ortalama ve (ddof=0) sapma verir."""
+
+    # Kayan toplamlardaki yuvarlama birikimini temizlemek için arada bir baştan toplanır
+    YENIDEN_TOPLA = 10000
+
+    def __init__(self, window):
+        self.window = window
+        self.degerler = deque(maxlen=window)
+        self.toplam = 0.0
+        self.kare_toplam = 0.0
+        self._adim = 0
+
+    def guncelle(self, x):
+        if len(self.degerler) == self.window:
+            eski = self.degerler[0]
+            self.toplam -= eski
+            self.kare_toplam -= eski * eski
+        self.degerler.append(x)
+        self.toplam += x
+        self.kare_toplam += x * x
+
+        self._adim += 1
+        if self._adim >= self.YENIDEN_TOPLA:
+            self._adim = 0
+            self.toplam = math.fsum(self.degerler)
+            self.kare_toplam = math.fsum(v * v for v in self.degerler)
+
+    def ortalama(self):
+        if len(self.degerler) < self.window:
+            return NAN
+        return self.toplam / self.window
+
+    def sapma(self):
+        if len(self.degerler) < self.window:
+            return NAN
+        ortalama = self.toplam / self.window
+        return math.sqrt(max(self.kare_toplam / self.window - ortalama * ortalama, 0.0))
+
+    def durum(self):
+        return {'degerler': list(self.degerler)}
+
+    def yukle(self, durum):
+        self.degerler = deque(durum['degerler'], maxlen=self.window)
+        self.toplam = math.fsum(self.degerler)
+        self.kare_toplam = math.fsum(v * v for v in self.degerler)
+        self._adim = 0
+
+
+class KayanMinMax:
+    """Monoton kuyruklarla pencere içi en küçük/en büyük değer (bar başına amortize O(1))."""
+
+    def __init__(self, window):
+        self.window = window
+        self.indeks = 0
+        self.minler = deque()
+        self.maxlar = deque()
+
+    def guncelle(self, low, high):
+        i = self.indeks
+        self.indeks += 1
+        while self.minler and self.minler[-1][1] >= low:
+            self.minler.pop()
+        self.minler.append((i, low))
+        while self.maxlar and self.maxlar[-1][1] <= high:
+            self.maxlar.pop()
+        self.maxlar.append((i, high))
+
+        sinir = i - self.window
+        while self.minler[0][0] <= sinir:
+            self.minler.popleft()
+        while self.maxlar[0][0] <= sinir:
+            self.maxlar.popleft()
+
+        if self.indeks < self.window:
+            return NAN, NAN
+        return self.minler[0][1], self.maxlar[0][1]
+
+    def durum(self):
+        return {'indeks': self.indeks, 'minler': list(self.minler), 'maxlar': list(self.maxlar)}
+
+    def yukle(self, durum):
+        self.indeks = durum['indeks']
+        self.minler = deque(tuple(x) for x in durum['minler'])
+        self.maxlar = deque(tuple(x) for x in durum['maxlar'])
+
+
+class ArtimliGostergeler:
+    """teknik_analiz sütunlarını her yeni barda sabit zamanda güncelleyen gösterge seti.
+
+    `durum()` ile alınan anlık görüntü JSON'a yazılabilir; `durumdan()` ile geri
+    yüklenen nesne kaldığı bardan devam eder.
+    """
+
+    def __init__(self):
+        self.rsi = ArtimliRSI(14)
+        self.stoch = KayanMinMax(14)
+        self.macd = ArtimliMACD(12, 26, 9)
+        self.ema_20 = ArtimliEMA(2 / 21, 20)
+        self.ema_200 = ArtimliEMA(2 / 201, 200)
+        self.sma_50 = KayanPencere(50)
+        self.bollinger = KayanPencere(20)
+        self.obv = NAN
+        self.onceki_close = NAN
+
+    def guncelle(self, high, low, close, volume):
+        """Yeni barı işler ve gösterge değerlerini sözlük olarak döndürür."""
+        rsi = self.rsi.guncelle(close)
+        smin, smax = self.stoch.guncelle(low, high)
+        stoch = 100 * (close - smin) / (smax - smin) if smax != smin else NAN
+        macd, macd_signal = self.macd.guncelle(close)
+        ema_20 = self.ema_20.guncelle(close)
+        ema_200 = self.ema_200.guncelle(close)
+        self.sma_50.guncelle(close)
+        self.bollinger.guncelle(close)
+
+        hacim = volume if close >= self.onceki_close or self.onceki_close != self.onceki_close else -volume
+        self.obv = hacim if self.obv != self.obv else self.obv + hacim
+        self.onceki_close = close
+
+        bb_middle = self.bollinger.ortalama()
+        bb_std = self.bollinger.sapma()
+        return {
+            'RSI': rsi,
+            'Stoch_%K': stoch,
+            'MACD': macd,
+            'MACD_signal': macd_signal,
+            'EMA_20': ema_20,
+            'SMA_50': self.sma_50.ortalama(),
+            'EMA_200': ema_200,
+            'BB_upper': bb_middle + 2 * bb_std,
+            'BB_middle': bb_middle,
+            'BB_lower': bb_middle - 2 * bb_std,
+            'OBV': self.obv,
+        }
+
+    def durum(self):
+        return {
+            'rsi': self.rsi.durum(),
+            'stoch': self.stoch.durum(),
+            'macd': self.macd.durum(),
+            'ema_20': self.ema_20.durum(),
+            'ema_200': self.ema_200.durum(),
+            'sma_50': self.sma_50.durum(),
+            'bollinger': self.bollinger.durum(),
+            'obv': self.obv,
+            'onceki_close': self.onceki_close,
+        }
+
+    @classmethod
+    def durumdan(cls, durum):
+        g = cls()
+        g.rsi.yukle(durum['rsi'])
+        g.stoch.yukle(durum['stoch'])
+        g.macd.yukle(durum['macd'])
+        g.ema_20.yukle(durum['ema_20'])
+        g.ema_200.yukle(durum['ema_200'])
+        g.sma_50.yukle(durum['sma_50'])
+        g.bollinger.yukle(durum['bollinger'])
+        g.obv = durum['obv']
+        g.onceki_close = durum['onceki_close']
+        return g
+
+
+def son_gostergeler(bar_store, symbol, interval="1d"):
+    """Saklanan gösterge durumundan devam ederek sembolün son bar göstergelerini döndürür.
+
+    Yalnızca durumdan sonra gelen barlar işlenir. Son bar henüz kapanmamış olabileceği
+    için durum sondan bir önceki bar itibarıyla kaydedilir ve son bar her çağrıda
+    yeniden uygulanır. Hiç bar yoksa None döner.
+    """
+    kayit = bar_store.durum_oku(symbol, interval)
+    if kayit is None:
+        gostergeler, son_ts = ArtimliGostergeler(), None
+    else:
+        son_ts, durum = kayit
+        gostergeler = ArtimliGostergeler.durumdan(durum)
+
+    barlar = bar_store.bars_after(symbol, interval, son_ts)
+    if barlar.empty:
+        return None
+
+    # Durum JSON'a yazılacağı için NumPy tipleri yerine düz float kullanılır
+    ohlcv = barlar[['High', 'Low', 'Close', 'Volume']].to_numpy(dtype=float).tolist()
+    degerler = [(ts, *bar) for ts, bar in zip(barlar.index, ohlcv)]
+    for ts, high, low, close, volume in degerler[:-1]:
+        gostergeler.guncelle(high, low, close, volume)
+    if len(degerler) > 1:
+        bar_store.durum_kaydet(symbol, interval, degerler[-2][0], gostergeler.durum())
+
+    ts, high, low, close, volume = degerler[-1]
+    sonuc = gostergeler.guncelle(high, low, close, volume)
+    sonuc.update({'Close': close, 'Volume': volume, 'ts': ts})
+    return sonuc
+
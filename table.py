@@ -0,0 +1,330 @@
+"""Binlerce satırı Tk'yi kilitlemeden gösteren sanal tablo.
+
+Satırlar anahtarla (sembol, işlem id'si vb.) bellekte tutulur; Treeview'da yalnızca
+görünen satırlar ve küçük bir pay kadar öğe bulunur. Kaydırmada öğeler silinip
+eklenmez, yalnızca içeriği değişen öğelerin değerleri yazılır. Sıralama bellekteki
+sıralı listede ikili arama ile korunur; başlığa tıklamak veriyi yeniden sorgulamaz.
+"""
+import tkinter as tk
+from bisect import bisect_left, insort
+from tkinter import ttk
+
+# Görünen satırların altında hazır tutulan öğe sayısı
+PAY = 5
+
+# Tek seferde bu orandan fazla satır değişirse sıralı liste baştan kurulur
+YENIDEN_KURMA_ORANI = 0.25
+
+
+def _sira_degeri(deger):
+    """Sütun değerinin sıralama anahtarı; boş ve NaN değerler için None (her yönde sona gelir)."""
+    if deger is None or deger != deger:
+        return None
+    if isinstance(deger, str):
+        return (1, deger)
+    return (0, deger)
+
+
+class SanalTablo(tk.Frame):
+    """Anahtarlı satırları fark uygulayarak güncelleyen, sanallaştırılmış ve sıralanabilir tablo.
+
+    Satır değerleri ham tutulur (sayılar sayı olarak sıralanır); `bicimler` sütun adından
+    görüntü metnine çeviren fonksiyonlardır, boş ve NaN değerler `bos_metin` olarak gösterilir. `sirala_ile` bir sütunun başka bir sütunun
+    değerine göre sıralanmasını sağlar. `artan_sutunlar` dışındaki sütunlar ilk tıklamada
+    azalan sıralanır (varsayılan: ilk sütun artan).
+    """
+
+    def __init__(self, master, sutunlar, bicimler=None, genislik=120, sirala_ile=None, artan_sutunlar=None,
+                 siralama=None, azalan=False, style="Custom.Treeview", bos_metin="-", **kwargs):
+        super().__init__(master, **kwargs)
+        self.sutunlar = list(sutunlar)
+        self.bicimler = bicimler or {}
+        self.sirala_ile = sirala_ile or {}
+        self.artan_sutunlar = set(artan_sutunlar if artan_sutunlar is not None else self.sutunlar[:1])
+        self.bos_metin = bos_metin
+
+        self.tree = ttk.Treeview(self, columns=self.sutunlar, show='headings', style=style, height=1)
+        for sutun in self.sutunlar:
+            self.tree.heading(sutun, text=sutun, command=lambda s=sutun: self._basliga_tikla(s))
+            self.tree.column(sutun, width=genislik, anchor=tk.CENTER)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._kaydirma_cubugu)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+
+        satir = ttk.Style().lookup(style, 'rowheight')
+        self._satir_yuksekligi = int(satir) if satir else 20
+        self._gorunur = 1
+        self.bas = 0
+
+        self._degerler = {}
+        self._metinler = {}
+        # Sıralı görünüm: geçerli anahtarlar (sıra değeri, anahtar) olarak artan sırada, eksikler eklenme sırasıyla
+        self._sirali = []
+        self._eksik = []
+        self._sira = {}
+        self._ekleme_no = 0
+        self._siralama = None
+        self._siralama_sutunu = None
+        self._azalan = False
+
+        # Öğeler konum (slot) bazındadır; kaydırmada yalnızca değerleri değişir
+        self._slotlar = []
+        self._slot_icerik = []
+        self._secili = set()
+        # Programla yapılan seçimlerin ürettiği <<TreeviewSelect>> olayları sayılıp atlanır
+        self._secim_yaziliyor = 0
+        self._cizim_bekliyor = False
+
+        self.tree.bind('<Configure>', self._boyut_degisti)
+        self.tree.bind('<<TreeviewSelect>>', self._secim_degisti)
+        self.tree.bind('<MouseWheel>', lambda e: self._tekerlek(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self._tekerlek(-3))
+        self.tree.bind('<Button-5>', lambda e: self._tekerlek(3))
+        self.tree.bind('<Up>', lambda e: self._ok(-1))
+        self.tree.bind('<Down>', lambda e: self._ok(1))
+        self.tree.bind('<Prior>', lambda e: self._tekerlek(-self._gorunur))
+        self.tree.bind('<Next>', lambda e: self._tekerlek(self._gorunur))
+
+        if siralama is not None:
+            self.sirala(siralama, azalan)
+
+    def __len__(self):
+        return len(self._degerler)
+
+    def __contains__(self, anahtar):
+        return anahtar in self._degerler
+
+    def degerler(self, anahtar):
+        return self._degerler.get(anahtar)
+
+    def anahtarlar(self):
+        """Görüntülenen sırayla tüm anahtarlar."""
+        return [self._satir(i) for i in range(len(self))]
+
+    # --- Veri ---
+
+    def ayarla(self, anahtar, degerler):
+        """Satırı ekler ya da değerleri değiştiyse günceller; değişiklik olduysa True döndürür."""
+        degerler = tuple(degerler)
+        eski = self._degerler.get(anahtar)
+        if eski == degerler:
+            return False
+        if eski is not None:
+            self._siradan_cikar(anahtar)
+        else:
+            self._ekleme_no += 1
+            self._sira[anahtar] = self._ekleme_no
+        self._degerler[anahtar] = degerler
+        self._metinler[anahtar] = self._bicimle(degerler)
+        self._siraya_ekle(anahtar)
+        self._ciz()
+        return True
+
+    def sil(self, anahtar):
+        if anahtar not in self._degerler:
+            return False
+        self._siradan_cikar(anahtar)
+        del self._degerler[anahtar], self._metinler[anahtar], self._sira[anahtar]
+        self._secili.discard(anahtar)
+        self._ciz()
+        return True
+
+    def guncelle(self, satirlar):
+        """Tablonun tamamını {anahtar: değerler} durumuna getirir; yalnızca farkları uygular.
+
+        (eklenen, güncellenen, silinen) satır sayılarını döndürür.
+        """
+        silinecek = [anahtar for anahtar in self._degerler if anahtar not in satirlar]
+        degisen = {anahtar: tuple(d) for anahtar, d in satirlar.items() if self._degerler.get(anahtar) != tuple(d)}
+        eklenen = sum(1 for anahtar in degisen if anahtar not in self._degerler)
+
+        toplu = len(silinecek) + len(degisen) > YENIDEN_KURMA_ORANI * max(len(self._degerler), 1)
+        for anahtar in silinecek:
+            if not toplu:
+                self._siradan_cikar(anahtar)
+            del self._degerler[anahtar], self._metinler[anahtar], self._sira[anahtar]
+            self._secili.discard(anahtar)
+        for anahtar, degerler in degisen.items():
+            if anahtar in self._degerler:
+                if not toplu:
+                    self._siradan_cikar(anahtar)
+            else:
+                self._ekleme_no += 1
+                self._sira[anahtar] = self._ekleme_no
+            self._degerler[anahtar] = degerler
+            self._metinler[anahtar] = self._bicimle(degerler)
+            if not toplu:
+                self._siraya_ekle(anahtar)
+        if toplu:
+            self._yeniden_sirala()
+        self._ciz()
+        return eklenen, len(degisen) - eklenen, len(silinecek)
+
+    def temizle(self):
+        self.guncelle({})
+
+    def _bicimle(self, degerler):
+        metin = []
+        for sutun, deger in zip(self.sutunlar, degerler):
+            bicim = self.bicimler.get(sutun)
+            if deger is None or deger != deger:
+                metin.append(self.bos_metin)
+            else:
+                metin.append(bicim(deger) if bicim is not None else deger)
+        return tuple(metin)
+
+    # --- Sıralama ---
+
+    def _anahtar_degeri(self, anahtar):
+        if self._siralama is None:
+            return (0, self._sira[anahtar])
+        return _sira_degeri(self._degerler[anahtar][self._siralama])
+
+    def _siraya_ekle(self, anahtar):
+        deger = self._anahtar_degeri(anahtar)
+        if deger is None:
+            self._eksik.append(anahtar)
+        else:
+            insort(self._sirali, (deger, anahtar))
+
+    def _siradan_cikar(self, anahtar):
+        deger = self._anahtar_degeri(anahtar)
+        if deger is None:
+            self._eksik.remove(anahtar)
+        else:
+            del self._sirali[bisect_left(self._sirali, (deger, anahtar))]
+
+    def _yeniden_sirala(self):
+        self._sirali, self._eksik = [], []
+        for anahtar in self._degerler:
+            deger = self._anahtar_degeri(anahtar)
+            if deger is None:
+                self._eksik.append(anahtar)
+            else:
+                self._sirali.append((deger, anahtar))
+        self._sirali.sort()
+
+    def sirala(self, sutun, azalan=None):
+        """Bellekteki satırları `sutun`a göre sıralar; `azalan` verilmezse sütunun varsayılan yönü."""
+        if azalan is None:
+            azalan = sutun not in self.artan_sutunlar
+        for s in self.sutunlar:
+            self.tree.heading(s, text=s)
+        self.tree.heading(sutun, text=f"{sutun} {'▼' if azalan else '▲'}")
+        self._siralama = self.sutunlar.index(self.sirala_ile.get(sutun, sutun))
+        self._siralama_sutunu = sutun
+        self._azalan = azalan
+        self._yeniden_sirala()
+        self._ciz()
+
+    def _basliga_tikla(self, sutun):
+        if self._siralama is not None and self._siralama_sutunu == sutun:
+            self.sirala(sutun, not self._azalan)
+        else:
+            self.sirala(sutun)
+
+    def _satir(self, i):
+        """Görüntü sırasındaki i. satırın anahtarı."""
+        n = len(self._sirali)
+        if i >= n:
+            return self._eksik[i - n]
+        return self._sirali[n - 1 - i if self._azalan else i][1]
+
+    # --- Görüntü ---
+
+    def _ciz(self):
+        # Aynı olay turundaki değişiklikler tek çizimde birleştirilir
+        if not self._cizim_bekliyor:
+            self._cizim_bekliyor = True
+            self.after_idle(self._simdi_ciz)
+
+    def _simdi_ciz(self):
+        self._cizim_bekliyor = False
+        if not self.winfo_exists():
+            return
+        toplam = len(self)
+        self.bas = max(0, min(self.bas, toplam - self._gorunur))
+        adet = min(self._gorunur + PAY, toplam - self.bas)
+
+        while len(self._slotlar) < adet:
+            self._slotlar.append(self.tree.insert('', tk.END))
+            self._slot_icerik.append(None)
+        while len(self._slotlar) > adet:
+            self.tree.delete(self._slotlar.pop())
+            self._slot_icerik.pop()
+
+        secim = []
+        for i, slot in enumerate(self._slotlar):
+            anahtar = self._satir(self.bas + i)
+            icerik = (anahtar, self._metinler[anahtar])
+            # Yalnızca içeriği değişen öğeler Tk'ye yazılır
+            if self._slot_icerik[i] != icerik:
+                self.tree.item(slot, values=icerik[1])
+                self._slot_icerik[i] = icerik
+            if anahtar in self._secili:
+                secim.append(slot)
+
+        if set(secim) != set(self.tree.selection()):
+            self._secim_yaziliyor += 1
+            self.tree.selection_set(secim)
+        self.tree.yview_moveto(0)
+        if toplam:
+            self.scrollbar.set(self.bas / toplam, min(1.0, (self.bas + self._gorunur) / toplam))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _boyut_degisti(self, event):
+        baslik = self._satir_yuksekligi
+        if self._slotlar:
+            kutu = self.tree.bbox(self._slotlar[0])
+            if kutu:
+                baslik = kutu[1]
+        gorunur = max(1, (event.height - baslik) // self._satir_yuksekligi)
+        if gorunur != self._gorunur:
+            self._gorunur = gorunur
+            self._ciz()
+
+    def kaydir(self, bas):
+        bas = max(0, min(int(bas), len(self) - self._gorunur))
+        if bas != self.bas:
+            self.bas = bas
+            self._ciz()
+
+    def _tekerlek(self, satir):
+        self.kaydir(self.bas + satir)
+        return "break"
+
+    def _ok(self, yon):
+        # Seçim bir satır kayar; görünen alanın dışına çıkarsa tablo da kaydırılır
+        secim = self.tree.selection()
+        if not secim:
+            return None
+        hedef = self.bas + self._slotlar.index(secim[0]) + yon
+        if 0 <= hedef < len(self):
+            self._secili = {self._satir(hedef)}
+            if hedef < self.bas:
+                self.bas = hedef
+            elif hedef >= self.bas + self._gorunur:
+                self.bas = hedef - self._gorunur + 1
+            self._ciz()
+        return "break"
+
+    def _kaydirma_cubugu(self, islem, *args):
+        if islem == 'moveto':
+            self.kaydir(float(args[0]) * len(self))
+        elif islem == 'scroll':
+            miktar = int(args[0])
+            self.kaydir(self.bas + (miktar * self._gorunur if args[1] == 'pages' else miktar))
+
+    def _secim_degisti(self, event):
+        if self._secim_yaziliyor:
+            self._secim_yaziliyor -= 1
+            return
+        gorunen = {icerik[0] for icerik in self._slot_icerik if icerik is not None}
+        secili = {self._slot_icerik[self._slotlar.index(slot)][0] for slot in self.tree.selection()}
+        # Görünmeyen satırların seçimi korunur
+        self._secili = (self._secili - gorunen) | secili
+
+    def secili(self):
+        """Seçili satırların anahtarları (görünür alan dışındakiler dahil)."""
+        return [anahtar for anahtar in self._secili if anahtar in self._degerler]
@@ -0,0 +1,29 @@
+import pytest
+
+from importer import satiri_dogrula
+
+SUTUNLAR = {'symbol': 0, 'operation': 1, 'price': 2, 'quantity': 3, 'date': 4}
+
+
+def satir(price='10', quantity='5'):
+    return ['THYAO', 'Alış', price, quantity, '02.01.2024']
+
+
+@pytest.mark.parametrize('metin, beklenen', [
+    ('1.000', 1000.0),
+    ('1.000,50', 1000.5),
+    ('1,234.56', 1234.56),
+    ('12,5', 12.5),
+])
+def test_binlik_ve_ondalik_ayiricilar(metin, beklenen):
+    assert satiri_dogrula(satir(price=metin), SUTUNLAR)[2] == pytest.approx(beklenen)
+
+
+def test_binlik_ayiricili_adet():
+    assert satiri_dogrula(satir(quantity='1.000'), SUTUNLAR)[3] == 1000
+
+
+@pytest.mark.parametrize('metin', ['1.000,505', '1,2,3', '1.23.4', 'inf', 'nan'])
+def test_anlasilamayan_sayi_satir_hatasi(metin):
+    with pytest.raises(ValueError):
+        satiri_dogrula(satir(price=metin), SUTUNLAR)
@@ -0,0 +1,33 @@
+import pytest
+
+from portfolio import Portfolio
+
+
+@pytest.fixture
+def portfolio(tmp_path):
+    p = Portfolio(str(tmp_path / 'portfolio.db'))
+    yield p
+    p.close()
+
+
+def test_eslesmeyen_satis_maliyeti_pozisyon_adediyle(portfolio):
+    # Alımdan önceki satışın eşleşecek lotu yok; açık lotlar 10, pozisyon 5 adet
+    portfolio.add_transaction('A', 'SELL', 12.0, 5, '2024-01-01 10:00:00')
+    portfolio.add_transaction('A', 'BUY', 10.0, 10, '2024-01-02 10:00:00')
+
+    (symbol, adet, maliyet, _, ortalama), = portfolio.get_portfolio()
+    assert (symbol, adet) == ('A', 5)
+    assert ortalama == pytest.approx(10.0)
+    assert maliyet == pytest.approx(50.0)
+
+
+def test_geriye_tarihli_alim_satisi_eslestirir(portfolio):
+    portfolio.add_transaction('A', 'SELL', 12.0, 5, '2024-01-01 10:00:00')
+    portfolio.add_transaction('A', 'BUY', 10.0, 10, '2024-01-02 10:00:00')
+    # Satıştan önceye tarihlenen alım defteri yeniden kurar; satış artık bu lottan düşer
+    portfolio.add_transaction('A', 'BUY', 20.0, 10, '2023-12-29 10:00:00')
+
+    (symbol, adet, maliyet, _, ortalama), = portfolio.get_portfolio()
+    assert (symbol, adet) == ('A', 15)
+    assert maliyet == pytest.approx(5 * 20.0 + 10 * 10.0)
+    assert ortalama == pytest.approx(200.0 / 15)
@@ -0,0 +1,110 @@
+"""Adlandırılmış izleme listeleri (ör. sabah paketi).
+
+Listeler ve sembolleri `watchlists.db`'de iki tabloda tutulur; semboller listede
+eklenme sırasıyla (position) saklanır ve bir listede bir sembol bir kez bulunur.
+Bağlantı arayüz ile arka plan rapor işleri arasında paylaşıldığı için her erişim
+tek bir kilitle sıralanır.
+"""
+import sqlite3
+import threading
+
+
+class IzlemeListeleri:
+    """Adlandırılmış hisse listelerini (ör. sabah paketi) ekleme sırasıyla SQLite'ta saklar."""
+
+    def __init__(self, db_path='watchlists.db'):
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        # Listeler arayüzden, rapor işleri arka plandan okunur
+        self._kilit = threading.RLock()
+        self.create_tables()
+
+    def create_tables(self):
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS watchlists (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )''')
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS watchlist_symbols (
+                watchlist_id INTEGER NOT NULL REFERENCES watchlists(id) ON DELETE CASCADE,
+                symbol TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                PRIMARY KEY (watchlist_id, symbol)
+            )''')
+            self.conn.commit()
+
+    def listeler(self):
+        """Liste adları, oluşturulma sırasıyla."""
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT name FROM watchlists ORDER BY id')
+            return [row[0] for row in cursor.fetchall()]
+
+    def liste_ekle(self, ad, semboller=()):
+        """Yeni liste oluşturur; aynı adda liste varsa ValueError fırlatır."""
+        ad = ad.strip()
+        if not ad:
+            raise ValueError("Liste adı boş olamaz")
+        with self._kilit:
+            try:
+                self.conn.execute('INSERT INTO watchlists (name) VALUES (?)', (ad,))
+            except sqlite3.IntegrityError:
+                raise ValueError(f"'{ad}' adında bir liste zaten var")
+            self.conn.commit()
+        if semboller:
+            self.sembol_ekle(ad, semboller)
+
+    def liste_sil(self, ad):
+        with self._kilit:
+            liste_id = self._liste_id(ad)
+            self.conn.execute('DELETE FROM watchlist_symbols WHERE watchlist_id=?', (liste_id,))
+            self.conn.execute('DELETE FROM watchlists WHERE id=?', (liste_id,))
+            self.conn.commit()
+
+    def semboller(self, ad):
+        """Listedeki semboller, eklenme sırasıyla; liste yoksa ValueError fırlatır."""
+        with self._kilit:
+            cursor = self.conn.cursor()
+            cursor.execute('''
+            SELECT symbol FROM watchlist_symbols
+            WHERE watchlist_id=?
+            ORDER BY position
+            ''', (self._liste_id(ad),))
+            return [row[0] for row in cursor.fetchall()]
+
+    def sembol_ekle(self, ad, semboller):
+        """Sembolleri listenin sonuna ekler; listede olanlar atlanır. Eklenen sayıyı döndürür."""
+        semboller = list(dict.fromkeys(s.strip().upper() for s in semboller if s.strip()))
+        with self._kilit:
+            liste_id = self._liste_id(ad)
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT COALESCE(MAX(position), -1) FROM watchlist_symbols WHERE watchlist_id=?',
+                           (liste_id,))
+            son = cursor.fetchone()[0]
+            cursor.executemany('''
+            INSERT OR IGNORE INTO watchlist_symbols (watchlist_id, symbol, position)
+            VALUES (?, ?, ?)
+            ''', [(liste_id, symbol, son + 1 + i) for i, symbol in enumerate(semboller)])
+            self.conn.commit()
+            return cursor.rowcount
+
+    def sembol_cikar(self, ad, semboller):
+        with self._kilit:
+            liste_id = self._liste_id(ad)
+            self.conn.executemany('DELETE FROM watchlist_symbols WHERE watchlist_id=? AND symbol=?',
+                                  [(liste_id, s.upper()) for s in semboller])
+            self.conn.commit()
+
+    def _liste_id(self, ad):
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT id FROM watchlists WHERE name=?', (ad.strip(),))
+        row = cursor.fetchone()
+        if row is None:
+            raise ValueError(f"'{ad}' adında bir liste bulunamadı")
+        return row[0]
+
+    def close(self):
+        self.conn.close()